@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Track borders as stored in the maps versus optimized by
+borders.optimize(): number of segments removed for each map, and number of
+segments the BVH returns to the narrow phase for random car-sized boxes.
+
+    PYTHONPATH=src python3 bench/bench_borders.py [map ...]
+"""
+
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+from rapide_et_furieux import borders
+from rapide_et_furieux import bvh
+
+
+NB_QUERIES = 100000
+BOX_SIZE = 96
+MAPS = os.path.join(
+    os.path.dirname(__file__), "..", "src", "rapide_et_furieux", "maps",
+    "*.map"
+)
+
+
+def run(tree, boxes):
+    nb_segments = 0
+    start = time.perf_counter()
+    for box in boxes:
+        for _ in tree.query_box(box):
+            nb_segments += 1
+    duration = time.perf_counter() - start
+    return (nb_segments / len(boxes), duration * 1e6 / len(boxes))
+
+
+def main():
+    map_paths = sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(MAPS))
+    for map_path in map_paths:
+        with open(map_path, 'r') as fd:
+            data = json.load(fd)
+        segments = [
+            tuple(tuple(pt) for pt in border['pts'])
+            for border in data['race_track']['borders']
+        ]
+        (chains, report) = borders.optimize(segments)
+        former = bvh.SegmentBVH((None, segment) for segment in segments)
+        optimized = bvh.SegmentBVH(
+            (None, segment)
+            for chain in chains
+            for segment in borders.get_segments(chain)
+        )
+
+        rnd = random.Random(0)
+        (x_max, y_max) = (
+            max(max(a[0], b[0]) for (a, b) in segments),
+            max(max(a[1], b[1]) for (a, b) in segments),
+        )
+        boxes = []
+        for _ in range(0, NB_QUERIES):
+            (x, y) = (rnd.uniform(0, x_max), rnd.uniform(0, y_max))
+            boxes.append((x, y, x + BOX_SIZE, y + BOX_SIZE))
+
+        print("{}: {} segments -> {} chains, {} segments ({} removed)".format(
+            os.path.basename(map_path), report.nb_segments, report.nb_chains,
+            report.nb_chain_segments,
+            report.nb_segments - report.nb_chain_segments
+        ))
+        for (name, tree) in (("map borders", former),
+                             ("optimized", optimized)):
+            (nb_segments, duration) = run(tree, boxes)
+            print("  {:11s}: {:.3f} segments/query {:5.2f} us/query".format(
+                name, nb_segments, duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Car-versus-car broadphase cost per tick: each car looking up the cars
+around it (spatial hash, then distance check on each candidate, from both
+sides of every pair) versus the pairs computed once per tick by
+sort-and-sweep.
+
+Cars move along a 4-tile-wide strip, either spread along the track or in a
+pack.
+
+    PYTHONPATH=src python3 bench/bench_broadphase.py
+"""
+
+import random
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import broadphase
+from rapide_et_furieux import spatial
+from rapide_et_furieux import util
+
+
+NB_CARS = (8, 32, 64, 128)
+NB_TICKS = 600
+SPEED = 8  # pixels per tick
+DISTANCE = assets.TILE_SIZE[0] * 2
+DISTANCE_SQ = DISTANCE ** 2
+
+
+class Car(object):
+    def __init__(self, rnd, track_length):
+        self.position = (
+            rnd.random() * track_length * assets.TILE_SIZE[0],
+            rnd.random() * 4 * assets.TILE_SIZE[1],
+        )
+        self.speed = SPEED * (0.8 + rnd.random() * 0.4)
+
+    def move(self):
+        self.position = (self.position[0] + self.speed, self.position[1])
+
+
+def per_car_queries(grid, cars):
+    nb_pairs = 0
+    for car in cars:
+        for other in grid.query_radius(car.position, DISTANCE):
+            if other is car:
+                continue
+            dist = util.distance_sq_pt_to_pt(car.position, other.position)
+            if dist < DISTANCE_SQ:
+                nb_pairs += 1
+    return nb_pairs // 2
+
+
+def sweep_and_prune(sap, cars):
+    sap.update()
+    nb_pairs = 0
+    for car in cars:
+        for other in sap.get_neighbours(car):
+            dist = util.distance_sq_pt_to_pt(car.position, other.position)
+            if dist < DISTANCE_SQ:
+                nb_pairs += 1
+    return nb_pairs // 2
+
+
+def run(nb_cars, track_length):
+    rnd = random.Random(0)
+    cars = [Car(rnd, track_length) for _ in range(0, nb_cars)]
+    grid = spatial.SpatialHash(assets.TILE_SIZE[0])
+    for car in cars:
+        grid.add(car, car.position)
+    sap = broadphase.SweepAndPrune(DISTANCE)
+    for car in cars:
+        sap.add(car)
+
+    durations = [0.0, 0.0]
+    nb_pairs = 0
+    for _ in range(0, NB_TICKS):
+        for car in cars:
+            car.move()
+            grid.update(car, car.position)
+        start = time.perf_counter()
+        a = per_car_queries(grid, cars)
+        middle = time.perf_counter()
+        b = sweep_and_prune(sap, cars)
+        durations[0] += middle - start
+        durations[1] += time.perf_counter() - middle
+        assert a == b
+        nb_pairs += a
+    return (
+        durations[0] * 1e6 / NB_TICKS,
+        durations[1] * 1e6 / NB_TICKS,
+        nb_pairs / NB_TICKS,
+    )
+
+
+def main():
+    for (name, track_length) in (
+                ("spread", lambda nb_cars: nb_cars * 3),
+                ("pack", lambda nb_cars: 8),
+            ):
+        for nb_cars in NB_CARS:
+            (per_car, sap, nb_pairs) = run(nb_cars, track_length(nb_cars))
+            print("{:6s} {:3d} cars ({:6.1f} pairs):"
+                  " per-car queries {:8.1f} us/tick"
+                  " | sweep-and-prune {:8.1f} us/tick".format(
+                      name, nb_cars, nb_pairs, per_car, sap))
+
+
+if __name__ == "__main__":
+    main()
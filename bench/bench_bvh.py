@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Broadphase against the track borders: former tile sets
+(CollisionHandler.precompute_static()) versus the bounding volume hierarchy
+(bvh.SegmentBVH). Measures car-sized box queries (get_collisions()) and
+machine-gun-sized segment queries (get_obstacles_on_segment()), on a map
+and on a synthetic track with 5000 border segments.
+
+    PYTHONPATH=src python3 bench/bench_bvh.py [map]
+"""
+
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import bvh
+from rapide_et_furieux import geometry
+from rapide_et_furieux import util
+
+
+DEFAULT_MAP = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "src", "rapide_et_furieux", "maps", "first.map"
+)
+NB_SYNTHETIC_SEGMENTS = 5000
+NB_QUERIES = 2000
+CAR_SIZE = (47, 86)  # pixels (car image * CAR_SCALE_FACTOR)
+SHOT_LENGTH = 4096  # pixels
+
+
+class Border(object):
+    def __init__(self, pts):
+        self.pts = pts
+
+
+def load(filepath):
+    with open(filepath, 'r') as fd:
+        data = json.load(fd)
+    borders = [
+        Border([tuple(pt) for pt in border['pts']])
+        for border in data['race_track']['borders']
+    ]
+    positions = [tuple(wpt['position']) for wpt in data['ia']['waypoints']]
+    return (borders, positions)
+
+
+def generate_track(nb_segments):
+    """
+    2 wavy rings (inner and outer borders), made of short segments
+    """
+    borders = []
+    positions = []
+    center = 40 * assets.TILE_SIZE[0]
+    nb_pts = nb_segments // 2
+    for (radius, width) in ((30, 0), (33, 1)):
+        pts = []
+        for idx in range(0, nb_pts + 1):
+            angle = 2 * math.pi * idx / nb_pts
+            r = (radius + 4 * math.sin(angle * 7)) * assets.TILE_SIZE[0]
+            pts.append((int(center + r * math.cos(angle)),
+                        int(center + r * math.sin(angle))))
+            if width:
+                r -= 1.5 * assets.TILE_SIZE[0]
+                positions.append((center + r * math.cos(angle),
+                                  center + r * math.sin(angle)))
+        for segment in util.pairwise(pts):
+            borders.append(Border(list(segment)))
+    return (borders[:nb_segments], positions)
+
+
+def make_car(rnd, position):
+    angle = rnd.random() * 2 * math.pi
+    (cos, sin) = (math.cos(angle), math.sin(angle))
+    (w, h) = (CAR_SIZE[0] / 2, CAR_SIZE[1] / 2)
+    return [
+        (position[0] + (x * cos) - (y * sin),
+         position[1] + (x * sin) + (y * cos))
+        for (x, y) in ((-w, -h), (w, -h), (w, h), (-w, h))
+    ]
+
+
+def make_shot(rnd, position):
+    angle = rnd.random() * 2 * math.pi
+    return (position, (position[0] + SHOT_LENGTH * math.cos(angle),
+                       position[1] + SHOT_LENGTH * math.sin(angle)))
+
+
+# Former implementation (CollisionHandler.precompute_static(),
+# get_possible_obstacle(), and the border parts of get_collisions() and
+# get_obstacles_on_segment())
+
+def legacy_precompute_static(borders):
+    precomputed_static = {}
+    for obstacle in borders:
+        for obstacle_line in util.pairwise(obstacle.pts):
+            for grid in util.raytrace(obstacle_line, assets.TILE_SIZE[0]):
+                offsets = itertools.product(range(-1, 2, 1), range(-1, 2, 1))
+                for offset in offsets:
+                    pos = (grid[0] + offset[0], grid[1] + offset[1])
+                    if pos not in precomputed_static:
+                        precomputed_static[pos] = set()
+                    precomputed_static[pos].add(obstacle)
+    return precomputed_static
+
+
+def legacy_get_possible_obstacle(precomputed, position):
+    grid = (
+        int(position[0] / assets.TILE_SIZE[0]),
+        int(position[1] / assets.TILE_SIZE[1]),
+    )
+    try:
+        return precomputed[grid]
+    except KeyError:
+        return []
+
+
+def intersect(line_a, line_b):
+    if not geometry.segments_aabb_overlap(line_a, line_b):
+        return False
+    return geometry.get_segment_intersect_point(line_a, line_b) is not None
+
+
+def legacy_car_query(precomputed, position, car_pts):
+    nb = 0
+    nb_tests = 0
+    for obstacle in legacy_get_possible_obstacle(precomputed, position):
+        for moving_line in util.pairwise(car_pts):
+            for obstacle_line in util.pairwise(obstacle.pts):
+                nb_tests += 1
+                nb += intersect(moving_line, obstacle_line)
+    return (nb, nb_tests)
+
+
+def legacy_shot_query(precomputed, shot):
+    nb = 0
+    nb_tests = 0
+    for (x, y) in util.raytrace(shot, grid_size=assets.TILE_SIZE[0]):
+        position = (x * assets.TILE_SIZE[0], y * assets.TILE_SIZE[1])
+        for obstacle in legacy_get_possible_obstacle(precomputed, position):
+            for obstacle_line in util.pairwise(obstacle.pts):
+                nb_tests += 1
+                if intersect(shot, obstacle_line):
+                    nb += 1
+                    break
+    return (nb, nb_tests)
+
+
+def bvh_car_query(tree, position, car_pts):
+    nb = 0
+    nb_tests = 0
+    moving_lines = list(util.pairwise(car_pts))
+    for (obstacle, obstacle_line) in tree.query_box(
+                bvh.get_pts_box(car_pts)
+            ):
+        for moving_line in moving_lines:
+            nb_tests += 1
+            nb += intersect(moving_line, obstacle_line)
+    return (nb, nb_tests)
+
+
+def bvh_shot_query(tree, shot):
+    nb = 0
+    nb_tests = 0
+    for (obstacle, obstacle_line) in tree.query_segment(shot):
+        nb_tests += 1
+        nb += intersect(shot, obstacle_line)
+    return (nb, nb_tests)
+
+
+def timed(func, queries):
+    nb_tests = 0
+    start = time.perf_counter()
+    for query in queries:
+        nb_tests += func(*query)[1]
+    duration = time.perf_counter() - start
+    return (duration * 1e6 / len(queries), nb_tests / len(queries))
+
+
+def bench(name, borders, positions):
+    rnd = random.Random(0)
+    positions = [rnd.choice(positions) for _ in range(0, NB_QUERIES)]
+    cars = [make_car(rnd, position) for position in positions]
+    shots = [make_shot(rnd, position) for position in positions]
+    nb_segments = sum(len(border.pts) - 1 for border in borders)
+    print("{}: {} border segments".format(name, nb_segments))
+
+    start = time.perf_counter()
+    precomputed = legacy_precompute_static(borders)
+    legacy_build = time.perf_counter() - start
+    start = time.perf_counter()
+    tree = bvh.SegmentBVH(
+        (border, line) for border in borders
+        for line in util.pairwise(border.pts)
+    )
+    bvh_build = time.perf_counter() - start
+    print("  build: tile sets {:.1f} ms | bvh {:.1f} ms".format(
+        legacy_build * 1000, bvh_build * 1000))
+
+    for (query, legacy, new, args) in (
+                ("car", legacy_car_query, bvh_car_query,
+                 list(zip(positions, cars))),
+                ("shot", legacy_shot_query, bvh_shot_query,
+                 [(shot,) for shot in shots]),
+            ):
+        (legacy_time, legacy_tests) = timed(
+            legacy, [(precomputed,) + a for a in args]
+        )
+        (bvh_time, bvh_tests) = timed(new, [(tree,) + a for a in args])
+        print("  {:4s}: tile sets {:7.1f} us ({:6.1f} segment tests)"
+              " | bvh {:7.1f} us ({:6.1f} segment tests)".format(
+                  query, legacy_time, legacy_tests, bvh_time, bvh_tests))
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MAP
+    (borders, positions) = load(filepath)
+    bench(os.path.basename(filepath), borders, positions)
+    (borders, positions) = generate_track(NB_SYNTHETIC_SEGMENTS)
+    bench("synthetic track", borders, positions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Border clearance queries of the precomputing (waypoint and path scores):
+exact distances to every border segment with numpy (former implementation)
+versus lookups in the clearance field. Also reports the time needed to
+build the field and to load it back from the disk.
+
+    PYTHONPATH=src python3 bench/bench_clearance.py [map]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from rapide_et_furieux import clearance
+from rapide_et_furieux import geometry
+
+
+NB_POINTS = 20000
+NB_SEGMENTS = 20000
+SEGMENT_LENGTH = 400
+DEFAULT_MAP = os.path.join(
+    os.path.dirname(__file__), "..", "src", "rapide_et_furieux", "maps",
+    "first.map"
+)
+
+
+class Border(object):
+    def __init__(self, pts):
+        self.pts = [tuple(pt) for pt in pts]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    r = func(*args)
+    return (r, time.perf_counter() - start)
+
+
+def main():
+    map_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MAP
+    with open(map_path, 'r') as fd:
+        data = json.load(fd)
+    borders = [Border(border['pts']) for border in data['race_track']['borders']]
+    segments = clearance.get_segments(borders)
+    print("{}: {} border segments".format(map_path, len(segments)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_map = os.path.join(tmp_dir, "bench.map")
+        (field, build) = timed(clearance.ClearanceField.load_or_build,
+                               tmp_map, borders)
+        (_, load) = timed(clearance.ClearanceField.load_or_build,
+                          tmp_map, borders)
+    print("field {}x{}: build {:.0f} ms | load {:.1f} ms".format(
+        field.width, field.height, build * 1e3, load * 1e3))
+
+    rnd = random.Random(0)
+    (x_max, y_max) = (
+        field.origin[0] + (field.width * field.cell_size),
+        field.origin[1] + (field.height * field.cell_size),
+    )
+    pts = [(rnd.uniform(0, x_max), rnd.uniform(0, y_max))
+           for _ in range(0, NB_POINTS)]
+    path_segments = []
+    for _ in range(0, NB_SEGMENTS):
+        (x, y) = (rnd.uniform(0, x_max), rnd.uniform(0, y_max))
+        path_segments.append((
+            (x, y),
+            (x + rnd.uniform(-SEGMENT_LENGTH, SEGMENT_LENGTH),
+             y + rnd.uniform(-SEGMENT_LENGTH, SEGMENT_LENGTH))
+        ))
+    border_segments = geometry.to_segments(segments)
+
+    # Former implementation (precompute.get_border_distances() and
+    # FindReachableWaypointsThread / ComputeScoreThread)
+    (_, exact_pts) = timed(
+        lambda: geometry.distance_sq_pts_to_segments(
+            pts, border_segments
+        ).min(axis=1)
+    )
+    (_, exact_segments) = timed(
+        lambda: geometry.distance_sq_segments_to_segments(
+            path_segments, border_segments
+        ).min(axis=1)
+    )
+    (_, field_pts) = timed(field.get_clearances, pts)
+    (_, field_segments) = timed(field.get_segment_clearances, path_segments)
+
+    print("{} points  : exact {:7.1f} ms | field {:6.1f} ms".format(
+        NB_POINTS, exact_pts * 1e3, field_pts * 1e3))
+    print("{} segments: exact {:7.1f} ms | field {:6.1f} ms".format(
+        NB_SEGMENTS, exact_segments * 1e3, field_segments * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Wall-scraping car: a car sliding along a border, nose turned into it, and
+checking twice per tick if it collides (steering check and check after
+the collision reaction, both with limit=1). Compares get_collisions()
+without the contact cache (former implementation) and with it.
+
+    PYTHONPATH=src python3 bench/bench_contact_cache.py
+"""
+
+import math
+import time
+
+from rapide_et_furieux import bvh
+from rapide_et_furieux import narrowphase
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import collisions
+
+
+NB_TICKS = 5000
+SPEED = 6  # pixels per tick
+CAR_SIZE = (86, 47)
+WALL_Y = 0
+SEGMENT_LENGTH = 32  # borders follow the tiles: many short segments
+
+
+class Car(object):
+    COLLISION_LAYER = collisions.LAYER_CAR
+    COLLISION_MASK = collisions.LAYER_BORDER | collisions.LAYER_CAR
+
+    def __init__(self):
+        self.static = False
+        self.position = (0, WALL_Y + CAR_SIZE[1] / 2 + 1)
+        # nose slightly turned toward the wall
+        self.radians = 0.05
+        self.speed = (0, 0)
+
+    @property
+    def pts(self):
+        (cos, sin) = (math.cos(self.radians), math.sin(self.radians))
+        (w, h) = (CAR_SIZE[0] / 2, CAR_SIZE[1] / 2)
+        (cx, cy) = self.position
+        return [
+            (cx + (x * cos) + (y * sin), cy - (x * sin) + (y * cos))
+            for (x, y) in ((-w, -h), (w, -h), (w, h), (-w, h))
+        ]
+
+
+class Border(collisions.CollisionObject):
+    def __init__(self, pts):
+        super().__init__()
+        self.pts = pts
+
+
+class RaceTrack(object):
+    def __init__(self):
+        length = SPEED * NB_TICKS + 1000
+        self.borders = [
+            Border([(x, WALL_Y)
+                    for x in range(-1000, length, SEGMENT_LENGTH)]),
+            Border([(x, WALL_Y + 256)
+                    for x in range(-1000, length, SEGMENT_LENGTH)]),
+        ]
+        self.cars = []
+
+
+# Former implementation (CollisionHandler.get_collisions(), borders only)
+def get_collisions(handler, moving, limit=None):
+    collisions = []
+    pts = list(moving.pts)
+    box = bvh.get_pts_box(pts)
+    for (obstacle, obstacle_line) in handler.static.query_box(box):
+        contact = narrowphase.get_contact(pts, obstacle_line)
+        if contact is None:
+            continue
+        collisions.append(contact)
+        if limit is not None and len(collisions) >= limit:
+            return collisions
+    return collisions
+
+
+def run(func):
+    racetrack = RaceTrack()
+    handler = collisions.CollisionHandler(racetrack,
+                                          util.GAME_SETTINGS_TEMPLATE)
+    handler.precompute_static()
+    car = Car()
+    nb_collisions = 0
+    start = time.perf_counter()
+    for _ in range(0, NB_TICKS):
+        handler.contacts.new_tick()
+        car.position = (car.position[0] + SPEED, car.position[1])
+        for _ in range(0, 2):
+            nb_collisions += len(func(handler, car, limit=1))
+    duration = time.perf_counter() - start
+    return (duration * 1e6 / NB_TICKS, nb_collisions)
+
+
+def main():
+    (former, nb_former) = run(get_collisions)
+    (cached, nb_cached) = run(collisions.CollisionHandler.get_collisions)
+    assert nb_former == nb_cached
+    print("{} contacts over {} ticks".format(nb_cached, NB_TICKS))
+    print("without cache {:6.1f} us/tick | with cache {:6.1f} us/tick".format(
+        former, cached))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Skidmarks of a drifting pack of cars: one sprite per mark, each blitted on
+every frame until it disappears (former implementation) versus the decal
+layer (one blit per visible chunk).
+
+    PYTHONPATH=src python3 bench/bench_decals.py
+"""
+
+import math
+import random
+import time
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import decals
+from rapide_et_furieux.gfx import rotation
+from rapide_et_furieux.gfx.cars import get_skidmark
+
+
+NB_FRAMES = 600
+FRAME_INTERVAL = 1 / 60
+SCREEN_SIZE = (1280, 720)
+LIFE_LENGTH = 2.0  # former SkidMark.LIFE_LENGTH
+
+
+def get_tracks(rnd, nb_cars):
+    # cars drifting in circles around the screen
+    tracks = []
+    for _ in range(0, nb_cars):
+        center = (rnd.uniform(200, SCREEN_SIZE[0] - 200),
+                  rnd.uniform(200, SCREEN_SIZE[1] - 200))
+        radius = rnd.uniform(50, 150)
+        start = rnd.uniform(0, 2 * math.pi)
+        track = []
+        for frame in range(0, NB_FRAMES):
+            a = start + (frame * 2 * FRAME_INTERVAL)
+            track.append((
+                (center[0] + (radius * math.cos(a)),
+                 center[1] + (radius * math.sin(a))),
+                math.degrees(a),
+            ))
+        tracks.append(track)
+    return tracks
+
+
+# Former implementation (SkidMark sprites)
+def run_sprites(screen, image, tracks):
+    marks = []  # (expiration, image, position)
+    start = time.perf_counter()
+    for frame in range(0, NB_FRAMES):
+        now = frame * FRAME_INTERVAL
+        for track in tracks:
+            (position, angle) = track[frame]
+            rotated = rotation.rotate(image, -angle)
+            marks.append((now + LIFE_LENGTH, rotated, (
+                int(position[0]) - (rotated.get_size()[0] / 2),
+                int(position[1]) - (rotated.get_size()[1] / 2),
+            )))
+        marks = [mark for mark in marks if mark[0] > now]
+        for (_, rotated, position) in marks:
+            screen.blit(rotated, position)
+    return (time.perf_counter() - start) * 1e3 / NB_FRAMES, len(marks)
+
+
+def run_decals(screen, image, tracks):
+    layer = decals.DecalLayer()
+    start = time.perf_counter()
+    for frame in range(0, NB_FRAMES):
+        util.g_sim_time = frame * FRAME_INTERVAL
+        for track in tracks:
+            (position, angle) = track[frame]
+            layer.stamp(image, position, angle)
+        layer.draw(screen, (0, 0))
+    return (time.perf_counter() - start) * 1e3 / NB_FRAMES, len(layer)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    assets.load_resources()
+    car = assets.get_image(assets.CARS[0], ("scale", assets.CAR_SCALE_FACTOR))
+    image = get_skidmark(sorted(assets.SKIDMARKS)[0], car.get_size())
+
+    for nb_cars in (1, 8, 25):
+        tracks = get_tracks(random.Random(0), nb_cars)
+        (former, nb_marks) = run_sprites(screen, image, tracks)
+        (decal, nb_chunks) = run_decals(screen, image, tracks)
+        print("{:2d} cars: sprites {:6.2f} ms/frame ({:4d} marks) | decals"
+              " {:5.2f} ms/frame ({} chunks)".format(
+                  nb_cars, former, nb_marks, decal, nb_chunks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Scalar (util) versus batched (geometry) distance computations, on the
+borders, waypoints and paths of a map. Those are the computations done by
+ref-precompute (ComputeScoreThread and FindReachableWaypointsThread).
+
+    PYTHONPATH=src python3 bench/bench_geometry.py [map]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy
+
+from rapide_et_furieux import geometry
+from rapide_et_furieux import util
+
+
+DEFAULT_MAP = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "src", "rapide_et_furieux", "maps", "first.map"
+)
+
+
+def load(filepath):
+    with open(filepath, 'r') as fd:
+        data = json.load(fd)
+    borders = [
+        (tuple(border['pts'][0]), tuple(border['pts'][1]))
+        for border in data['race_track']['borders']
+    ]
+    waypoints = [tuple(wpt['position']) for wpt in data['ia']['waypoints']]
+    paths = [
+        (tuple(path['a']), tuple(path['b'])) for path in data['ia']['paths']
+    ]
+    return (borders, waypoints, paths)
+
+
+def waypoint_scores_scalar(borders, waypoints, paths):
+    return [
+        min(util.distance_sq_pt_to_segment(border, wpt) for border in borders)
+        for wpt in waypoints
+    ]
+
+
+def waypoint_scores_batched(borders, waypoints, paths):
+    return geometry.distance_sq_pts_to_segments(waypoints, borders).min(
+        axis=1
+    )
+
+
+def path_scores_scalar(borders, waypoints, paths):
+    return [
+        min(
+            util.distance_sq_segment_to_segment(border, path)
+            for border in borders
+        )
+        for path in paths
+    ]
+
+
+def path_scores_batched(borders, waypoints, paths):
+    return geometry.distance_sq_segments_to_segments(paths, borders).min(
+        axis=1
+    )
+
+
+def connect_one_scalar(borders, waypoints, paths):
+    # paths from the first waypoint to all the others
+    origin = waypoints[0]
+    out = []
+    for dest in waypoints[1:]:
+        out.append(min(
+            util.distance_sq_segment_to_segment((origin, dest), border)
+            for border in borders
+        ))
+        out.append(min(
+            util.distance_sq_pt_to_segment((origin, dest), wpt)
+            for wpt in waypoints
+        ))
+    return out
+
+
+def connect_one_batched(borders, waypoints, paths):
+    origin = waypoints[0]
+    segments = [(origin, dest) for dest in waypoints[1:]]
+    return (
+        geometry.distance_sq_segments_to_segments(segments, borders).min(
+            axis=1
+        ),
+        geometry.distance_sq_pts_to_segments(waypoints, segments).min(
+            axis=0
+        ),
+    )
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    r = func(*args)
+    return (time.perf_counter() - start, r)
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MAP
+    (borders, waypoints, paths) = load(filepath)
+    print("{}: {} borders, {} waypoints, {} paths".format(
+        os.path.basename(filepath), len(borders), len(waypoints), len(paths)
+    ))
+    print("{:<20} {:>12} {:>12} {:>8}".format(
+        "", "scalar (ms)", "batched (ms)", "speedup"
+    ))
+    benchs = [
+        ("waypoint scores", waypoint_scores_scalar, waypoint_scores_batched),
+        ("path scores", path_scores_scalar, path_scores_batched),
+        ("connect 1 waypoint", connect_one_scalar, connect_one_batched),
+    ]
+    for (name, scalar, batched) in benchs:
+        (t_scalar, r_scalar) = timeit(scalar, borders, waypoints, paths)
+        (t_batched, r_batched) = timeit(batched, borders, waypoints, paths)
+        print("{:<20} {:>12.1f} {:>12.1f} {:>7.1f}x".format(
+            name, t_scalar * 1000, t_batched * 1000, t_scalar / t_batched
+        ))
+        if name != "connect 1 waypoint":
+            # util.get_segment_intersect_point() is approximate (+/- 1
+            # pixel): tiny distances may be rounded to 0
+            diff = numpy.abs(numpy.asarray(r_scalar) - r_batched)
+            assert numpy.all((diff < 1e-6) | (numpy.asarray(r_scalar) == 0))
+
+
+if __name__ == "__main__":
+    main()
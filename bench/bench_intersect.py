@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Collision tests per second: segments of cars placed on the waypoints of a
+map, against the borders close to them (what CollisionHandler.get_collisions
+does on each tick), with the former pygame.Rect / slope based routines and
+with the geometry ones.
+
+    PYTHONPATH=src python3 bench/bench_intersect.py [map]
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from rapide_et_furieux import geometry
+
+
+DEFAULT_MAP = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "src", "rapide_et_furieux", "maps", "first.map"
+)
+CAR_SIZE = (40, 20)
+MAX_DISTANCE_SQ = 128 ** 2
+NB_ROUNDS = 5
+
+
+# Former implementation (util.py and collisions.py before the geometry
+# module)
+
+def legacy_can_collide(line_a, line_b):
+    (rect_a, rect_b) = [pygame.Rect(
+        line[0],
+        (
+            line[1][0] - line[0][0] + 1,
+            line[1][1] - line[0][1] + 1,
+        ),
+    ) for line in [line_a, line_b]]
+    for rect in [rect_a, rect_b]:
+        rect.normalize()
+        rect.width += 1
+        rect.height += 1
+
+    return rect_a.colliderect(rect_b)
+
+
+def _calculate_gradient(line):
+    # Ensure that the line is not vertical
+    if (line[0][0] != line[1][0]):
+        return (line[0][1] - line[1][1]) / (line[0][0] - line[1][0])
+    return None
+
+
+def _calculate_y_axis_intersect(p, m):
+    """Compute the point 'b' where line crosses the Y axis"""
+    return p[1] - (m * p[0])
+
+
+def _get_line_intersect_points(line_a, line_b):
+    """
+    Calc the point where two infinitely long lines (p1 to p2 and p3 to p4)
+    intersect.
+    Handle parallel lines and vertical lines (the later has infinite 'm').
+    Returns a point tuple of points like this ((x,y),...)  or None
+    In non parallel cases the tuple will contain just one point.
+    For parallel lines that lay on top of one another the tuple will contain
+    all four points of the two lines
+    """
+    (p1, p2) = line_a
+    (p3, p4) = line_b
+    m1 = _calculate_gradient(line_a)
+    m2 = _calculate_gradient(line_b)
+
+    # See if the lines are parallel
+    if m1 != m2:
+        # Not parallel
+
+        # See if either line is vertical
+        if (m1 is not None and m2 is not None):
+            # Neither line vertical
+            b1 = _calculate_y_axis_intersect(p1, m1)
+            b2 = _calculate_y_axis_intersect(p3, m2)
+            x = (b2 - b1) / (m1 - m2)
+            y = (m1 * x) + b1
+        elif m1 is None:
+            # Line 1 is vertical so use line 2's values
+            b2 = _calculate_y_axis_intersect(p3, m2)
+            x = p1[0]
+            y = (m2 * x) + b2
+        else:
+            # Line 2 is vertical so use line 1's values
+            b1 = _calculate_y_axis_intersect(p1, m1)
+            x = p3[0]
+            y = (m1 * x) + b1
+        return ((x, y),)
+
+    # Parallel lines with same 'b' value must be the same line so they intersect
+    # everywhere in this case we return the start and end points of both lines
+    # the _calculate_intersect_point method will sort out which of these points
+    # lays on both line segments
+    (b1, b2) = (None, None)  # vertical lines have no b value
+    if m1 is not None:
+        b1 = _calculate_y_axis_intersect(p1, m1)
+
+    if m2 is not None:
+        b2 = _calculate_y_axis_intersect(p3, m2)
+
+    # If these parallel lines lay on one another
+    if b1 == b2:
+        return (p1, p2, p3, p4)
+
+    return None
+
+
+def line_to_int(line):
+    return (
+        (
+            int(line[0][0]),
+            int(line[0][1]),
+        ),
+        (
+            int(line[1][0]),
+            int(line[1][1]),
+        ),
+    )
+
+
+def legacy_get_segment_intersect_point(line_a, line_b):
+    """
+    For line segments (ie not infinitely long lines) the intersect point
+    may not lay on both lines.
+
+    If the point where two lines intersect is inside both line's bounding
+    rectangles then the lines intersect. Returns intersect point if the line
+    intesect o None if not
+    """
+    line_a = line_to_int(line_a)
+    line_b = line_to_int(line_b)
+
+    (p1, p2) = line_a
+    (p3, p4) = line_b
+    intersects = _get_line_intersect_points(line_a, line_b)
+    if intersects is None:
+        return None
+
+    (p1, p2) = (
+        (
+            min(p1[0], p2[0]) - 1,
+            min(p1[1], p2[1]) - 1,
+        ),
+        (
+            max(p1[0], p2[0]) + 2,
+            max(p1[1], p2[1]) + 2,
+        )
+    )
+    (p3, p4) = (
+        (
+            min(p3[0], p4[0]) - 1,
+            min(p3[1], p4[1]) - 1,
+        ),
+        (
+            max(p3[0], p4[0]) + 2,
+            max(p3[1], p4[1]) + 2,
+        )
+    )
+
+    width = p2[0] - p1[0]
+    height = p2[1] - p1[1]
+    # approximate because _get_line_intersect_points
+    # may reply with crappy numbers like 0.9999
+    r1 = pygame.Rect(p1, (width, height))
+
+    width = p4[0] - p3[0]
+    height = p4[1] - p3[1]
+    # approximate because _get_line_intersect_points
+    # may reply with crappy numbers like 0.9999
+    r2 = pygame.Rect(p3, (width, height))
+
+    for point in intersects:
+        point = (int(point[0]), int(point[1]))
+        res1 = r1.collidepoint(point)
+        res2 = r2.collidepoint(point)
+        if res1 and res2:
+            point = [int(pp) for pp in point]
+            return point
+
+    # This is the case where the infinitely long lines crossed but
+    # the line segments didn't
+    return None
+
+
+def legacy_test(line_a, line_b):
+    if not legacy_can_collide(line_a, line_b):
+        return None
+    return legacy_get_segment_intersect_point(line_a, line_b)
+
+
+def geometry_test(line_a, line_b):
+    if not geometry.segments_aabb_overlap(line_a, line_b):
+        return None
+    return geometry.get_segment_intersect_point(line_a, line_b)
+
+
+def get_car_lines(position, angle):
+    (w, h) = (CAR_SIZE[0] / 2, CAR_SIZE[1] / 2)
+    (c, s) = (math.cos(angle), math.sin(angle))
+    pts = [
+        (position[0] + (x * c) - (y * s), position[1] + (x * s) + (y * c))
+        for (x, y) in ((-w, -h), (w, -h), (w, h), (-w, h))
+    ]
+    return list(zip(pts, pts[1:] + pts[:1]))
+
+
+def load_pairs(filepath):
+    with open(filepath, 'r') as fd:
+        data = json.load(fd)
+    borders = [
+        (tuple(border['pts'][0]), tuple(border['pts'][1]))
+        for border in data['race_track']['borders']
+    ]
+    rnd = random.Random(0)
+    pairs = []
+    for wpt in data['ia']['waypoints']:
+        position = wpt['position']
+        car_lines = get_car_lines(position, rnd.uniform(0, 2 * math.pi))
+        for border in borders:
+            if min(
+                        (position[0] - pt[0]) ** 2 + (position[1] - pt[1]) ** 2
+                        for pt in border
+                    ) > MAX_DISTANCE_SQ:
+                continue
+            for car_line in car_lines:
+                pairs.append((car_line, border))
+    # and some pairs that actually collide
+    for border in borders:
+        middle = (
+            (border[0][0] + border[1][0]) / 2,
+            (border[0][1] + border[1][1]) / 2,
+        )
+        for car_line in get_car_lines(middle, rnd.uniform(0, 2 * math.pi)):
+            pairs.append((car_line, border))
+    return pairs
+
+
+def bench(test, pairs):
+    best = None
+    for _ in range(0, NB_ROUNDS):
+        start = time.perf_counter()
+        nb_hits = 0
+        for (line_a, line_b) in pairs:
+            if test(line_a, line_b) is not None:
+                nb_hits += 1
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return (len(pairs) / best, nb_hits)
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MAP
+    pairs = load_pairs(filepath)
+    print("{}: {} segment pairs".format(os.path.basename(filepath),
+                                        len(pairs)))
+    for (name, test) in (("legacy", legacy_test),
+                         ("geometry", geometry_test)):
+        (per_second, nb_hits) = bench(test, pairs)
+        print("{:<10} {:>12.0f} tests/s ({} hits)".format(
+            name, per_second, nb_hits
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Weapon-heavy race: a pack of cars between 2 borders, with wrecks, flying
+projectiles, mines and machine gun shots. Counts the pairs given to the
+narrow phase (CollisionHandler.nb_tests) when every query looks at every
+layer and filters the shooter out afterwards (former behaviour), versus
+with the collision layers and masks.
+
+    PYTHONPATH=src python3 bench/bench_layers.py
+"""
+
+import random
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import collisions
+
+
+NB_TICKS = 200
+NB_CARS = 16
+NB_WRECKS = 6
+NB_PROJECTILES = 40
+NB_MINES = 10
+NB_SHOTS = 8  # machine gun shots per tick
+TRACK_LENGTH = assets.TILE_SIZE[0] * 12
+TRACK_WIDTH = assets.TILE_SIZE[1] * 3
+
+
+class Body(object):
+    def __init__(self, position, size, layer, mask, speed=(0, 0)):
+        self.static = False
+        self.asleep = False
+        self.position = position
+        self.size = size
+        self.radians = 0
+        self.speed = speed
+        self.COLLISION_LAYER = layer
+        self.COLLISION_MASK = mask
+        self.shooter = None
+
+    @property
+    def pts(self):
+        (w, h) = (self.size[0] / 2, self.size[1] / 2)
+        (x, y) = self.position
+        return [(x - w, y - h), (x + w, y - h), (x + w, y + h), (x - w, y + h)]
+
+
+class Border(collisions.CollisionObject):
+    def __init__(self, pts):
+        super().__init__()
+        self.pts = pts
+
+
+class RaceTrack(object):
+    def __init__(self):
+        self.borders = [
+            Border([(x, 0) for x in range(0, TRACK_LENGTH + 1, 32)]),
+            Border([(x, TRACK_WIDTH)
+                    for x in range(0, TRACK_LENGTH + 1, 32)]),
+        ]
+        self.cars = []
+
+
+def random_position(rnd, margin):
+    return (
+        margin + (rnd.random() * (TRACK_LENGTH - (2 * margin))),
+        margin + (rnd.random() * (TRACK_WIDTH - (2 * margin))),
+    )
+
+
+def build(rnd):
+    racetrack = RaceTrack()
+    handler = collisions.CollisionHandler(racetrack,
+                                          util.GAME_SETTINGS_TEMPLATE)
+    handler.precompute_static()
+    cars = [
+        Body(random_position(rnd, 30), (86, 47), collisions.LAYER_CAR,
+             collisions.LAYER_BORDER | collisions.LAYER_CAR, (8, 0))
+        for _ in range(0, NB_CARS)
+    ]
+    wrecks = [
+        Body(random_position(rnd, 30), (86, 47), collisions.LAYER_WRECK,
+             collisions.LAYER_BORDER, (2, 0))
+        for _ in range(0, NB_WRECKS)
+    ]
+    for obj in cars + wrecks:
+        racetrack.cars.append(obj)
+        handler.add_moving(obj)
+    projectiles = []
+    for _ in range(0, NB_PROJECTILES):
+        shooter = rnd.choice(cars)
+        projectile = Body(
+            (shooter.position[0] + 10, shooter.position[1]), (20, 8),
+            collisions.LAYER_PROJECTILE,
+            collisions.LAYER_BORDER | collisions.LAYER_CAR,
+        )
+        projectile.shooter = shooter
+        projectiles.append(projectile)
+    for _ in range(0, NB_MINES):
+        shooter = rnd.choice(cars)
+        mine = Body(random_position(rnd, 20), (20, 20),
+                    collisions.LAYER_HAZARD, collisions.LAYER_CAR)
+        mine.shooter = shooter
+        projectiles.append(mine)
+    shots = []
+    for _ in range(0, NB_SHOTS):
+        shooter = rnd.choice(cars)
+        (x, y) = shooter.position
+        shots.append((shooter, ((x, y), (x + 600, y + rnd.randint(-50, 50)))))
+    return (handler, cars, wrecks, projectiles, shots)
+
+
+def tick(handler, cars, wrecks, projectiles, shots, layers):
+    handler.update_pairs()
+    mask = None if layers else collisions.LAYER_ALL
+    for obj in cars + wrecks:
+        handler.sweep(obj, obj.speed, mask=mask)
+    for car in cars:
+        handler.get_collisions(car, limit=1, mask=mask)
+    for projectile in projectiles:
+        if layers:
+            handler.get_collisions(projectile, ignore=(projectile.shooter,))
+        else:
+            hits = handler.get_collisions(projectile, mask=mask)
+            hits = [hit for hit in hits
+                    if hit.obstacle is not projectile.shooter]
+    for (shooter, shot) in shots:
+        if layers:
+            list(handler.get_obstacles_on_segment(shot, ignore=(shooter,)))
+        else:
+            hits = handler.get_obstacles_on_segment(shot, mask=mask)
+            hits = [hit for hit in hits if hit[0] is not shooter]
+
+
+def run(layers):
+    (handler, cars, wrecks, projectiles, shots) = build(random.Random(0))
+    nb_tests = 0
+    duration = 0
+    for _ in range(0, NB_TICKS):
+        start = time.perf_counter()
+        tick(handler, cars, wrecks, projectiles, shots, layers)
+        duration += time.perf_counter() - start
+        nb_tests += handler.nb_tests
+    return (nb_tests / NB_TICKS, duration * 1e3 / NB_TICKS)
+
+
+def main():
+    (former_tests, former_time) = run(layers=False)
+    (tests, duration) = run(layers=True)
+    print("all layers : {:7.1f} narrow-phase tests/tick {:6.2f} ms/tick"
+          .format(former_tests, former_time))
+    print("with masks : {:7.1f} narrow-phase tests/tick {:6.2f} ms/tick"
+          " ({:.0%} fewer tests)".format(
+              tests, duration, 1 - (tests / former_tests)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Car-versus-car narrow phase: the 16 segment intersection tests between the
+edges of two car boxes (former CollisionHandler.get_collisions()) versus
+the bounding-circle rejection and separating axis test of
+narrowphase.get_contact().
+
+Pairs come from the broadphase: the cars are less than 2 tiles away from
+each other, with random angles. Some of them overlap.
+
+    PYTHONPATH=src python3 bench/bench_narrowphase.py
+"""
+
+import math
+import random
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import geometry
+from rapide_et_furieux import narrowphase
+from rapide_et_furieux import util
+
+
+NB_PAIRS = 20000
+CAR_SIZE = (86, 47)
+
+
+def get_car_pts(rnd, max_distance):
+    (cx, cy) = (rnd.random() * max_distance, rnd.random() * max_distance)
+    angle = rnd.random() * 2 * math.pi
+    (cos, sin) = (math.cos(angle), math.sin(angle))
+    (w, h) = (CAR_SIZE[0] / 2, CAR_SIZE[1] / 2)
+    return [
+        (cx + (x * cos) - (y * sin), cy + (x * sin) + (y * cos))
+        for (x, y) in ((-w, -h), (w, -h), (w, h), (-w, h))
+    ]
+
+
+# Former implementation (CollisionHandler._get_collisions())
+def segment_pairs(pts_a, pts_b):
+    moving_lines = list(util.pairwise(pts_a))
+    obstacle_lines = list(util.pairwise(pts_b))
+    collisions = []
+    for moving_line in moving_lines:
+        for obstacle_line in obstacle_lines:
+            if not geometry.segments_aabb_overlap(moving_line,
+                                                  obstacle_line):
+                continue
+            collision_pt = geometry.get_segment_intersect_point(
+                moving_line, obstacle_line
+            )
+            if collision_pt is None:
+                continue
+            collisions.append((moving_line, obstacle_line, collision_pt))
+    return collisions
+
+
+def run(pairs, func):
+    nb_hits = 0
+    start = time.perf_counter()
+    for (pts_a, pts_b) in pairs:
+        if func(pts_a, pts_b):
+            nb_hits += 1
+    return ((time.perf_counter() - start) * 1e6 / len(pairs), nb_hits)
+
+
+def main():
+    for (name, max_distance) in (
+                ("broadphase pairs", assets.TILE_SIZE[0] * 2),
+                ("close pairs", assets.TILE_SIZE[0] // 2),
+            ):
+        rnd = random.Random(0)
+        pairs = [
+            (get_car_pts(rnd, max_distance), get_car_pts(rnd, max_distance))
+            for _ in range(0, NB_PAIRS)
+        ]
+        (segments, nb_segments) = run(pairs, segment_pairs)
+        (sat, nb_sat) = run(pairs, narrowphase.get_contact)
+        print("{:16s}: 16 segment tests {:6.2f} us/pair ({} hits)"
+              " | circle + SAT {:6.2f} us/pair ({} hits)".format(
+                  name, segments, nb_segments, sat, nb_sat))
+
+
+if __name__ == "__main__":
+    main()
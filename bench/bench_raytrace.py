@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Grid traversal cost according to the segment length, with the former
+per-pixel stepping and with the cell-by-cell traversal (util.raytrace).
+The grid is made of tiles, as in CollisionHandler.
+
+    PYTHONPATH=src python3 bench/bench_raytrace.py
+"""
+
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+
+
+LENGTHS = (64, 512, 4096)  # pixels (4096 ~ a machine gun shot)
+NB_SEGMENTS = 200
+
+
+# Former implementation (util.py before the cell-by-cell traversal)
+
+def legacy_raytrace(line, grid_size=1):
+    ((x0, y0), (x1, y1)) = line
+    x0 = int(x0)
+    y0 = int(y0)
+    x1 = int(x1)
+    y1 = int(y1)
+
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    x = x0
+    y = y0
+    n = 1 + dx + dy
+    x_inc = 1 if (x1 > x0) else -1
+    y_inc = 1 if (y1 > y0) else -1
+    error = dx - dy
+    dx *= 2
+    dy *= 2
+
+    last_pos = None
+    for n in range(0, round(n)):
+        new_pos = (int(x / grid_size), int(y / grid_size))
+        if new_pos != last_pos:
+            yield(new_pos)
+            last_pos = new_pos
+
+        if error > 0:
+            x += x_inc
+            error -= dy
+        else:
+            y += y_inc
+            error += dx
+
+
+
+def bench(raytrace, length):
+    # diagonal-ish segments
+    segments = [
+        ((idx * 3, idx * 7), (idx * 3 + length * 0.8, idx * 7 + length * 0.6))
+        for idx in range(0, NB_SEGMENTS)
+    ]
+    nb_cells = 0
+    start = time.perf_counter()
+    for segment in segments:
+        for cell in raytrace(segment, assets.TILE_SIZE[0]):
+            nb_cells += 1
+    duration = time.perf_counter() - start
+    return (duration / NB_SEGMENTS, nb_cells / NB_SEGMENTS)
+
+
+def main():
+    print("{:<8} {:>8} {:>14} {:>14}".format(
+        "length", "cells", "legacy (us)", "raytrace (us)"
+    ))
+    for length in LENGTHS:
+        (t_legacy, cells) = bench(legacy_raytrace, length)
+        (t_new, _) = bench(util.raytrace, length)
+        print("{:<8} {:>8.1f} {:>14.1f} {:>14.1f}".format(
+            length, cells, t_legacy * 1e6, t_new * 1e6
+        ))
+
+
+if __name__ == "__main__":
+    main()
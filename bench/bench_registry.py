@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Cost of registering / unregistering drawers and animators while a lot of
+entities are already registered, compared with the former list-based
+implementation. Costs must stay flat when the number of entities grows.
+
+    PYTHONPATH=src python3 bench/bench_registry.py
+"""
+
+import time
+
+from rapide_et_furieux import registry
+
+
+NB_CHURN = 2000
+SIZES = (100, 1000, 10000)
+NB_LAYERS = 8
+
+
+class Entity(object):
+    def draw(self, screen):
+        pass
+
+    def move(self, frame_interval):
+        pass
+
+
+class ListRegistries(object):
+    """
+    Former implementation (util.py before the registries)
+    """
+
+    def __init__(self):
+        self.animators = []
+        self.drawers = []
+        self.rnd = 0
+
+    def add(self, layer, entity):
+        self.animators.append(entity.move)
+        self.drawers.append((layer, self.rnd, entity))
+        self.drawers.sort()
+        self.rnd += 1
+
+    def remove(self, entity):
+        self.animators.remove(entity.move)
+        for tup in self.drawers:
+            if tup[2] == entity:
+                break
+        self.drawers.remove(tup)
+
+    def frame(self):
+        for animator in reversed(self.animators):
+            animator(0.0)
+        for (layer, _, drawer) in self.drawers:
+            drawer.draw(None)
+
+
+class HandleRegistries(object):
+    def __init__(self):
+        self.animators = registry.Registry()
+        self.drawers = registry.LayeredRegistry()
+
+    def add(self, layer, entity):
+        self.animators.register(entity.move)
+        self.drawers.register(layer, entity)
+
+    def remove(self, entity):
+        self.animators.unregister(entity.move)
+        self.drawers.unregister(entity)
+
+    def frame(self):
+        for animator in reversed(self.animators):
+            animator(0.0)
+        for (layer, drawer) in self.drawers:
+            drawer.draw(None)
+
+
+def bench(impl, size):
+    regs = impl()
+    for idx in range(0, size):
+        regs.add(idx % NB_LAYERS, Entity())
+
+    # projectiles: created, they live for a few frames, and go away
+    start = time.perf_counter()
+    alive = []
+    for idx in range(0, NB_CHURN):
+        entity = Entity()
+        regs.add(idx % NB_LAYERS, entity)
+        alive.append(entity)
+        if len(alive) > 16:
+            regs.remove(alive.pop(0))
+    churn = (time.perf_counter() - start) / NB_CHURN
+
+    nb_frames = 20
+    start = time.perf_counter()
+    for _ in range(0, nb_frames):
+        regs.frame()
+    frame = (time.perf_counter() - start) / nb_frames / (size + 16)
+    return (churn, frame)
+
+
+def main():
+    print("{:<10} {:>8} {:>18} {:>22}".format(
+        "impl", "entities", "add+remove (us)", "frame per entity (us)"
+    ))
+    for impl in (ListRegistries, HandleRegistries):
+        for size in SIZES:
+            (churn, frame) = bench(impl, size)
+            print("{:<10} {:>8} {:>18.2f} {:>22.3f}".format(
+                impl.__name__[:-len("Registries")], size,
+                churn * 1e6, frame * 1e6
+            ))
+
+
+if __name__ == "__main__":
+    main()
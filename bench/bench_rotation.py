@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Sprite rotation: a pack of cars turning on every tick, each car rotating
+its image (Car.update_image()). pygame.transform.rotate() on each tick
+(former implementation) versus the rotation cache, with different numbers
+of steps per turn.
+
+    PYTHONPATH=src python3 bench/bench_rotation.py
+"""
+
+import random
+import time
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux.gfx import rotation
+
+
+NB_TICKS = 2000
+NB_CARS = 16
+CAR_MODELS = 4
+
+
+def get_angles(rnd):
+    # cars turn by a few degrees per tick at most
+    angles = [[rnd.uniform(0, 360)] for _ in range(0, NB_CARS)]
+    for _ in range(1, NB_TICKS):
+        for car_angles in angles:
+            car_angles.append(car_angles[-1] + rnd.uniform(-3, 3))
+    return angles
+
+
+def run(images, angles, func):
+    start = time.perf_counter()
+    for tick in range(0, NB_TICKS):
+        for (car, car_angles) in enumerate(angles):
+            func(images[car % len(images)], -car_angles[tick])
+    return (time.perf_counter() - start) * 1e6 / (NB_TICKS * NB_CARS)
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets.load_resources()
+    images = []
+    for rsc in assets.CARS[:CAR_MODELS]:
+        image = assets.get_resource(rsc)
+        images.append(pygame.transform.scale(image, (
+            int(image.get_size()[0] * assets.CAR_SCALE_FACTOR),
+            int(image.get_size()[1] * assets.CAR_SCALE_FACTOR),
+        )))
+    angles = get_angles(random.Random(0))
+
+    former = run(images, angles, pygame.transform.rotate)
+    print("pygame.transform.rotate(): {:5.1f} us/rotation".format(former))
+    for steps in (128, 256):
+        cache = rotation.RotationCache(steps=steps)
+        cached = run(images, angles, cache.rotate)
+        print("cache, {} steps       : {:5.1f} us/rotation ({} frames,"
+              " {} KiB, {} misses)".format(
+                  steps, cached, len(cache), cache.memory // 1024,
+                  cache.nb_misses))
+
+
+if __name__ == "__main__":
+    main()
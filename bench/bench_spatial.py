@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Cost per tick of keeping track of the cars (and of looking for the cars
+close to each of them), with the former full rebuild of the precomputed
+grid and with the incremental spatial hash.
+
+    PYTHONPATH=src python3 bench/bench_spatial.py
+"""
+
+import itertools
+import math
+import random
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import spatial
+
+
+NB_CARS = (8, 32, 64)
+NB_TICKS = 1200  # 10s of simulation
+TRACK_SIZE = 40  # tiles
+SPEED = 8  # pixels per tick (~960 px/s)
+NEIGHBOUR_DISTANCE = assets.TILE_SIZE[0] * 2
+
+
+class Car(object):
+    def __init__(self, rnd):
+        self.position = (
+            rnd.random() * TRACK_SIZE * assets.TILE_SIZE[0],
+            rnd.random() * TRACK_SIZE * assets.TILE_SIZE[1],
+        )
+        self.angle = rnd.random() * 2 * math.pi
+
+    def move(self):
+        self.angle += 0.01
+        self.position = (
+            self.position[0] + SPEED * math.cos(self.angle),
+            self.position[1] + SPEED * math.sin(self.angle),
+        )
+
+
+# Former implementation (CollisionHandler.precompute_moving() and
+# get_possible_obstacle())
+
+def legacy_precompute_moving(cars):
+    precomputed_moving = {}
+    for obstacle in cars:
+        grid = (int(obstacle.position[0] / assets.TILE_SIZE[0]),
+                int(obstacle.position[1] / assets.TILE_SIZE[1]))
+        offsets = itertools.product(
+            range(-2, 3, 1),
+            range(-2, 3, 1),
+        )
+        for offset in offsets:
+            pos = (grid[0] + offset[0], grid[1] + offset[1])
+            if pos not in precomputed_moving:
+                precomputed_moving[pos] = set()
+            precomputed_moving[pos].add(obstacle)
+    return precomputed_moving
+
+
+def legacy_get_possible_obstacle(precomputed, position):
+    grid = (
+        int(position[0] / assets.TILE_SIZE[0]),
+        int(position[1] / assets.TILE_SIZE[1]),
+    )
+    try:
+        return precomputed[grid]
+    except KeyError:
+        return []
+
+
+def run_legacy(cars):
+    nb_found = 0
+    for car in cars:
+        car.move()
+    precomputed = legacy_precompute_moving(cars)
+    for car in cars:
+        nb_found += len(legacy_get_possible_obstacle(precomputed,
+                                                     car.position))
+    return nb_found
+
+
+def run_incremental(grid, cars):
+    nb_found = 0
+    for car in cars:
+        car.move()
+        grid.update(car, car.position)
+    for car in cars:
+        nb_found += len(grid.query_radius(car.position, NEIGHBOUR_DISTANCE))
+    return nb_found
+
+
+def bench(nb_cars):
+    cars = [Car(random.Random(idx)) for idx in range(0, nb_cars)]
+    start = time.perf_counter()
+    for _ in range(0, NB_TICKS):
+        run_legacy(cars)
+    legacy = (time.perf_counter() - start) / NB_TICKS
+
+    cars = [Car(random.Random(idx)) for idx in range(0, nb_cars)]
+    grid = spatial.SpatialHash(assets.TILE_SIZE[0])
+    for car in cars:
+        grid.add(car, car.position)
+    start = time.perf_counter()
+    for _ in range(0, NB_TICKS):
+        run_incremental(grid, cars)
+    incremental = (time.perf_counter() - start) / NB_TICKS
+
+    print("{:3d} cars: full rebuild {:8.1f} us/tick"
+          " | incremental {:8.1f} us/tick ({:.1f}x)"
+          " | {:.1f}% of the updates change of cell".format(
+              nb_cars, legacy * 1e6, incremental * 1e6,
+              legacy / incremental,
+              100 * grid.nb_moves / (nb_cars * NB_TICKS)))
+
+
+def main():
+    for nb_cars in NB_CARS:
+        bench(nb_cars)
+
+
+if __name__ == "__main__":
+    main()
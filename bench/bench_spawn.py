@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Spawning 25 cars (Car.__init__(), which also prepares the frames of the
+car wreck): the former per-pixel generate_base_exploded(), run for each
+car, versus the vectorized version cached per car image.
+
+    PYTHONPATH=src python3 bench/bench_spawn.py
+"""
+
+import itertools
+import time
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import cars
+from rapide_et_furieux.gfx.racetrack import RaceTrack
+
+
+NB_CARS = 25
+
+
+# Former implementation (ExplodedCar.generate_base_exploded())
+def generate_base_exploded(img):
+    base_img = img.copy()
+    base_img = img.convert_alpha()
+    pixels = pygame.surfarray.pixels3d(base_img)
+    for (x, y) in itertools.product(
+                range(0, base_img.get_size()[0]),
+                range(0, base_img.get_size()[1])
+            ):
+        p = pixels[x][y]
+        v = int(p[0]) + int(p[1]) + int(p[2])
+        v /= 3
+        if v >= 192:
+            v = 255 - v
+        pixels[x][y] = (v, v, v)
+    del pixels
+
+    imgs = []
+    nb_imgs = cars.ExplodedCar.LIFE_LENGTH * cars.ExplodedCar.IMG_PER_SECOND
+    for t in range(0, int(nb_imgs)):
+        t *= 0.75
+        t = 255 - int(255 * t / nb_imgs)
+        img = base_img.copy()
+        pixels = pygame.surfarray.pixels_alpha(img)
+        for (x, y) in itertools.product(
+                    range(0, img.get_size()[0]),
+                    range(0, img.get_size()[1])
+                ):
+            p = pixels[x][y]
+            if p > t:
+                p = t
+            pixels[x][y] = p
+        del pixels
+        imgs.append(img)
+    return imgs
+
+
+def spawn(race_track):
+    start = time.perf_counter()
+    iter_car_rsc = itertools.cycle(assets.CARS)
+    for idx in range(0, NB_CARS):
+        cars.Car(next(iter_car_rsc), race_track, util.GAME_SETTINGS_TEMPLATE,
+                 (idx * 100, 0), 0)
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets.load_resources()
+    race_track = RaceTrack()
+    race_track.add_checkpoint((0, 0))
+
+    cached = cars.ExplodedCar.__dict__['get_base_exploded']
+    cars.ExplodedCar.get_base_exploded = staticmethod(generate_base_exploded)
+    former = spawn(race_track)
+    cars.ExplodedCar.get_base_exploded = cached
+    cold = spawn(race_track)
+    warm = spawn(race_track)
+    print("{} cars: per pixel {:7.1f} ms | vectorized + cached {:5.1f} ms"
+          " (cache already filled: {:4.1f} ms)".format(
+              NB_CARS, former, cold, warm))
+
+
+if __name__ == "__main__":
+    main()
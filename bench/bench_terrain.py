@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Terrain lookups (RaceTrack.get_terrain(), called for each car on each
+tick): scan of all the crap areas (former implementation) versus the
+terrain map, for an increasing number of crap areas.
+
+    PYTHONPATH=src python3 bench/bench_terrain.py
+"""
+
+import random
+import time
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import terrain
+
+
+NB_LOOKUPS = 100000
+TRACK_SIZE = (24, 24)  # tiles
+ROAD = ("rapide_et_furieux.gfx.tiles", "road_asphalt01.png")
+
+
+class CrapArea(object):
+    def __init__(self, pt_a, pt_b):
+        self.pt_a = pt_a
+        self.pt_b = pt_b
+
+    def inside(self, position):
+        return (self.pt_a[0] <= position[0] and
+                self.pt_a[1] <= position[1] and
+                position[0] <= self.pt_b[0] and
+                position[1] <= self.pt_b[1])
+
+
+# Former implementation (RaceTrack.get_terrain())
+def get_terrain(crap_areas, position):
+    for area in crap_areas:
+        if area.inside(position):
+            return "crap"
+    return "normal"
+
+
+def run(func, positions):
+    start = time.perf_counter()
+    for position in positions:
+        func(position)
+    return (time.perf_counter() - start) * 1e9 / len(positions)
+
+
+def main():
+    rnd = random.Random(0)
+    (width, height) = (TRACK_SIZE[0] * assets.TILE_SIZE[0],
+                       TRACK_SIZE[1] * assets.TILE_SIZE[1])
+    tiles = {
+        (x, y): ROAD
+        for x in range(0, TRACK_SIZE[0]) for y in range(0, TRACK_SIZE[1])
+    }
+    positions = [(rnd.uniform(0, width), rnd.uniform(0, height))
+                 for _ in range(0, NB_LOOKUPS)]
+    for nb_areas in (2, 10, 50, 200):
+        areas = []
+        for _ in range(0, nb_areas):
+            (x, y) = (rnd.uniform(0, width - 300), rnd.uniform(0, height - 300))
+            areas.append(CrapArea(
+                (x, y), (x + rnd.uniform(20, 300), y + rnd.uniform(20, 300))
+            ))
+        start = time.perf_counter()
+        terrain_map = terrain.TerrainMap(
+            tiles, [(area.pt_a, area.pt_b) for area in areas]
+        )
+        build = time.perf_counter() - start
+        former = run(lambda position: get_terrain(areas, position), positions)
+        raster = run(terrain_map.get_terrain, positions)
+        print("{:3d} areas: scan {:6.0f} ns/lookup | terrain map {:4.0f}"
+              " ns/lookup (built in {:.1f} ms)".format(
+                  nb_areas, former, raster, build * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Car.move() throughput: cars accelerating and steering on an empty race
+track. Rotations through polar coordinates (former implementation of
+Car._recompute_pts(), Car.apply_speed() and Car.turn()) versus the
+transform module.
+
+    PYTHONPATH=src python3 bench/bench_transform.py
+"""
+
+import itertools
+import math
+import time
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import cars
+from rapide_et_furieux.gfx.racetrack import RaceTrack
+
+
+NB_TICKS = 2000
+NB_CARS = 8
+
+
+# Former implementation (Car)
+def _recompute_pts(self):
+    pts = [
+        ((- (self.original_size[0] / 2)) + self.COLLISION_MARGIN,
+         (- (self.original_size[1] / 2)) + self.COLLISION_MARGIN),
+        ((self.original_size[0] / 2) - self.COLLISION_MARGIN,
+         (- (self.original_size[1] / 2)) + self.COLLISION_MARGIN),
+        ((self.original_size[0] / 2) - self.COLLISION_MARGIN,
+         (self.original_size[1] / 2) - self.COLLISION_MARGIN),
+        ((- (self.original_size[0] / 2)) + self.COLLISION_MARGIN,
+         (self.original_size[1] / 2) - self.COLLISION_MARGIN),
+    ]
+    pts = [util.to_polar(pt) for pt in pts]
+    pts = [
+        (length, angle - self.radians + (math.pi / 2))
+        for (length, angle) in pts
+    ]
+    pts = [util.to_cartesian(pt) for pt in pts]
+    self._pts = [
+        (x + self.position[0], y + self.position[1])
+        for (x, y) in pts
+    ]
+
+
+def apply_speed(self, frame_interval, position, speed=None):
+    if speed is None:
+        speed = self.speed
+    speed = (speed[0] * frame_interval, speed[1] * frame_interval)
+    speed = util.to_polar(speed)
+    speed = (speed[0], speed[1] - self.radians)
+    speed = util.to_cartesian(speed)
+    return (position[0] + speed[0], position[1] + speed[1])
+
+
+def turn(self, angle_change, frame_interval):
+    self.radians = self.radians - angle_change
+    self.radians %= 2 * math.pi
+    self.recompute_pts()
+    speed = util.to_polar(self.speed)
+    speed = (speed[0], speed[1] - angle_change)
+    self.speed = util.to_cartesian(speed)
+    return angle_change
+
+
+def run():
+    race_track = RaceTrack()
+    race_track.add_checkpoint((0, 0))
+    race_track.collisions.precompute_static()
+    iter_car_rsc = itertools.cycle(assets.CARS)
+    for idx in range(0, NB_CARS):
+        car = cars.Car(next(iter_car_rsc), race_track,
+                       util.GAME_SETTINGS_TEMPLATE, (idx * 1000, 0), 0)
+        car.can_move = True
+        car.controls.accelerate = True
+        car.controls.steer_left = bool(idx % 2)
+        car.controls.steer_right = not car.controls.steer_left
+        race_track.add_car(car)
+
+    frame_interval = 1 / util.TICK_RATE
+    start = time.perf_counter()
+    for _ in range(0, NB_TICKS):
+        for car in race_track.cars:
+            car.move(frame_interval)
+            car.pts  # read by the collision tests
+    return (time.perf_counter() - start) * 1e6 / (NB_TICKS * NB_CARS)
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    assets.load_resources()
+
+    current = {
+        name: cars.Car.__dict__[name]
+        for name in ("_recompute_pts", "apply_speed", "turn")
+    }
+    cars.Car._recompute_pts = _recompute_pts
+    cars.Car.apply_speed = apply_speed
+    cars.Car.turn = turn
+    former = run()
+    for (name, method) in current.items():
+        setattr(cars.Car, name, method)
+    transform = run()
+    print("Car.move(): polar {:5.1f} us | transform {:5.1f} us".format(
+        former, transform))
+
+
+if __name__ == "__main__":
+    main()
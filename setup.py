@@ -35,5 +35,8 @@ setup(
             'ref-game = rapide_et_furieux.game:main',
             'ref-precompute = rapide_et_furieux.precompute:main',
         ],
+        'console_scripts': [
+            'ref-sim = rapide_et_furieux.simulate:main',
+        ],
     }
 )
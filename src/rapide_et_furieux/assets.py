@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
+import logging
+import traceback
+
 from pkg_resources import resource_filename
 
 import pygame
 
 
+logger = logging.getLogger(__name__)
+
+
 TILE_SIZE = (128, 128)
 BONUS_SIZE = (34, 34)
 
 BACKGROUND_LAYER = -1
+CAMERA_LAYER = 0
 RACE_TRACK_LAYER = 50
 WEAPONS_LAYER = 75
 RACE_TRACK_MINIATURE_LAYER = 100
@@ -309,10 +316,50 @@ SPAWN_TILES = {
 }
 
 g_resources = {}
+# images derived from the resources: (resource, recipe) --> surface.
+# See get_image()
+g_derived = {}
+
+# What to do when a file is read once the race has started: None (nothing),
+# "log" or "raise". See set_race_started().
+DISK_ACCESS_CHECK_NONE = None
+DISK_ACCESS_CHECK_LOG = "log"
+DISK_ACCESS_CHECK_RAISE = "raise"
+g_disk_access_check = DISK_ACCESS_CHECK_NONE
+g_race_started = False
+
+
+class DiskAccessError(Exception):
+    pass
+
+
+def set_disk_access_check(check):
+    global g_disk_access_check
+    g_disk_access_check = check
+
+
+def set_race_started(started):
+    """
+    Everything the race needs must be loaded before the race starts
+    """
+    global g_race_started
+    g_race_started = started
+
+
+def check_disk_access(path):
+    if not g_race_started or g_disk_access_check is None:
+        return
+    if g_disk_access_check == DISK_ACCESS_CHECK_RAISE:
+        raise DiskAccessError(
+            "{} read while the race is running".format(path)
+        )
+    logger.warning("%s read while the race is running:\n%s", path,
+                   "".join(traceback.format_stack(limit=8)))
 
 
 def load_image(rsc):
     img_path = resource_filename(*rsc)
+    check_disk_access(img_path)
     img = pygame.image.load(img_path)
     if img.get_alpha() is not None:
         img = img.convert_alpha()
@@ -323,6 +370,7 @@ def load_image(rsc):
 
 def load_sound(rsc):
     snd_path = resource_filename(*(rsc[:2]))
+    check_disk_access(snd_path)
     snd = pygame.mixer.Sound(file=snd_path)
     snd.set_volume(rsc[2])
     return snd
@@ -363,14 +411,8 @@ def load_resources():
     rsc.update({obj_rsc: load_image(obj_rsc) for obj_rsc in SKIDMARKS})
     rsc[TURRET_BASE] = load_image(TURRET_BASE)
     rsc[MINE] = load_image(MINE)
-    rsc[MINE] = pygame.transform.scale(
-        rsc[MINE],
-        (
-            int(rsc[MINE].get_size()[0] / 10),
-            int(rsc[MINE].get_size()[1] / 10),
-        )
-    )
     rsc[MISSILE] = load_image(MISSILE)
+    rsc[SHIELD] = load_image(SHIELD)
     rsc[SKIDMARK_OIL] = load_image(SKIDMARK_OIL)
 
     # sounds
@@ -394,9 +436,58 @@ def load_resources():
     })
 
     g_resources = rsc
+    g_derived.clear()
 
 
 def get_resource(rsc):
     rsc = rsc[:2]
     rsc = tuple(rsc)
     return g_resources[rsc]
+
+
+def _apply(img, step):
+    (op, arg) = step
+    size = img.get_size()
+    if op == "scale":
+        return pygame.transform.scale(
+            img, (int(size[0] * arg), int(size[1] * arg))
+        )
+    if op == "fit":
+        # scale down to fit in a square of 'arg' pixels
+        ratio = max(size[0] / arg, size[1] / arg)
+        return pygame.transform.scale(
+            img, (int(size[0] / ratio), int(size[1] / ratio))
+        )
+    if op == "rotate":
+        return pygame.transform.rotate(img, arg)
+    if op == "crop":
+        # keep the 'arg' first lines
+        return img.subsurface((0, 0), (size[0], arg))
+    raise ValueError("Unknown image operation: {}".format(op))
+
+
+def get_image(rsc, *recipe):
+    """
+    Image resource, transformed by the steps of the recipe, in order:
+    ("scale", factor), ("fit", size), ("rotate", angle in degrees) or
+    ("crop", height).
+    Each (resource, recipe) is computed only once: the returned surfaces
+    are shared and must not be modified.
+    Images that load_resources() didn't load are read from the disk on
+    their first use.
+    """
+    rsc = tuple(rsc[:2])
+    key = (rsc, recipe)
+    try:
+        return g_derived[key]
+    except KeyError:
+        pass
+    if len(recipe) <= 0:
+        try:
+            img = g_resources[rsc]
+        except KeyError:
+            img = g_resources[rsc] = load_image(rsc)
+    else:
+        img = _apply(get_image(rsc, *recipe[:-1]), recipe[-1])
+    g_derived[key] = img
+    return img
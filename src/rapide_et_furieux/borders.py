@@ -0,0 +1,180 @@
+"""
+Load-time optimization of the track borders.
+
+In the maps, borders are independent segments drawn by hand in the editor:
+many of them are collinear, touch end to end, or almost touch. The
+collision structures don't need them as drawn: optimize() merges them into
+polylines ("chains") sharing their vertices, with as few segments as
+possible. The editable borders (RaceTrack.borders) are left untouched.
+
+Beware that chains are open polylines: util.pairwise() must not be used on
+them (it closes the polygons). A loop is a chain ending on its first point.
+"""
+
+import collections
+import logging
+
+from . import util
+
+
+logger = logging.getLogger(__name__)
+
+# endpoints closer than this are merged (pixels)
+SNAP_DISTANCE = 3
+# a vertex is dropped if it's closer than this to the segment replacing it
+# (pixels)
+COLLINEAR_TOLERANCE = 1.0
+
+
+Report = collections.namedtuple(
+    typename="Report",
+    field_names=(
+        "nb_segments",  # before optimization
+        "nb_chains",
+        "nb_chain_segments",  # after optimization
+    ),
+)
+
+
+def _snap(segments, snap_distance):
+    """
+    Replaces the endpoints closer than snap_distance by the first of them
+    """
+    snap_sq = snap_distance ** 2
+    vertices = []
+    snapped = {}
+
+    def snap(pt):
+        try:
+            return snapped[pt]
+        except KeyError:
+            pass
+        for vertex in vertices:
+            if util.distance_sq_pt_to_pt(pt, vertex) <= snap_sq:
+                break
+        else:
+            vertex = pt
+            vertices.append(vertex)
+        snapped[pt] = vertex
+        return vertex
+
+    return [(snap(tuple(a)), snap(tuple(b))) for (a, b) in segments]
+
+
+def _get_graph(segments):
+    """
+    Drops the zero-length and duplicate segments, and returns the
+    neighbours of each vertex
+    """
+    neighbours = collections.OrderedDict()
+    for (a, b) in segments:
+        if a == b:
+            continue
+        neighbours.setdefault(a, [])
+        neighbours.setdefault(b, [])
+        if b in neighbours[a]:
+            continue
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+    return neighbours
+
+
+def _walk(neighbours, visited, start, first):
+    chain = [start, first]
+    visited.add(frozenset((start, first)))
+    while len(neighbours[chain[-1]]) == 2:
+        for pt in neighbours[chain[-1]]:
+            edge = frozenset((chain[-1], pt))
+            if edge not in visited:
+                break
+        else:
+            break  # loop closed
+        visited.add(edge)
+        chain.append(pt)
+    return chain
+
+
+def _get_chains(neighbours):
+    """
+    Chains go from a vertex that is not shared by exactly 2 segments
+    (an end or a junction) to another one. What remains are loops.
+    """
+    chains = []
+    visited = set()
+    for (vertex, pts) in neighbours.items():
+        if len(pts) == 2:
+            continue
+        for pt in pts:
+            if frozenset((vertex, pt)) not in visited:
+                chains.append(_walk(neighbours, visited, vertex, pt))
+    for (vertex, pts) in neighbours.items():
+        for pt in pts:
+            if frozenset((vertex, pt)) not in visited:
+                chains.append(_walk(neighbours, visited, vertex, pt))
+    return chains
+
+
+def _merge_collinear(chain, tolerance):
+    tolerance_sq = tolerance ** 2
+    pts = [chain[0]]
+    dropped = []
+    for (pt, next_pt) in zip(chain[1:-1], chain[2:]):
+        segment = (pts[-1], next_pt)
+        # going back on the same line is not collinear for our purpose
+        forward = (
+            ((pt[0] - pts[-1][0]) * (next_pt[0] - pt[0])) +
+            ((pt[1] - pts[-1][1]) * (next_pt[1] - pt[1]))
+        ) > 0
+        if forward and all(
+                    util.distance_sq_pt_to_segment(segment, other) <=
+                    tolerance_sq
+                    for other in dropped + [pt]
+                ):
+            dropped.append(pt)
+            continue
+        pts.append(pt)
+        dropped = []
+    pts.append(chain[-1])
+    return pts
+
+
+def optimize(segments, snap_distance=SNAP_DISTANCE,
+             tolerance=COLLINEAR_TOLERANCE):
+    """
+    segments: iterable of ((x, y), (x, y))
+    Returns (chains, report). Each chain is a list of points: chain[i] and
+    chain[i + 1] are the ends of a segment.
+    """
+    segments = list(segments)
+    neighbours = _get_graph(_snap(segments, snap_distance))
+    chains = [
+        _merge_collinear(chain, tolerance)
+        for chain in _get_chains(neighbours)
+    ]
+    report = Report(
+        nb_segments=len(segments),
+        nb_chains=len(chains),
+        nb_chain_segments=sum(len(chain) - 1 for chain in chains),
+    )
+    return (chains, report)
+
+
+def get_segments(chain):
+    return zip(chain[:-1], chain[1:])
+
+
+def optimize_borders(borders):
+    """
+    borders: track borders (objects with a 'pts' attribute)
+    """
+    (chains, report) = optimize(
+        segment
+        for border in borders
+        for segment in util.pairwise(border.pts)
+    )
+    logger.info(
+        "Track borders: %d segments -> %d chains, %d segments (%d removed)",
+        report.nb_segments, report.nb_chains, report.nb_chain_segments,
+        report.nb_segments - report.nb_chain_segments
+    )
+    return (chains, report)
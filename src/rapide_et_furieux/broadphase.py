@@ -0,0 +1,120 @@
+"""
+Broadphase for moving objects: finds the pairs of objects close enough
+to collide
+"""
+
+
+class SweepAndPrune(object):
+    """
+    Sort and sweep on the x axis. All the objects have the same size: a
+    square of 'size' pixels centered on their 'position' attribute. Two
+    objects form a pair if their squares overlap.
+
+    The objects are kept sorted by x from one call of update() to the
+    next. Objects move only by a few pixels between two calls, so the list
+    is almost sorted already and sorting it again is linear (timsort).
+    The sweep then only looks at the objects whose x intervals overlap.
+
+    Pairs are computed once per update(), not by each object.
+
+    Sleeping objects don't move: pairs of 2 sleeping objects are skipped.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.objects = []  # sorted by x
+        self.neighbours = {}  # obj --> [obj, ...]
+        self.sleeping = set()
+        self.nb_pairs = 0
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, obj):
+        return obj in self.neighbours
+
+    def _overlap(self, obj_a, obj_b):
+        (pos_a, pos_b) = (obj_a.position, obj_b.position)
+        return (abs(pos_a[0] - pos_b[0]) < self.size and
+                abs(pos_a[1] - pos_b[1]) < self.size)
+
+    def _add_pairs(self, obj):
+        neighbours = self.neighbours[obj]
+        for other in self.objects:
+            if other is obj or other in neighbours:
+                continue
+            if self._overlap(obj, other):
+                neighbours.append(other)
+                self.neighbours[other].append(obj)
+                self.nb_pairs += 1
+
+    def add(self, obj):
+        """
+        The pairs of the new object are computed immediately
+        """
+        if obj in self.neighbours:
+            raise KeyError("Already in the broadphase: {}".format(obj))
+        self.neighbours[obj] = []
+        self._add_pairs(obj)
+        self.objects.append(obj)
+
+    def remove(self, obj):
+        neighbours = self.neighbours.pop(obj)
+        for other in neighbours:
+            self.neighbours[other].remove(obj)
+        self.nb_pairs -= len(neighbours)
+        self.objects.remove(obj)
+        self.sleeping.discard(obj)
+
+    def set_sleeping(self, obj, sleeping):
+        """
+        An object waking up gets its pairs with the sleeping objects back
+        immediately
+        """
+        if obj not in self.neighbours:
+            raise KeyError("Not in the broadphase: {}".format(obj))
+        if sleeping:
+            self.sleeping.add(obj)
+        elif obj in self.sleeping:
+            self.sleeping.remove(obj)
+            self._add_pairs(obj)
+
+    def update(self):
+        objects = self.objects
+        objects.sort(key=lambda obj: obj.position[0])
+        size = self.size
+
+        neighbours = {obj: [] for obj in objects}
+        positions = [obj.position for obj in objects]
+        sleeping = [obj in self.sleeping for obj in objects]
+        nb_objects = len(objects)
+        nb_pairs = 0
+        for idx_a in range(0, nb_objects):
+            (xa, ya) = positions[idx_a]
+            max_x = xa + size
+            for idx_b in range(idx_a + 1, nb_objects):
+                (xb, yb) = positions[idx_b]
+                if xb >= max_x:
+                    # sorted: the next ones are even further
+                    break
+                if abs(ya - yb) >= size:
+                    continue
+                if sleeping[idx_a] and sleeping[idx_b]:
+                    continue
+                neighbours[objects[idx_a]].append(objects[idx_b])
+                neighbours[objects[idx_b]].append(objects[idx_a])
+                nb_pairs += 1
+        self.neighbours = neighbours
+        self.nb_pairs = nb_pairs
+
+    def get_neighbours(self, obj):
+        """
+        Objects paired with 'obj' on the last update()
+        """
+        return self.neighbours[obj]
+
+    def get_pairs(self):
+        for obj_a in self.objects:
+            for obj_b in self.neighbours[obj_a]:
+                if id(obj_a) < id(obj_b):
+                    yield (obj_a, obj_b)
@@ -0,0 +1,230 @@
+"""
+Bounding volume hierarchy over static segments (track borders)
+"""
+
+from . import geometry
+
+
+def get_box(segment):
+    ((x0, y0), (x1, y1)) = segment
+    return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+
+def get_pts_box(pts):
+    xs = [pt[0] for pt in pts]
+    ys = [pt[1] for pt in pts]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _merge_boxes(boxes):
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def _clip_segment(x, y, dx, dy, box, t_max=1.0):
+    """
+    Slab test. Returns the parameter t (0 <= t <= t_max) at which
+    (x, y) + t * (dx, dy) enters the box, or None if it doesn't reach it.
+    """
+    t_min = 0.0
+    for (origin, direction, low, high) in (
+                (x, dx, box[0], box[2]),
+                (y, dy, box[1], box[3]),
+            ):
+        if direction == 0:
+            if origin < low or origin > high:
+                return None
+            continue
+        t0 = (low - origin) / direction
+        t1 = (high - origin) / direction
+        if t0 > t1:
+            (t0, t1) = (t1, t0)
+        if t0 > t_min:
+            t_min = t0
+        if t1 < t_max:
+            t_max = t1
+        if t_min > t_max:
+            return None
+    return t_min
+
+
+class SegmentBVH(object):
+    """
+    Binary tree of axis-aligned bounding boxes. Built once (the segments
+    can't move), by splitting the segments in 2 halves along the longest
+    axis of their bounding box, until there are at most MAX_LEAF_SIZE
+    segments in a node.
+
+    Nodes are stored depth-first in flat lists: the left child of node N is
+    N + 1, and its right child is self.rights[N].
+
+    Queries return (payload, segment): the payload given to the
+    constructor (the track border for instance) and the segment itself.
+    """
+    MAX_LEAF_SIZE = 4
+
+    def __init__(self, items=()):
+        """
+        items: iterable of (payload, segment)
+        """
+        items = list(items)
+        self.payloads = []
+        self.segments = []
+        self.item_boxes = []
+
+        self.boxes = []
+        self.rights = []
+        # for the leaves: first item and number of items
+        # (number of items = 0 for the other nodes)
+        self.firsts = []
+        self.counts = []
+
+        if len(items) <= 0:
+            return
+        entries = [
+            (get_box(segment), payload, segment)
+            for (payload, segment) in items
+        ]
+        self._build(entries)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def _build(self, entries):
+        node = len(self.boxes)
+        box = _merge_boxes([entry[0] for entry in entries])
+        self.boxes.append(box)
+        self.rights.append(None)
+        self.firsts.append(len(self.segments))
+        self.counts.append(0)
+
+        if len(entries) <= self.MAX_LEAF_SIZE:
+            for (item_box, payload, segment) in entries:
+                self.item_boxes.append(item_box)
+                self.payloads.append(payload)
+                self.segments.append(segment)
+            self.counts[node] = len(entries)
+            return
+
+        if box[2] - box[0] >= box[3] - box[1]:
+            entries.sort(key=lambda entry: entry[0][0] + entry[0][2])
+        else:
+            entries.sort(key=lambda entry: entry[0][1] + entry[0][3])
+        middle = len(entries) // 2
+        self._build(entries[:middle])
+        self.rights[node] = len(self.boxes)
+        self._build(entries[middle:])
+
+    def query_box(self, box):
+        """
+        Yields the segments whose bounding box overlaps the box
+        (x0, y0, x1, y1).
+        """
+        if len(self.boxes) <= 0:
+            return
+        (x0, y0, x1, y1) = box
+        boxes = self.boxes
+        counts = self.counts
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            node_box = boxes[node]
+            if (node_box[0] > x1 or node_box[2] < x0 or
+                    node_box[1] > y1 or node_box[3] < y0):
+                continue
+            count = counts[node]
+            if count <= 0:
+                stack.append(self.rights[node])
+                stack.append(node + 1)
+                continue
+            first = self.firsts[node]
+            for idx in range(first, first + count):
+                item_box = self.item_boxes[idx]
+                if (item_box[0] > x1 or item_box[2] < x0 or
+                        item_box[1] > y1 or item_box[3] < y0):
+                    continue
+                yield (self.payloads[idx], self.segments[idx])
+
+    def query_segment(self, segment):
+        """
+        Yields the segments whose bounding box is crossed by the segment.
+        Candidates only: they may not intersect the segment itself.
+        """
+        if len(self.boxes) <= 0:
+            return
+        ((x, y), (x1, y1)) = segment
+        (dx, dy) = (x1 - x, y1 - y)
+        boxes = self.boxes
+        counts = self.counts
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if _clip_segment(x, y, dx, dy, boxes[node]) is None:
+                continue
+            count = counts[node]
+            if count <= 0:
+                stack.append(self.rights[node])
+                stack.append(node + 1)
+                continue
+            first = self.firsts[node]
+            for idx in range(first, first + count):
+                if _clip_segment(x, y, dx, dy, self.item_boxes[idx]) is None:
+                    continue
+                yield (self.payloads[idx], self.segments[idx])
+
+    def raycast(self, segment):
+        """
+        Returns the first segment hit when going from segment[0] to
+        segment[1], as (payload, segment, point), or None.
+        """
+        if len(self.boxes) <= 0:
+            return None
+        ((x, y), (x1, y1)) = segment
+        (dx, dy) = (x1 - x, y1 - y)
+        boxes = self.boxes
+        counts = self.counts
+        best = None
+        best_t = 1.0
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            t = _clip_segment(x, y, dx, dy, boxes[node], best_t)
+            if t is None:
+                continue
+            count = counts[node]
+            if count <= 0:
+                # look at the closest child first: the other one is then
+                # often skipped
+                left = node + 1
+                right = self.rights[node]
+                t_left = _clip_segment(x, y, dx, dy, boxes[left], best_t)
+                t_right = _clip_segment(x, y, dx, dy, boxes[right], best_t)
+                if t_left is None or (t_right is not None and
+                                      t_right < t_left):
+                    (left, right) = (right, left)
+                    (t_left, t_right) = (t_right, t_left)
+                if t_right is not None:
+                    stack.append(right)
+                if t_left is not None:
+                    stack.append(left)
+                continue
+            first = self.firsts[node]
+            for idx in range(first, first + count):
+                other = self.segments[idx]
+                pt = geometry.get_segment_intersect_point(segment, other)
+                if pt is None:
+                    continue
+                if dx != 0 or dy != 0:
+                    t = (
+                        ((pt[0] - x) * dx) + ((pt[1] - y) * dy)
+                    ) / ((dx * dx) + (dy * dy))
+                else:
+                    t = 0.0
+                if best is None or t < best_t:
+                    best = (self.payloads[idx], other, pt)
+                    best_t = t
+        return best
@@ -0,0 +1,220 @@
+"""
+Clearance field: distance from any point of the race track to the closest
+track border, sampled on a regular grid.
+
+The field is computed once with numpy (distance from each node of the grid
+to every border segment), then queries are constant time: bilinear
+interpolation between the 4 closest nodes for a point, and the lowest value
+of points sampled along a segment for a segment. Since the distance to the
+borders changes by at most 1 pixel per pixel, interpolated values are
+within about a cell of the exact distance.
+
+Borders are open lines, not closed shapes: there is no "inside" nor
+"outside" of the track, so the distance is unsigned.
+
+The field only depends on the borders: it is saved next to the map (see
+load_or_build()) and rebuilt when the borders change.
+"""
+
+import hashlib
+import logging
+import math
+import os
+
+import numpy
+
+from . import geometry
+
+
+logger = logging.getLogger(__name__)
+
+# maximum size of the distance matrices computed at once
+MAX_CHUNK_SIZE = 2 ** 20
+# clearance when there is no border at all
+NO_BORDER = 1e30
+
+
+def get_segments(borders):
+    """
+    All the segments of the borders (polylines, see borders.optimize())
+    """
+    return [
+        segment
+        for border in borders
+        for segment in zip(border.pts[:-1], border.pts[1:])
+    ]
+
+
+def get_cache_path(map_filepath):
+    return os.path.splitext(map_filepath)[0] + ".clearance.npz"
+
+
+class ClearanceField(object):
+    CELL_SIZE = 8  # pixels
+    # the field extends beyond the borders by this much
+    MARGIN = 64  # pixels
+
+    def __init__(self, origin, cell_size, distances, key=""):
+        """
+        distances[y][x] is the clearance at
+        (origin[0] + (x * cell_size), origin[1] + (y * cell_size))
+        """
+        self.origin = (float(origin[0]), float(origin[1]))
+        self.cell_size = float(cell_size)
+        self.distances = numpy.asarray(distances, dtype=numpy.float32)
+        (self.height, self.width) = self.distances.shape
+        # identifies the borders the field was built from
+        self.key = key
+
+    @staticmethod
+    def get_key(segments, cell_size):
+        h = hashlib.sha1()
+        h.update(geometry.to_segments(segments).tobytes())
+        h.update(str(float(cell_size)).encode("utf-8"))
+        return h.hexdigest()
+
+    @classmethod
+    def build(cls, segments, cell_size=None):
+        if cell_size is None:
+            cell_size = cls.CELL_SIZE
+        segments = geometry.to_segments(segments)
+        key = cls.get_key(segments, cell_size)
+        if len(segments) <= 0:
+            return cls((0, 0), cell_size, numpy.full((2, 2), NO_BORDER), key)
+
+        origin = (
+            segments[:, 0::2].min() - cls.MARGIN,
+            segments[:, 1::2].min() - cls.MARGIN,
+        )
+        width = 2 + int(math.ceil(
+            (segments[:, 0::2].max() + cls.MARGIN - origin[0]) / cell_size
+        ))
+        height = 2 + int(math.ceil(
+            (segments[:, 1::2].max() + cls.MARGIN - origin[1]) / cell_size
+        ))
+        xs = origin[0] + (numpy.arange(width) * cell_size)
+        ys = origin[1] + (numpy.arange(height) * cell_size)
+
+        distances = numpy.empty((height, width), dtype=numpy.float32)
+        nb_rows = max(1, MAX_CHUNK_SIZE // (width * len(segments)))
+        for first_row in range(0, height, nb_rows):
+            rows = ys[first_row:first_row + nb_rows]
+            (grid_x, grid_y) = numpy.meshgrid(xs, rows)
+            pts = numpy.column_stack((grid_x.ravel(), grid_y.ravel()))
+            dists = geometry.distance_sq_pts_to_segments(pts, segments)
+            distances[first_row:first_row + len(rows)] = numpy.sqrt(
+                dists.min(axis=1)
+            ).reshape(len(rows), width)
+        return cls(origin, cell_size, distances, key)
+
+    def save(self, filepath):
+        # numpy.savez() adds '.npz' to the file name if it's not there
+        with open(filepath, 'wb') as fd:
+            numpy.savez_compressed(
+                fd, origin=numpy.array(self.origin),
+                cell_size=numpy.array(self.cell_size),
+                distances=self.distances, key=numpy.array(self.key)
+            )
+
+    @classmethod
+    def load(cls, filepath):
+        with numpy.load(filepath) as data:
+            return cls(
+                tuple(data['origin']), float(data['cell_size']),
+                data['distances'], str(data['key'])
+            )
+
+    @classmethod
+    def load_or_build(cls, map_filepath, borders, cell_size=None):
+        """
+        Loads the field saved next to the map, or builds it (and tries to
+        save it) if there is none or if the borders have changed.
+        """
+        if cell_size is None:
+            cell_size = cls.CELL_SIZE
+        segments = get_segments(borders)
+        key = cls.get_key(segments, cell_size)
+        cache_path = get_cache_path(map_filepath)
+        try:
+            field = cls.load(cache_path)
+            if field.key == key:
+                logger.info("Clearance field loaded from %s", cache_path)
+                return field
+            logger.info("%s is outdated", cache_path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.info("No clearance field loaded from %s: %s",
+                        cache_path, exc)
+
+        logger.info("Building clearance field (%d segments) ...",
+                    len(segments))
+        field = cls.build(segments, cell_size)
+        try:
+            field.save(cache_path)
+        except OSError as exc:
+            logger.warning("Failed to save clearance field to %s: %s",
+                           cache_path, exc)
+        return field
+
+    def get_clearance(self, position):
+        """
+        Distance from the position to the closest border (interpolated).
+        Positions outside of the field get the value of the closest edge of
+        the field (lower than their actual clearance).
+        """
+        gx = (position[0] - self.origin[0]) / self.cell_size
+        gy = (position[1] - self.origin[1]) / self.cell_size
+        gx = min(max(gx, 0.0), self.width - 1.0)
+        gy = min(max(gy, 0.0), self.height - 1.0)
+        x = min(int(gx), self.width - 2)
+        y = min(int(gy), self.height - 2)
+        (fx, fy) = (gx - x, gy - y)
+        d = self.distances
+        top = (d[y, x] * (1.0 - fx)) + (d[y, x + 1] * fx)
+        bottom = (d[y + 1, x] * (1.0 - fx)) + (d[y + 1, x + 1] * fx)
+        return float((top * (1.0 - fy)) + (bottom * fy))
+
+    def get_clearances(self, positions):
+        """
+        Batched get_clearance(): returns an array of shape (len(positions),)
+        """
+        positions = geometry.to_points(positions)
+        gx = (positions[:, 0] - self.origin[0]) / self.cell_size
+        gy = (positions[:, 1] - self.origin[1]) / self.cell_size
+        gx = numpy.clip(gx, 0.0, self.width - 1.0)
+        gy = numpy.clip(gy, 0.0, self.height - 1.0)
+        x = numpy.minimum(gx.astype(numpy.intp), self.width - 2)
+        y = numpy.minimum(gy.astype(numpy.intp), self.height - 2)
+        (fx, fy) = (gx - x, gy - y)
+        d = self.distances
+        top = (d[y, x] * (1.0 - fx)) + (d[y, x + 1] * fx)
+        bottom = (d[y + 1, x] * (1.0 - fx)) + (d[y + 1, x + 1] * fx)
+        return (top * (1.0 - fy)) + (bottom * fy)
+
+    def get_segment_clearances(self, segments):
+        """
+        Lowest clearance along each segment, sampled every cell or less.
+        Returns an array of shape (len(segments),).
+        """
+        segments = geometry.to_segments(segments)
+        if len(segments) <= 0:
+            return numpy.empty((0,))
+        lengths = numpy.hypot(segments[:, 2] - segments[:, 0],
+                              segments[:, 3] - segments[:, 1])
+        nb_samples = 2 + numpy.ceil(lengths / self.cell_size).astype(
+            numpy.intp
+        )
+        firsts = numpy.cumsum(nb_samples) - nb_samples
+        # all the samples of all the segments in one array
+        seg_idx = numpy.repeat(numpy.arange(len(segments)), nb_samples)
+        t = (
+            (numpy.arange(len(seg_idx)) - firsts[seg_idx]) /
+            (nb_samples[seg_idx] - 1)
+        )
+        s = segments[seg_idx]
+        xs = s[:, 0] + (t * (s[:, 2] - s[:, 0]))
+        ys = s[:, 1] + (t * (s[:, 3] - s[:, 1]))
+        clearances = self.get_clearances(numpy.column_stack((xs, ys)))
+        return numpy.minimum.reduceat(clearances, firsts)
+
+    def get_segment_clearance(self, segment):
+        return float(self.get_segment_clearances([segment])[0])
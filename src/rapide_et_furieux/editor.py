@@ -93,7 +93,6 @@ class Editor(object):
             self.screen.get_size()[0] - 128, 0
         ))
         util.register_drawer(assets.OSD_LAYER - 1, fps_counter)
-        util.register_animator(fps_counter.on_frame)
 
         self.arrow_up = ui.Arrow(assets.ARROW_UP)
         self.arrow_up.relative = (
@@ -140,9 +139,11 @@ class Editor(object):
     def _load(self):
         with open(self.file_path, 'r') as fd:
             data = json.load(fd)
+        yield
         self.game_settings.update(data['game_settings'])
         self.background.set_color(self.game_settings['background_color'])
         self.race_track.unserialize(data['race_track'])
+        yield
         self.race_track_miniature.refresh()
         logger.info("Done")
         self.osd_message.show("Done")
@@ -161,8 +162,10 @@ class Editor(object):
                 'game_settings': self.game_settings,
             }
         data['race_track'] = self.race_track.serialize()
+        yield
         with open(self.file_path, 'w') as fd:
-            json.dump(data, fd, indent=4, sort_keys=True)
+            yield from util.json_dump_steps(data, fd, indent=4,
+                                            sort_keys=True)
         logger.info("Done")
         self.osd_message.show("Done")
 
@@ -5,7 +5,6 @@ import json
 import logging
 import os
 import sys
-import time
 
 import pygame
 
@@ -30,6 +29,7 @@ from .gfx.ui.console import (
     CommandListBonuses,
     CommandMusicNext,
     CommandMusicStop,
+    CommandPerf,
     CommandQuit,
     CommandShowFPS,
     Console,
@@ -46,6 +46,12 @@ logger = logging.getLogger(__name__)
 
 
 DEBUG = bool(int(os.getenv("DEBUG", "0")))
+TICK_RATE = int(os.getenv("TICK_RATE", str(util.TICK_RATE)))
+MAX_FPS = int(os.getenv("MAX_FPS", "0"))
+# time (milliseconds) that can be spent on each frame loading things
+IDLE_BUDGET = int(os.getenv("IDLE_BUDGET", "4")) / 1000
+# memory (MiB) used by the skidmarks
+DECAL_MEMORY = int(os.getenv("DECAL_MEMORY", "16")) * 1024 * 1024
 
 
 class Game(object):
@@ -64,6 +70,10 @@ class Game(object):
         self.race_track = None
         self.player = None
         self.race_track_miniature = None
+        # handles of what _load() registered, unregistered by unload()
+        self.animators = []
+        self.drawers = []
+        self.event_listeners = []
 
         self.background = ui.Background()
         util.register_drawer(assets.BACKGROUND_LAYER, self.background)
@@ -72,6 +82,8 @@ class Game(object):
         util.idle_add(self._init)
 
     def _init(self):
+        if DEBUG:
+            assets.set_disk_access_check(assets.DISK_ACCESS_CHECK_LOG)
         assets.load_resources()
         load_explosions()
 
@@ -83,9 +95,6 @@ class Game(object):
                 self.screen.get_size()[0] - 128, 0
             ))
             util.register_drawer(assets.OSD_LAYER - 1, fps_counter)
-            util.register_animator(fps_counter.on_frame)
-
-        util.register_animator(self.track_player_car)
 
         pygame.mouse.set_visible(False)
 
@@ -94,43 +103,72 @@ class Game(object):
         util.idle_add(self._load)
 
     def unload(self):
+        assets.set_race_started(False)
         if self.race_track is not None:
-            self.unregister_animator(
-                self.race_track.collisions.collisions.precompute_moving
-            )
+            # including the cars added from the console
             for car in self.race_track.cars:
                 util.unregister_animator(car.move)
-            self.unregister_drawer(self.race_track)
+                car.unregister_animators()
             self.race_track = None
+            self.race_track_miniature = None
+            self.player = None
+        for handle in self.animators:
+            # race_starter() unregisters itself
+            if handle.alive:
+                util.unregister_animator(handle)
+        for handle in self.drawers:
+            util.unregister_drawer(handle)
+        for handle in self.event_listeners:
+            util.unregister_event_listener(handle)
+        self.animators = []
+        self.drawers = []
+        self.event_listeners = []
 
     def _load(self):
+        """
+        Idle task: yields between each step to not freeze the display
+        """
         self.unload()
 
         # load map / race track
         with open(self.track_filepath, 'r') as fd:
             data = json.load(fd)
+        yield
         self.game_settings.update(data['game_settings'])
         self.background.set_color(self.game_settings['background_color'])
         self.race_track = RaceTrack(grid_margin=0, debug=DEBUG,
-                                    game_settings=self.game_settings)
-        util.register_drawer(assets.RACE_TRACK_LAYER, self.race_track)
+                                    game_settings=self.game_settings,
+                                    max_decal_memory=DECAL_MEMORY)
         self.race_track.unserialize(data['race_track'])
+        yield
         self.race_track.collisions.precompute_static()
+        self.drawers.append(
+            util.register_drawer(assets.RACE_TRACK_LAYER, self.race_track)
+        )
+        # the camera follows the interpolated position of the player car,
+        # so it is updated on each rendered frame, not on each tick
+        self.drawers.append(util.register_drawer(assets.CAMERA_LAYER, self))
+        yield
         self.race_track_miniature = RaceTrackMiniature(self.race_track)
-        util.register_drawer(assets.RACE_TRACK_MINIATURE_LAYER,
-                             self.race_track_miniature)
+        self.drawers.append(util.register_drawer(
+            assets.RACE_TRACK_MINIATURE_LAYER, self.race_track_miniature
+        ))
 
         waypoint_mgmt = WaypointManager.unserialize(
             data['ia'], self.game_settings, self.race_track
         )
+        yield
         waypoint_mgmt.optimize(self.race_track)
+        yield
 
         bonus = BonusGenerator(self.race_track, self.game_settings,
                                waypoint_mgmt)
-        util.register_animator(bonus.add_bonus)
+        self.animators.append(util.register_animator(bonus.add_bonus))
+        self.animators.append(
+            util.register_animator(self.race_track.collisions.update_pairs)
+        )
 
         # instantiate cars
-        util.register_animator(self.race_track.collisions.precompute_moving)
         tiles = self.race_track.tiles
         iter_car_rsc = iter(itertools.cycle(assets.CARS))
         player_car = None
@@ -163,37 +201,52 @@ class Game(object):
             'list_bonuses': CommandListBonuses(),
             'music_next': CommandMusicNext(self.music),
             'music_stop': CommandMusicStop(self.music),
+            'perf': CommandPerf(),
             'show_fps': CommandShowFPS(self.font, self.screen_size),
         }
         console = Console(commands)
-        util.register_drawer(assets.CONSOLE_LAYER, console)
-        util.register_event_listener(console.on_key)
+        self.drawers.append(
+            util.register_drawer(assets.CONSOLE_LAYER, console)
+        )
+        self.event_listeners.append(
+            util.register_event_listener(console.on_key)
+        )
 
-        util.register_event_listener(weapon_selector.on_key)
-        util.register_drawer(assets.WEAPON_SELECTOR_LAYER, weapon_selector)
+        self.event_listeners.append(
+            util.register_event_listener(weapon_selector.on_key)
+        )
+        self.drawers.append(util.register_drawer(
+            assets.WEAPON_SELECTOR_LAYER, weapon_selector
+        ))
 
-        self.game_start = time.time()
-        util.register_animator(self.race_starter)
+        self.game_start = util.sim_time()
+        self.countdown = None
+        self.animators.append(util.register_animator(self.race_starter))
 
         logger.info("Done")
 
-    def track_player_car(self, frame_interval):
+    def track_player_car(self):
         if not self.player:
             return
+        position = self.player.render_position
         self.race_track.relative = (
-            int(self.screen_size[0] / 2 - self.player.position[0]),
-            int(self.screen_size[1] / 2 - self.player.position[1]),
+            int(self.screen_size[0] / 2 - position[0]),
+            int(self.screen_size[1] / 2 - position[1]),
         )
 
+    def draw(self, screen):
+        self.track_player_car()
+
     def race_starter(self, frame_interval):
-        now = time.time()
+        now = util.sim_time()
         t = now - self.game_start
         if int(t) != self.countdown:
             logger.info("Countdown: {}".format(COUNTDOWN - int(t)))
             self.countdown = int(t)
             if self.countdown >= COUNTDOWN:
                 self.race_track.start_race()
-                util.idle_add(util.unregister_animator, self.race_starter)
+                assets.set_race_started(True)
+                util.unregister_animator(self.race_starter)
 
 
 def main():
@@ -216,4 +269,5 @@ def main():
     game = Game(screen, sys.argv[1])
     util.idle_add(game.load)
 
-    util.main_loop(screen)
+    util.main_loop(screen, tick_rate=TICK_RATE, max_fps=MAX_FPS,
+                   idle_budget=IDLE_BUDGET)
@@ -0,0 +1,283 @@
+"""
+Geometry kernel.
+
+Scalar functions work on plain numbers: a point is (x, y), a segment
+((x0, y0), (x1, y1)). They don't allocate any intermediate object, so
+they can be called for each pair of segments on each tick.
+
+Batched functions compute the same things on arrays of points and
+segments at once. Points are arrays of shape (N, 2) and segments arrays of
+shape (N, 4) (x0, y0, x1, y1). Lists of tuples are converted
+automatically. For a single pair, the scalar functions are faster (numpy
+has a fixed cost per call).
+
+Intersection tests rely on the sign of cross products ("orientation")
+instead of slopes: they are exact for integer coordinates, including
+vertical and collinear segments.
+"""
+
+import numpy
+
+
+def segments_aabb_overlap(segment_a, segment_b):
+    """
+    Do the bounding boxes of the segments overlap ? (cheap rejection test)
+    """
+    (ax0, ay0) = (segment_a[0][0], segment_a[0][1])
+    (ax1, ay1) = (segment_a[1][0], segment_a[1][1])
+    (bx0, by0) = (segment_b[0][0], segment_b[0][1])
+    (bx1, by1) = (segment_b[1][0], segment_b[1][1])
+    if ax0 > ax1:
+        (ax0, ax1) = (ax1, ax0)
+    if bx0 > bx1:
+        (bx0, bx1) = (bx1, bx0)
+    if ax0 > bx1 or bx0 > ax1:
+        return False
+    if ay0 > ay1:
+        (ay0, ay1) = (ay1, ay0)
+    if by0 > by1:
+        (by0, by1) = (by1, by0)
+    return ay0 <= by1 and by0 <= ay1
+
+
+def _in_box(x0, y0, x1, y1, x, y):
+    return (
+        (x0 <= x <= x1 or x1 <= x <= x0) and
+        (y0 <= y <= y1 or y1 <= y <= y0)
+    )
+
+
+def get_segment_intersect_point(segment_a, segment_b):
+    """
+    Returns the point (x, y) where the segments intersect, or None.
+    Segments touching each other intersect. If the segments are collinear
+    and overlap, returns one of the end points in the overlap.
+    """
+    (ax0, ay0) = (segment_a[0][0], segment_a[0][1])
+    (ax1, ay1) = (segment_a[1][0], segment_a[1][1])
+    (bx0, by0) = (segment_b[0][0], segment_b[0][1])
+    (bx1, by1) = (segment_b[1][0], segment_b[1][1])
+
+    (rx, ry) = (ax1 - ax0, ay1 - ay0)
+    (sx, sy) = (bx1 - bx0, by1 - by0)
+    (qx, qy) = (bx0 - ax0, by0 - ay0)
+
+    denom = (rx * sy) - (ry * sx)
+    # a0 + t * r = b0 + u * s
+    t_num = (qx * sy) - (qy * sx)
+    u_num = (qx * ry) - (qy * rx)
+
+    if denom == 0:
+        if u_num != 0 or t_num != 0:
+            # parallel
+            return None
+        # collinear (or degenerated segments)
+        if _in_box(ax0, ay0, ax1, ay1, bx0, by0):
+            return (bx0, by0)
+        if _in_box(ax0, ay0, ax1, ay1, bx1, by1):
+            return (bx1, by1)
+        if _in_box(bx0, by0, bx1, by1, ax0, ay0):
+            return (ax0, ay0)
+        return None
+
+    # 0 <= t <= 1 and 0 <= u <= 1, without dividing
+    if denom < 0:
+        (denom, t_num, u_num) = (-denom, -t_num, -u_num)
+    if t_num < 0 or t_num > denom or u_num < 0 or u_num > denom:
+        return None
+    t = t_num / denom
+    return (ax0 + (t * rx), ay0 + (t * ry))
+
+
+def get_ray_segment_toi(origin, delta, segment):
+    """
+    Time of impact of a point moving from 'origin' to 'origin + delta'
+    with the segment: t (0 <= t <= 1) for which 'origin + t * delta' is on
+    the segment, or None. A point moving parallel to the segment never hits
+    it.
+    """
+    (ox, oy) = (origin[0], origin[1])
+    (rx, ry) = (delta[0], delta[1])
+    (ax, ay) = (segment[0][0], segment[0][1])
+    (sx, sy) = (segment[1][0] - ax, segment[1][1] - ay)
+    (qx, qy) = (ax - ox, ay - oy)
+
+    denom = (rx * sy) - (ry * sx)
+    if denom == 0:
+        return None
+    t_num = (qx * sy) - (qy * sx)
+    u_num = (qx * ry) - (qy * rx)
+    if denom < 0:
+        (denom, t_num, u_num) = (-denom, -t_num, -u_num)
+    if t_num < 0 or t_num > denom or u_num < 0 or u_num > denom:
+        return None
+    return t_num / denom
+
+
+def is_moving_toward(position, delta, segment):
+    """
+    Does moving from 'position' by 'delta' get closer to the line of the
+    segment ?
+    """
+    (ax, ay) = (segment[0][0], segment[0][1])
+    (sx, sy) = (segment[1][0] - ax, segment[1][1] - ay)
+    side = (sx * (position[1] - ay)) - (sy * (position[0] - ax))
+    move = (sx * delta[1]) - (sy * delta[0])
+    return side * move < 0 or (side == 0 and move != 0)
+
+
+def get_polygon_segment_toi(pts, delta, segment):
+    """
+    Time of impact of the convex polygon 'pts' translated by 'delta' with
+    the segment.
+
+    Returns (t, edge, contact_line, point) or None: the first t
+    (0 <= t <= 1) for which they touch, the edge of the polygon involved,
+    the line along which they touch and the contact point (at t). Either a
+    vertex of the polygon hits the segment (contact_line is the segment),
+    or an end point of the segment hits an edge of the polygon
+    (contact_line is the edge).
+
+    Contacts the polygon moves away from are ignored, so a polygon already
+    overlapping the segment can get out.
+    """
+    center = (
+        sum(pt[0] for pt in pts) / len(pts),
+        sum(pt[1] for pt in pts) / len(pts),
+    )
+    best = None
+    edges = list(zip(pts, pts[1:] + pts[:1]))
+    if is_moving_toward(center, delta, segment):
+        for edge in edges:
+            vertex = edge[0]
+            t = get_ray_segment_toi(vertex, delta, segment)
+            if t is not None and (best is None or t < best[0]):
+                best = (
+                    t, edge, segment, (vertex[0] + (t * delta[0]),
+                                       vertex[1] + (t * delta[1]))
+                )
+    reverse_delta = (-delta[0], -delta[1])
+    for edge in edges:
+        if not is_moving_toward(center, delta, edge):
+            continue
+        for end_point in segment:
+            t = get_ray_segment_toi(end_point, reverse_delta, edge)
+            if t is not None and (best is None or t < best[0]):
+                best = (t, edge, edge, (end_point[0], end_point[1]))
+    return best
+
+
+def to_points(points):
+    return numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2)
+
+
+def to_segments(segments):
+    return numpy.asarray(segments, dtype=numpy.float64).reshape(-1, 4)
+
+
+def distance_sq_pts_to_pts(points_a, points_b):
+    """
+    Returns a matrix of shape (len(points_a), len(points_b))
+    """
+    points_a = to_points(points_a)
+    points_b = to_points(points_b)
+    dx = points_a[:, numpy.newaxis, 0] - points_b[numpy.newaxis, :, 0]
+    dy = points_a[:, numpy.newaxis, 1] - points_b[numpy.newaxis, :, 1]
+    return (dx * dx) + (dy * dy)
+
+
+def distance_sq_pts_to_segments(points, segments):
+    """
+    Returns a matrix of shape (len(points), len(segments))
+    """
+    points = to_points(points)
+    segments = to_segments(segments)
+
+    px = points[:, numpy.newaxis, 0]
+    py = points[:, numpy.newaxis, 1]
+    x0 = segments[numpy.newaxis, :, 0]
+    y0 = segments[numpy.newaxis, :, 1]
+    sx = segments[numpy.newaxis, :, 2] - x0
+    sy = segments[numpy.newaxis, :, 3] - y0
+
+    length_sq = (sx * sx) + (sy * sy)
+    # segments of length 0 are points
+    safe_length_sq = numpy.where(length_sq == 0, 1.0, length_sq)
+    t = (((px - x0) * sx) + ((py - y0) * sy)) / safe_length_sq
+    t = numpy.clip(t, 0.0, 1.0)
+    t = numpy.where(length_sq == 0, 0.0, t)
+
+    dx = px - (x0 + (t * sx))
+    dy = py - (y0 + (t * sy))
+    return (dx * dx) + (dy * dy)
+
+
+def _orientations(ax, ay, bx, by, cx, cy):
+    """
+    Sign of the cross products (b - a) x (c - a): 1 if c is on the left of
+    (a, b), -1 if it is on the right, 0 if the 3 points are collinear.
+    """
+    return numpy.sign(((bx - ax) * (cy - ay)) - ((by - ay) * (cx - ax)))
+
+
+def _on_segment(ax, ay, bx, by, cx, cy):
+    """
+    Assuming c is collinear with (a, b): is it within the segment bounds ?
+    """
+    return (
+        (numpy.minimum(ax, bx) <= cx) & (cx <= numpy.maximum(ax, bx)) &
+        (numpy.minimum(ay, by) <= cy) & (cy <= numpy.maximum(ay, by))
+    )
+
+
+def segments_intersect(segments_a, segments_b):
+    """
+    Returns a boolean matrix of shape (len(segments_a), len(segments_b)).
+    Segments touching each other (end point on the other segment, collinear
+    overlapping segments, ...) intersect.
+    """
+    segments_a = to_segments(segments_a)
+    segments_b = to_segments(segments_b)
+
+    (ax0, ay0, ax1, ay1) = (
+        segments_a[:, numpy.newaxis, idx] for idx in range(0, 4)
+    )
+    (bx0, by0, bx1, by1) = (
+        segments_b[numpy.newaxis, :, idx] for idx in range(0, 4)
+    )
+
+    o1 = _orientations(ax0, ay0, ax1, ay1, bx0, by0)
+    o2 = _orientations(ax0, ay0, ax1, ay1, bx1, by1)
+    o3 = _orientations(bx0, by0, bx1, by1, ax0, ay0)
+    o4 = _orientations(bx0, by0, bx1, by1, ax1, ay1)
+
+    r = ((o1 * o2) < 0) & ((o3 * o4) < 0)
+    # special cases: an end point is on the other segment
+    r |= (o1 == 0) & _on_segment(ax0, ay0, ax1, ay1, bx0, by0)
+    r |= (o2 == 0) & _on_segment(ax0, ay0, ax1, ay1, bx1, by1)
+    r |= (o3 == 0) & _on_segment(bx0, by0, bx1, by1, ax0, ay0)
+    r |= (o4 == 0) & _on_segment(bx0, by0, bx1, by1, ax1, ay1)
+    return r
+
+
+def distance_sq_segments_to_segments(segments_a, segments_b):
+    """
+    Returns a matrix of shape (len(segments_a), len(segments_b)).
+    0 if the segments intersect. Otherwise, the smallest distance between
+    an end point and the other segment.
+    """
+    segments_a = to_segments(segments_a)
+    segments_b = to_segments(segments_b)
+
+    dist = numpy.minimum(
+        numpy.minimum(
+            distance_sq_pts_to_segments(segments_a[:, 0:2], segments_b),
+            distance_sq_pts_to_segments(segments_a[:, 2:4], segments_b),
+        ),
+        numpy.minimum(
+            distance_sq_pts_to_segments(segments_b[:, 0:2], segments_a).T,
+            distance_sq_pts_to_segments(segments_b[:, 2:4], segments_a).T,
+        )
+    )
+    dist[segments_intersect(segments_a, segments_b)] = 0
+    return dist
@@ -12,7 +12,7 @@ class RelativeSprite(pygame.sprite.Sprite):
         self.resource = resource
 
         if image is None:
-            image = assets.get_resource(resource[:2])
+            image = assets.get_image(resource)
 
         self.image = self.original = image
         self.size = self.image.get_size()
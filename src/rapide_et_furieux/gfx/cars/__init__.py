@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 
-import itertools
 import logging
 import math
 import random
 
+import numpy
 import pygame
 
 from .. import RelativeSprite
+from .. import rotation
 from ... import assets
 from ... import sounds
+from ... import transform
 from ... import util
 from ..collisions import CollisionObject
+from ..collisions import LAYER_BORDER
+from ..collisions import LAYER_CAR
+from ..collisions import LAYER_WRECK
 from ..weapons import common
 
 UNIQUE = 0
@@ -27,60 +32,32 @@ class Controls(object):
         self.steer_right = steer_right
 
 
-class SkidMark(RelativeSprite):
-    HEIGHT = 24
-    LIFE_LENGTH = 2.0
-    OFFSET = 16
+SKIDMARK_HEIGHT = 24
+SKIDMARK_OFFSET = 16
+# (resource, car size) --> image (see get_skidmark())
+g_skidmarks = {}
+# car image --> wreck frames (see ExplodedCar.get_base_exploded())
+g_base_exploded = {}
 
-    def __init__(self, racetrack, car, resource=None, image=None, scale=True):
-        if resource is None:
-            scale = True
-            resource = random.sample(assets.SKIDMARKS, 1)[0]
-        super().__init__(resource, image)
-
-        if scale:
-            self.original = self.image = self.original.subsurface(
-                (0, 0), (self.original.get_size()[0], self.HEIGHT)
-            )
-            self.original = self.image = pygame.transform.scale(
-                self.original,
-                (
-                    int(self.original.get_size()[0] * assets.CAR_SCALE_FACTOR),
-                    int(self.original.get_size()[1] * assets.CAR_SCALE_FACTOR),
-                )
-            )
-            car_size = car.original.get_size()
-            img = pygame.Surface(car_size, pygame.SRCALPHA)
-
-            pos = (0, self.OFFSET)
-            img.blit(self.original, pos)
-            pos = (0, car_size[1] - self.original.get_size()[1] - self.OFFSET)
-            img.blit(self.original, pos)
-            self.image = self.original = img
-
-        self.t = self.LIFE_LENGTH
-        self.parent = racetrack
-        self.car = car
-
-        # TODO(Jflesch): could be optimized
 
-        self.angle = car.angle
-        self.image = pygame.transform.rotate(self.image, -self.angle)
-        self.size = self.image.get_size()
-        self.relative = car.relative
-
-    def copy(self):
-        return SkidMark(self.parent, self.car, self.resource, self.original,
-                        scale=False)
-
-    def anim(self, frame_interval):
-        self.t -= frame_interval
-        if self.t < 0:
-            self.car.extra_drawers_below.remove(self)
-            util.unregister_animator(self.anim)
-
-    def draw(self, screen, car):
-        super().draw(screen)
+def get_skidmark(resource, car_size):
+    """
+    Image stamped in the race track decals (see gfx.decals) while a car
+    drifts: one mark under each side of the car.
+    """
+    key = (tuple(resource[:2]), car_size)
+    try:
+        return g_skidmarks[key]
+    except KeyError:
+        pass
+    mark = assets.get_image(
+        resource, ("crop", SKIDMARK_HEIGHT), ("scale", assets.CAR_SCALE_FACTOR)
+    )
+    img = pygame.Surface(car_size, pygame.SRCALPHA)
+    img.blit(mark, (0, SKIDMARK_OFFSET))
+    img.blit(mark, (0, car_size[1] - mark.get_size()[1] - SKIDMARK_OFFSET))
+    g_skidmarks[key] = img
+    return img
 
 
 class Car(RelativeSprite, CollisionObject):
@@ -95,23 +72,38 @@ class Car(RelativeSprite, CollisionObject):
 
     SKIDMARK_SOUND_INTERVAL = 0.2
 
+    COLLISION_LAYER = LAYER_CAR
+    COLLISION_MASK = LAYER_BORDER | LAYER_CAR
+
+    # a car stopped, with no control pressed, for this long falls asleep:
+    # it is skipped by the physics until something wakes it up
+    SLEEP_DELAY = 0.5  # seconds
+    SLEEP_SPEED = 5  # pixels / second
+
     def __init__(self, resource, race_track, game_settings,
                  spawn_point, spawn_orientation, image=None,
                  has_engine_sound=False):
         global UNIQUE
 
+        if image is None:
+            # shared by all the cars using this resource
+            image = assets.get_image(
+                resource, ("scale", assets.CAR_SCALE_FACTOR)
+            )
+        else:
+            image = pygame.transform.scale(image, (
+                int(image.get_size()[0] * assets.CAR_SCALE_FACTOR),
+                int(image.get_size()[1] * assets.CAR_SCALE_FACTOR),
+            ))
         super().__init__(resource, image)
 
         self.color = resource[2]
-
         self.original_size = self.original.get_size()
-        self.original_size = (
-            int(self.original_size[0] * assets.CAR_SCALE_FACTOR),
-            int(self.original_size[1] * assets.CAR_SCALE_FACTOR),
-        )
-        self.original = self.image = pygame.transform.scale(
-            self.original, self.original_size
+        # collision box, in the car frame (see transform)
+        self.local_pts = transform.get_box(
+            self.original_size, self.COLLISION_MARGIN
         )
+        self.rotation = transform.Rotation()
 
         self.static = False
         self.h = hash(spawn_point) ^ UNIQUE
@@ -144,12 +136,16 @@ class Car(RelativeSprite, CollisionObject):
 
         # position is the center of the car
         self.position = spawn_point
+        # position at the previous simulation tick (for rendering)
+        self.last_position = spawn_point
 
         self.next_checkpoint = self.parent.checkpoints[0]
         self.checkpoint_min_dist_sq = \
             game_settings['checkpoint_min_distance'] ** 2
 
         self.can_move = False
+        self.asleep = False
+        self.idle_time = 0
 
         self.extra_drawers_below = set()
         self.extra_drawers_above = set()
@@ -160,7 +156,7 @@ class Car(RelativeSprite, CollisionObject):
         self.oily = 0
         self.shield = (0, 0)
 
-        self.base_exploded = ExplodedCar.generate_base_exploded(self.original)
+        self.base_exploded = ExplodedCar.get_base_exploded(self.original)
 
         self.drift = self.DRIFT_NONE
         self.has_engine_sound = has_engine_sound
@@ -168,9 +164,12 @@ class Car(RelativeSprite, CollisionObject):
             self.engine_sound_channel = sounds.reserve_channel()
 
         self.skidmark_sound = 0
-        self.skidmark = SkidMark(self.parent, self)
-        self.skidmark_oil = SkidMark(
-            self.parent, self, assets.SKIDMARK_OIL
+        self.skidmark = get_skidmark(
+            random.sample(sorted(assets.SKIDMARKS), 1)[0],
+            self.original.get_size()
+        )
+        self.skidmark_oil = get_skidmark(
+            assets.SKIDMARK_OIL, self.original.get_size()
         )
 
         self.recompute_pts()
@@ -179,38 +178,30 @@ class Car(RelativeSprite, CollisionObject):
     def hash(self):
         return self.h
 
+    def unregister_animators(self):
+        """
+        Called when the car is removed for good: unregisters the animators
+        the car registered by itself (move() is registered by its owner)
+        """
+        pass
+
     COLLISION_MARGIN = 3
 
     def recompute_pts(self):
         self._pts = None
 
+    def get_rotation(self):
+        """
+        transform.Rotation of the car frame
+        """
+        return self.rotation.set(self.radians)
+
     def _recompute_pts(self):
-        pts = [
-            ((- (self.original_size[0] / 2)) + self.COLLISION_MARGIN,
-             (- (self.original_size[1] / 2)) + self.COLLISION_MARGIN),
-            ((self.original_size[0] / 2) - self.COLLISION_MARGIN,
-             (- (self.original_size[1] / 2)) + self.COLLISION_MARGIN),
-            ((self.original_size[0] / 2) - self.COLLISION_MARGIN,
-             (self.original_size[1] / 2) - self.COLLISION_MARGIN),
-            ((- (self.original_size[0] / 2)) + self.COLLISION_MARGIN,
-             (self.original_size[1] / 2) - self.COLLISION_MARGIN),
-        ]
-        # TODO(Jflesch): can optim: to_polar() could be called only once,
-        # and the other points can be deduced
-        pts = [util.to_polar(pt) for pt in pts]
-        pts = [
-            (
-                length,
-                # The gfx are oriented to the up side, but radians=0 == right
-                angle - self.radians + (math.pi / 2)
-            ) for (length, angle) in pts
-        ]
-        pts = [util.to_cartesian(pt) for pt in pts]
-        pts = [
-            (x + self.position[0], y + self.position[1])
-            for (x, y) in pts
-        ]
-        self._pts = pts
+        self._pts = self.get_rotation().get_pts(self.local_pts, self.position)
+
+    @property
+    def render_position(self):
+        return util.interpolate(self.last_position, self.position)
 
     @property
     def pts(self):
@@ -221,16 +212,15 @@ class Car(RelativeSprite, CollisionObject):
     def update_image(self):
         # The gfx are oriented to the up side, but radians=0 == right
         self.angle = (-self.radians + (math.pi / 2)) * 180 / math.pi
-        self.image = pygame.transform.rotate(self.original, -self.angle)
+        self.image = rotation.rotate(self.original, -self.angle)
         self.size = self.image.get_size()
         self.relative = (
             int(self.position[0]) - (self.size[0] / 2),
             int(self.position[1]) - (self.size[1] / 2),
         )
 
-    def compute_forward_speed(self, current_speed, frame_interval, terrain):
-        engine_braking = self.game_settings['engine braking'][terrain]
-        engine_braking *= frame_interval
+    def compute_forward_speed(self, current_speed, frame_interval, physics):
+        engine_braking = physics.engine_braking * frame_interval
         if current_speed < 0:
             engine_braking *= -1
 
@@ -250,8 +240,7 @@ class Car(RelativeSprite, CollisionObject):
             # TODO(Jflesch): burning tires
 
             # --> braking
-            acceleration = -self.game_settings['braking'][terrain]
-            acceleration *= frame_interval
+            acceleration = -physics.braking * frame_interval
 
             # apply to speed
             speed = current_speed + acceleration
@@ -259,8 +248,7 @@ class Car(RelativeSprite, CollisionObject):
                 speed = 0
         else:
             # --> accelerate (forward or backward)
-            acceleration = self.game_settings['acceleration'][terrain]
-            acceleration *= frame_interval
+            acceleration = physics.acceleration * frame_interval
 
             if self.controls.brake:
                 acceleration *= -1
@@ -269,19 +257,20 @@ class Car(RelativeSprite, CollisionObject):
             speed = current_speed + acceleration
 
         # limit speed based on terrain
-        max_speed = self.game_settings['max_speed'][terrain]
-        if speed > max_speed['forward']:
-            speed = max(current_speed - engine_braking, max_speed['forward'])
-        elif speed < -max_speed['reverse']:
-            speed = min(current_speed - engine_braking, -max_speed['reverse'])
+        if speed > physics.max_speed_forward:
+            speed = max(current_speed - engine_braking,
+                        physics.max_speed_forward)
+        elif speed < -physics.max_speed_reverse:
+            speed = min(current_speed - engine_braking,
+                        -physics.max_speed_reverse)
 
         return speed
 
-    def compute_lateral_speed(self, speed, frame_interval, terrain):
+    def compute_lateral_speed(self, speed, frame_interval, physics):
         if speed == 0:
             return speed
 
-        slowdown = self.game_settings['lateral_speed_slowdown'][terrain]
+        slowdown = physics.lateral_speed_slowdown
         if self.oily > 0:
             slowdown /= 10
             self.oily -= frame_interval
@@ -293,55 +282,49 @@ class Car(RelativeSprite, CollisionObject):
             speed += slowdown * frame_interval
             return speed if speed <= 0 else 0
 
-    def update_speed(self, frame_interval, terrain):
+    def update_speed(self, frame_interval, physics):
         self.speed = (
-            self.compute_forward_speed(self.speed[0], frame_interval, terrain),
-            self.compute_lateral_speed(self.speed[1], frame_interval, terrain)
+            self.compute_forward_speed(self.speed[0], frame_interval, physics),
+            self.compute_lateral_speed(self.speed[1], frame_interval, physics)
         )
 
     def apply_speed(self, frame_interval, position, speed=None):
         # self.speed is relative to the car, but self.position is relative
         # to the race track
-        # so we switch to polar coordinates, change the angle, and switch
-        # back to cartesian coordinates
 
         if speed is None:
             speed = self.speed
         speed = (speed[0] * frame_interval, speed[1] * frame_interval)
-        # make sure speed isn't too big for collision detection
-        speed = (
-            util.clamp(speed[0],
-                       -assets.TILE_SIZE[0] / 4, assets.TILE_SIZE[0] / 4),
-            util.clamp(speed[1],
-                       -assets.TILE_SIZE[0] / 4, assets.TILE_SIZE[0] / 4),
-        )
-        # max speed to avoid issues with low frame rate + collision detection
-        # optim
-        nspeed = (
-            -1 if speed[0] < 0 else 1,
-            -1 if speed[1] < 0 else 1,
-        )
-        speed = (
-            min(abs(speed[0]), assets.TILE_SIZE[0] / 2) *
-            nspeed[0],
-            min(abs(speed[1]), assets.TILE_SIZE[1] / 2) *
-            nspeed[1],
-        )
-        speed = util.to_polar(speed)
-        speed = (speed[0], speed[1] - self.radians)
-        speed = util.to_cartesian(speed)
-        speed = (speed[0], speed[1])
+        # no need to limit the speed here: collisions are swept (see
+        # CollisionHandler.sweep())
+        speed = self.get_rotation().to_track(speed)
 
         return (
             position[0] + speed[0],
             position[1] + speed[1],
         )
 
-    def get_steering(self, frame_interval, terrain):
+    def move_until_collision(self, frame_interval):
+        """
+        Apply the speed, but stop right before the first obstacle on the
+        way. Returns the fraction of the frame used and the collision
+        (None if there was no obstacle).
+        """
+        target = self.apply_speed(frame_interval, self.position)
+        delta = (target[0] - self.position[0], target[1] - self.position[1])
+        (t, collision) = self.parent.collisions.sweep(self, delta)
+        self.position = (
+            self.position[0] + (t * delta[0]),
+            self.position[1] + (t * delta[1]),
+        )
+        self.recompute_pts()
+        return (t, collision)
+
+    def get_steering(self, frame_interval, physics):
         if not self.controls.steer_left and not self.controls.steer_right:
             return 0
         ref_speed = self.game_settings['steering']['ref_speed']
-        angle_change = self.game_settings['steering'][terrain] * frame_interval
+        angle_change = physics.steering * frame_interval
         if self.controls.steer_left:
             angle_change *= -1
         if self.speed[0] < 0:
@@ -355,11 +338,7 @@ class Car(RelativeSprite, CollisionObject):
         self.recompute_pts()
 
         # cars turns, but not its speed / momentum
-        # turn the speed into polar coordinates --> change the angle,
-        # switch back
-        speed = util.to_polar(self.speed)
-        speed = (speed[0], speed[1] - angle_change)
-        self.speed = util.to_cartesian(speed)
+        self.speed = transform.rotate(self.speed, -angle_change)
         return angle_change
 
     def check_checkpoint(self):
@@ -385,7 +364,29 @@ class Car(RelativeSprite, CollisionObject):
             self
         )
 
+    def is_idle(self):
+        controls = self.controls
+        if (controls.accelerate or controls.brake or
+                controls.steer_left or controls.steer_right):
+            return False
+        return (abs(self.speed[0]) < self.SLEEP_SPEED and
+                abs(self.speed[1]) < self.SLEEP_SPEED)
+
+    def sleep(self):
+        self.asleep = True
+        self.speed = (0, 0)
+        self.parent.collisions.set_sleeping(self, True)
+
+    def wake(self):
+        self.idle_time = 0
+        if not self.asleep:
+            return
+        self.asleep = False
+        self.parent.collisions.set_sleeping(self, False)
+
     def damage(self, damage):
+        # hit by a projectile or an explosion
+        self.wake()
         if self.shield[0] > 0:
             self.shield = (self.shield[0], self.shield[1] - damage)
             if self.shield[1] <= 0:
@@ -431,7 +432,10 @@ class Car(RelativeSprite, CollisionObject):
             )
             has_collision = len(collisions) > 0
 
-        self.parent.collisions.precompute_moving()
+        # teleported: nothing to interpolate
+        self.last_position = self.position
+        self.parent.collisions.update_moving(self)
+        self.wake()
 
     def update_sound(self, frame_interval):
         self.skidmark_sound -= frame_interval
@@ -457,6 +461,8 @@ class Car(RelativeSprite, CollisionObject):
         self.engine_sound_channel.play(snd, -1)
 
     def move(self, frame_interval):
+        self.last_position = self.position
+
         if abs(self.speed[1]) < self.DRIFT_SPEED:
             self.drift = self.DRIFT_NONE
         elif self.drift == self.DRIFT_FIRST_FRAME:
@@ -464,13 +470,12 @@ class Car(RelativeSprite, CollisionObject):
         else:
             self.drift = self.DRIFT_FIRST_FRAME
 
-        if self.oily > 0 or self.drift != self.DRIFT_NONE:
-            if self.oily > 0:
-                skidmark = self.skidmark_oil.copy()
-            elif self.drift != self.DRIFT_NONE:
-                skidmark = self.skidmark.copy()
-            self.extra_drawers_below.add(skidmark)
-            util.register_animator(skidmark.anim)
+        if self.oily > 0:
+            self.parent.decals.stamp(
+                self.skidmark_oil, self.position, self.angle
+            )
+        elif self.drift != self.DRIFT_NONE:
+            self.parent.decals.stamp(self.skidmark, self.position, self.angle)
 
         self.update_sound(frame_interval)
 
@@ -486,19 +491,28 @@ class Car(RelativeSprite, CollisionObject):
         if not self.can_move:
             return
 
+        if not self.is_idle():
+            self.wake()
+        elif not self.asleep:
+            self.idle_time += frame_interval
+            if self.idle_time >= self.SLEEP_DELAY:
+                self.sleep()
+        if self.asleep:
+            return
+
         COLLISION = True
 
-        terrain = self.parent.get_terrain(self.position)
+        physics = self.parent.get_physics(self.position)
 
-        self.update_speed(frame_interval, terrain)
+        self.update_speed(frame_interval, physics)
 
         # steering
-        steering = self.get_steering(frame_interval, terrain)
+        steering = self.get_steering(frame_interval, physics)
         previous_radians = self.radians
         previous_speed = self.speed
         self.turn(steering, frame_interval)
 
-        if COLLISION:
+        if COLLISION and steering != 0:
             collisions = self.parent.collisions.get_collisions(
                 self, limit=1, optim=True
             )
@@ -509,50 +523,31 @@ class Car(RelativeSprite, CollisionObject):
                 self.recompute_pts()
 
         # move
-        prev_position = self.position
-        self.position = self.apply_speed(frame_interval, self.position)
-        self.recompute_pts()
-
-        if COLLISION:
-            collisions = self.parent.collisions.get_collisions(self, optim=True)
-            if len(collisions) > 0:
-                # cancel movement
-                self.position = prev_position
-                self.recompute_pts()
-
+        if not COLLISION:
+            self.position = self.apply_speed(frame_interval, self.position)
+            self.recompute_pts()
+        else:
+            (t, collision) = self.move_until_collision(frame_interval)
+            if collision is not None:
                 # update speed based on collision
                 previous_radians = self.radians
-
                 (self.speed, self.radians) = self.parent.collisions.collide(
-                    self, collisions, frame_interval
+                    self, [collision], frame_interval
                 )
-
-                # apply new speed if possible before it's cancelled
-                # + angle
-                prev_position = self.position
-                self.position = self.apply_speed(frame_interval, self.position)
-                self.recompute_pts()
-
-                collisions = self.parent.collisions.get_collisions(
-                    self, limit=1, optim=False
-                )
-                if len(collisions) > 0:
-                    # .. without angle ?
-                    self.radians = previous_radians
-                    self.position = prev_position
-                    self.position = self.apply_speed(frame_interval,
-                                                     self.position)
+                if self.radians != previous_radians:
                     self.recompute_pts()
                     collisions = self.parent.collisions.get_collisions(
-                        self, limit=1, optim=False
+                        self, limit=1, optim=True
                     )
-
                     if len(collisions) > 0:
-                        # ok screw it ...
                         self.radians = previous_radians
-                        self.position = prev_position
                         self.recompute_pts()
 
+                # use the rest of the frame with the new speed
+                self.move_until_collision((1.0 - t) * frame_interval)
+
+        self.parent.collisions.update_moving(self)
+
         self.update_image()
         self.grab_bonus()
         self.check_checkpoint()
@@ -561,22 +556,30 @@ class Car(RelativeSprite, CollisionObject):
         for drawer in self.extra_drawers_below:
             drawer.draw(screen, self)
 
-        super().draw(screen)
+        absolute = self.parent.absolute
+        position = self.render_position
+        screen.blit(
+            self.image,
+            (
+                absolute[0] + int(position[0]) - (self.size[0] / 2),
+                absolute[1] + int(position[1]) - (self.size[1] / 2),
+            ),
+            ((0, 0), self.size)
+        )
 
         for drawer in self.extra_drawers_above:
             drawer.draw(screen, self)
 
         if self.shield[0] > 0:
-            absolute = self.parent.absolute
             frame = int(self.shield[0] * 5 % len(assets.SHIELDS))
-            shield = assets.load_image(assets.SHIELDS[frame])
-            shield = pygame.transform.rotate(shield, -self.angle)
+            shield = assets.get_resource(assets.SHIELDS[frame])
+            shield = rotation.rotate(shield, -self.angle)
             screen.blit(
                 shield,
                 (
-                    (absolute[0] + self.position[0] -
+                    (absolute[0] + position[0] -
                      (shield.get_size()[0] / 2)),
-                    (absolute[1] + self.position[1] -
+                    (absolute[1] + position[1] -
                      (shield.get_size()[1] / 2)),
                 )
             )
@@ -607,6 +610,9 @@ class ExplodedCar(Car):
     LIFE_LENGTH = 1.5
     IMG_PER_SECOND = 5.0
     ALIVE = False
+    # wrecks only bump into the borders: cars and projectiles go through
+    COLLISION_LAYER = LAYER_WRECK
+    COLLISION_MASK = LAYER_BORDER
 
     def __init__(self, parent_car):
         super().__init__(
@@ -622,69 +628,67 @@ class ExplodedCar(Car):
         self.update_image()
 
         self.parent.add_car(self)
-        self.parent.collisions.precompute_moving()
-        util.register_animator(self.anim)
+        util.register_animator(self.move)
 
-        self.t = 0
         self.frame = 0
+        self.frame_timer = util.add_periodic_timer(
+            1.0 / self.IMG_PER_SECOND, self.next_frame
+        )
+        util.add_timer(self.LIFE_LENGTH, self.disappear)
 
-    def anim(self, frame_interval):
-        self.move(frame_interval)
-        self.t += frame_interval
-        if self.t >= self.LIFE_LENGTH:
-            util.unregister_animator(self.anim)
-            self.parent.remove_car(self)
-            self.parent.collisions.precompute_moving()
-            return
-        frame = int(self.t * self.IMG_PER_SECOND)
-        if frame >= len(self.images):
-            frame = len(self.images) - 1
-        if frame == self.frame:
+    def next_frame(self):
+        if self.frame + 1 >= len(self.images):
+            self.frame_timer.cancel()
             return
-        self.frame = frame
-        self.original = self.images[frame]
+        self.frame += 1
+        self.original = self.images[self.frame]
         self.update_image()
 
+    def disappear(self):
+        self.frame_timer.cancel()
+        util.unregister_animator(self.move)
+        self.parent.remove_car(self)
+
+    @staticmethod
+    def get_base_exploded(img):
+        """
+        Frames of the wreck of a car using this image. Computed once per
+        image and shared by all the cars using it.
+        """
+        try:
+            return g_base_exploded[img]
+        except KeyError:
+            pass
+        imgs = g_base_exploded[img] = ExplodedCar.generate_base_exploded(img)
+        return imgs
+
     @staticmethod
     def generate_base_exploded(img):
         # generate basic grayscale image
-        base_img = img.copy()
-        base_img = img.convert_alpha()
+        if img.get_flags() & pygame.SRCALPHA:
+            base_img = img.copy()
+        else:
+            base_img = img.convert_alpha()
         pixels = pygame.surfarray.pixels3d(base_img)
-        for (x, y) in itertools.product(
-                    range(0, base_img.get_size()[0]),
-                    range(0, base_img.get_size()[1])
-                ):
-            p = pixels[x][y]
-            v = p[0] + p[1] + p[2]
-            v /= 3
-            if v >= 192:
-                # turn whites into dark grays
-                v = 255 - v
-            pixels[x][y] = (v, v, v)
+        v = pixels.sum(axis=2, dtype=numpy.uint16) / 3
+        # turn whites into dark grays
+        v = numpy.where(v >= 192, 255 - v, v)
+        pixels[...] = v.astype(numpy.uint8)[:, :, numpy.newaxis]
+        del pixels  # unlocks the surface
 
         # TODO(Jflesch): scratches
 
         # generate images with various transparency
         imgs = []
-        for t in range(0, int(
-                    ExplodedCar.LIFE_LENGTH * ExplodedCar.IMG_PER_SECOND
-                )):
+        nb_imgs = ExplodedCar.LIFE_LENGTH * ExplodedCar.IMG_PER_SECOND
+        for t in range(0, int(nb_imgs)):
             # opacity 255 -> 0
             t *= 0.75
-            t = 255 - int(
-                255 * t / (ExplodedCar.LIFE_LENGTH * ExplodedCar.IMG_PER_SECOND)
-            )
+            t = 255 - int(255 * t / nb_imgs)
             img = base_img.copy()
             pixels = pygame.surfarray.pixels_alpha(img)
-            for (x, y) in itertools.product(
-                        range(0, img.get_size()[0]),
-                        range(0, img.get_size()[1])
-                    ):
-                p = pixels[x][y]
-                if p > t:
-                    p = t
-                pixels[x][y] = p
+            numpy.minimum(pixels, t, out=pixels)
+            del pixels
             imgs.append(img)
         return imgs
 
@@ -5,7 +5,6 @@ import logging
 import math
 import random
 import threading
-import time
 
 import pygame
 
@@ -134,12 +133,16 @@ class IACar(Car):
 
         util.register_animator(self.ia_move)
 
+    def unregister_animators(self):
+        util.unregister_animator(self.ia_move)
+
     def __str__(self):
         return "IA{} ({}|{})".format(self.number, self.position, self.radians)
 
     def compute_controls(self, frame_interval):
         next_pt = self.path[0]
         path = (self.position, next_pt)
+        now = util.sim_time()
 
         dist = util.distance_sq_pt_to_pt(self.prev_position, self.position)
         if dist >= self.DISTANCE_STUCK:
@@ -147,11 +150,11 @@ class IACar(Car):
             self.prev_position = self.position
         else:
             if self.stuck_since is None:
-                self.stuck_since = time.time()
+                self.stuck_since = now
             elif self.reverse_since is None and (
-                        time.time() - self.stuck_since >= self.MIN_TIME_STUCK
+                        now - self.stuck_since >= self.MIN_TIME_STUCK
                     ):
-                self.reverse_since = time.time()
+                self.reverse_since = now
                 self.backward_time = (
                     (random.random() *
                      (self.BACKWARD_TIME[1] - self.BACKWARD_TIME[0])) +
@@ -189,8 +192,7 @@ class IACar(Car):
                 acceleration = 0
 
         if acceleration != 0 and self.reverse_since is not None:
-            n = time.time()
-            if n - self.reverse_since < self.backward_time:
+            if now - self.reverse_since < self.backward_time:
                 acceleration *= -1
             else:
                 self.reverse_since = None
@@ -239,13 +241,9 @@ class IACar(Car):
             return False
         line = (self.position, closest.position)
         obstacles = self.parent.collisions.get_obstacles_on_segment(
-            line, limit=2
+            line, limit=1, ignore=(self, closest)
         )
-        obstacles = {
-            x[0] for x in obstacles
-            if x[0] is not closest and x[0] is not self
-        }
-        return len(obstacles) <= 0
+        return len(list(obstacles)) <= 0
 
     def can_use_forward(self):
         TOLERANCE = math.pi / 8
@@ -315,7 +313,8 @@ class IACar(Car):
         if not self.can_move:
             return
 
-        path = self.waypoints.compute_path(
+        path = util.profiled(
+            self.waypoints.compute_path,
             self, self.position, self.next_checkpoint
         )
 
@@ -12,6 +12,9 @@ class PlayerCar(Car):
         super().__init__(*args, has_engine_sound=True, **kwargs)
         util.register_animator(self.on_frame)
 
+    def unregister_animators(self):
+        util.unregister_animator(self.on_frame)
+
     def __str__(self):
         return "PlayerCar ({}|{})".format(self.position, self.radians)
 
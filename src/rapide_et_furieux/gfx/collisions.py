@@ -1,20 +1,40 @@
 #!/usr/bin/env python3
 
 import collections
-import itertools
 import logging
 import math
 
-import pygame
-
 from .. import assets
+from .. import borders
+from .. import broadphase
+from .. import bvh
+from .. import geometry
+from .. import narrowphase
+from .. import spatial
+from .. import transform
 from .. import util
 
 
 logger = logging.getLogger(__name__)
 
 
+# Collision layers: each object belongs to one layer, and each query has a
+# mask telling which layers it looks at
+LAYER_BORDER = 0x01
+LAYER_CAR = 0x02
+LAYER_WRECK = 0x04
+LAYER_PROJECTILE = 0x08
+LAYER_HAZARD = 0x10  # mines, ...
+LAYER_ALL = (
+    LAYER_BORDER | LAYER_CAR | LAYER_WRECK | LAYER_PROJECTILE | LAYER_HAZARD
+)
+
+
 class CollisionObject(object):
+    COLLISION_LAYER = LAYER_BORDER
+    # layers this object collides with
+    COLLISION_MASK = LAYER_ALL
+
     def __init__(self, *args, **kwargs):
         self.static = True
 
@@ -26,149 +46,113 @@ class CollisionObject(object):
         self.radians = 0  # radians = 0 : object is turned to the right
         # speed relative to the object, not the track !
         self.speed = (0, 0)
+        self.asleep = False
+
+    def wake(self):
+        pass
 
     def update_image(self):
         pass
 
 
+class BorderChain(CollisionObject):
+    """
+    Track borders as seen by the collision handler: polylines built from
+    the editable borders by borders.optimize()
+    """
+    def __init__(self, pts):
+        super().__init__()
+        self.pts = pts
+
+    def __str__(self):
+        return "BorderChain({} pts)".format(len(self.pts))
+
+    def __repr__(self):
+        return str(self)
+
+
 Collision = collections.namedtuple(
     typename="collision",
     field_names=(
-        "moving_line",
         "obstacle",
-        "obstacle_line",
+        # unit vector (screen coordinates), pushing the moving object out
+        # of the obstacle
+        "normal",
+        # penetration depth (pixels). 0 for the swept collisions: they are
+        # found before the objects overlap
+        "depth",
         "point",
     ),
 )
 
 
 class CollisionHandler(object):
-    MIN_SQ_DISTANCE_FOR_MOVING_COLLISION = (assets.TILE_SIZE[0] * 2) ** 2
+    MIN_DISTANCE_FOR_MOVING_COLLISION = assets.TILE_SIZE[0] * 2
+    MIN_SQ_DISTANCE_FOR_MOVING_COLLISION = \
+        MIN_DISTANCE_FOR_MOVING_COLLISION ** 2
     MIN_SPEED_FOR_COLLISION_SOURCE = 0.00001
-    MAX_ANGLE_FOR_COLLISION_SOURCE = 2 * math.pi / 3
+    # distance kept between a moving object and what it hits (pixels)
+    SKIN = 0.5
 
     def __init__(self, racetrack, game_settings):
         self.game_settings = game_settings
         self.racetrack = racetrack
 
-        # (grid_position[0], grid_position[1]) --> obstacle
-        self.precomputed_static = {}
-        self.precomputed_moving = {}
-
-        self.car_diameter_sq = (
-            (assets.TILE_SIZE[0] * assets.CAR_SCALE_FACTOR) ** 2
+        # track borders: see precompute_static()
+        self.borders = []
+        self.static = bvh.SegmentBVH()
+        # cars: kept up-to-date by add_moving(), update_moving() and
+        # remove_moving()
+        self.moving = spatial.SpatialHash(assets.TILE_SIZE[0])
+        # cars close enough to collide, updated once per tick by
+        # update_pairs()
+        self.pairs = broadphase.SweepAndPrune(
+            self.MIN_DISTANCE_FOR_MOVING_COLLISION
         )
 
-    @staticmethod
-    def can_collide(line_a, line_b):
-        """
-        Figure out if there is even a remote chance that these line collides
-        """
-        (rect_a, rect_b) = [pygame.Rect(
-            line[0],
-            (
-                line[1][0] - line[0][0] + 1,
-                line[1][1] - line[0][1] + 1,
-            ),
-        ) for line in [line_a, line_b]]
-        for rect in [rect_a, rect_b]:
-            rect.normalize()
-            rect.width += 1
-            rect.height += 1
-
-        return rect_a.colliderect(rect_b)
+        # results of get_collisions(), kept from one tick to the next
+        self.contacts = narrowphase.ContactCache()
 
-    @staticmethod
-    def get_collision_point(line_a, line_b):
-        return util.get_segment_intersect_point(line_a, line_b)
+        # metrics since the last tick: number of get_collisions() and
+        # sweep() calls, and number of pairs given to the narrow phase
+        self.nb_queries = 0
+        self.nb_tests = 0
 
-    @staticmethod
-    def get_collision_angle(line_moving, line_obstacle, car_position):
-        """
-        Returns the angle of the collision if there is any
-        """
-        angle = math.atan2(
-            - (line_obstacle[1][1] - line_obstacle[0][1]),
-            (line_obstacle[1][0] - line_obstacle[0][0])
-        )
-        # the collision angle is at 90 degrees from the obstacle
-        angle += math.pi / 2
-
-        # cross product will tell us if the angle is on the same side
-        # than the car_position or not
-        v1 = (
-            line_obstacle[1][0] - line_obstacle[0][0],
-            (-line_obstacle[1][1]) - (-line_obstacle[0][1])
-        )
-        v2 = (
-            line_obstacle[1][0] - car_position[0],
-            (-line_obstacle[1][1]) - (-car_position[1])
+        self.car_diameter_sq = (
+            (assets.TILE_SIZE[0] * assets.CAR_SCALE_FACTOR) ** 2
         )
-        xp = (v1[0] * v2[1]) - (v1[1] * v2[0])
-        if xp < 0:
-            # cross product tells us the angle is on the other side
-            angle += math.pi
 
-        angle %= 2 * math.pi
-        return angle
+    # speed relative to an object turned by 'angle' <--> speed relative to
+    # the track (see transform)
+    to_track = staticmethod(transform.to_track)
+    to_relative = staticmethod(transform.to_local)
 
-    @staticmethod
-    def nullify_speed(speed_car_cart_rel, car_angle, collision_angle,
-                      factor):
+    @classmethod
+    def nullify_speed(cls, speed_car_cart_rel, car_angle, normal, factor):
         """
-        Cancel part of the speed for the matching angle.
-        Only keep the speed that is on the opposite side of the angle.
+        Cancel part of the speed going against the collision normal (the
+        normal pushes the car out of the obstacle). The speed going away
+        from the obstacle is kept.
 
-        Return the new speed, and the removed part.
+        Return the new speed, and the removed part (relative to the track).
         """
-        speed_car_cart_rel = (speed_car_cart_rel[0], -speed_car_cart_rel[1])
-        speed_car_pol_rel = util.to_polar(speed_car_cart_rel)
-
-        speed_car_pol = (
-            speed_car_pol_rel[0],
-            speed_car_pol_rel[1] + car_angle,
-        )
-
-        speed_car_cart = util.to_cartesian(speed_car_pol)
-        speed_car_cart = (speed_car_cart[0], -speed_car_cart[1])
-
-        # collision angle is the opposite force ; we reverse it here
-        collision_angle += math.pi
-        collision_angle %= 2 * math.pi
-
-        removed_pol = (speed_car_pol[0] *
-                       math.cos(speed_car_pol[1] - collision_angle),
-                       collision_angle)
-        to_nullify_pol = (removed_pol[0] * factor, removed_pol[1])
-        to_nullify_cart = util.to_cartesian(to_nullify_pol)
-        to_nullify_cart = removed_cart = (
-            to_nullify_cart[0], -to_nullify_cart[1]
-        )
-
-        speed_car_cart = (
-            speed_car_cart[0] - to_nullify_cart[0],
-            speed_car_cart[1] - to_nullify_cart[1]
+        speed = cls.to_track(speed_car_cart_rel, car_angle)
+        dot = (speed[0] * normal[0]) + (speed[1] * normal[1])
+        if dot >= 0:
+            return (speed_car_cart_rel, (0.0, 0.0))
+        removed_cart = (dot * normal[0], dot * normal[1])
+        speed = (
+            speed[0] - (removed_cart[0] * factor),
+            speed[1] - (removed_cart[1] * factor),
         )
-
-        speed_car_cart = (speed_car_cart[0], -speed_car_cart[1])
-        speed_car_pol = util.to_polar(speed_car_cart)
-
-        speed_car_pol_rel = (
-            speed_car_pol[0],
-            speed_car_pol[1] - car_angle,
-        )
-
-        speed_car_cart_rel = util.to_cartesian(speed_car_pol_rel)
-        speed_car_cart_rel = (speed_car_cart_rel[0], -speed_car_cart_rel[1])
-
-        return (speed_car_cart_rel, removed_cart)
+        return (cls.to_relative(speed, car_angle), removed_cart)
 
     @staticmethod
-    def get_obstacle_angle(line_obstacle, car_angle):
-        angle = math.atan2(
-            - (line_obstacle[1][1] - line_obstacle[0][1]),
-            (line_obstacle[1][0] - line_obstacle[0][0])
-        )
+    def get_obstacle_angle(normal, car_angle):
+        """
+        Angle of the obstacle surface, orthogonal to the collision normal
+        """
+        angle = math.atan2(normal[0], normal[1])
         # make sure the angle is oriented as the car
         angle -= car_angle - (math.pi / 2)
         angle %= math.pi
@@ -194,160 +178,295 @@ class CollisionHandler(object):
 
         return car_angle - diff
 
-    @staticmethod
-    def add_speed(speed_a_cart_rel, angle_a, speed_b_cart):
-        speed_a_pol_rel = util.to_polar(speed_a_cart_rel)
-        speed_a_pol = (
-            speed_a_pol_rel[0],
-            speed_a_pol_rel[1] + angle_a
-        )
-        speed_a_cart = util.to_cartesian(speed_a_pol)
-        speed_a_cart = (speed_a_cart[0], -speed_a_cart[1])
+    @classmethod
+    def add_speed(cls, speed_a_cart_rel, angle_a, speed_b_cart):
+        """
+        Add the speed 'speed_b_cart' (relative to the track) to the speed
+        'speed_a_cart_rel' (relative to the object a).
+        """
+        speed_a_cart = cls.to_track(speed_a_cart_rel, angle_a)
         speed_a_cart = (
-            speed_a_cart[0] - speed_b_cart[0],
-            speed_a_cart[1] - speed_b_cart[1],
+            speed_a_cart[0] + speed_b_cart[0],
+            speed_a_cart[1] + speed_b_cart[1],
         )
-        speed_a_pol = util.to_polar(speed_a_cart)
-        speed_a_pol_rel = (speed_a_pol[0], speed_a_pol[1] - angle_a)
-        speed_a_cart_rel = util.to_cartesian(speed_a_pol_rel)
-        return (speed_a_cart_rel[0], speed_a_cart_rel[1])
+        return cls.to_relative(speed_a_cart, angle_a)
 
     def precompute_static(self):
-        self.precomputed_static = {}
-        for obstacle in self.racetrack.borders:
-            for obstacle_line in util.pairwise(obstacle.pts):
-                for grid in util.raytrace(
-                                obstacle_line, assets.TILE_SIZE[0]
-                            ):
-                        offsets = itertools.product(
-                            range(-1, 2, 1),
-                            range(-1, 2, 1),
-                        )
-                        for offset in offsets:
-                            pos = (grid[0] + offset[0], grid[1] + offset[1])
-                            if pos not in self.precomputed_static:
-                                self.precomputed_static[pos] = set()
-                            self.precomputed_static[pos].add(obstacle)
-
-    def precompute_moving(self, *args, **kwargs):
-        self.precomputed_moving = {}
-        for obstacle in self.racetrack.cars:
-            grid = (int(obstacle.position[0] / assets.TILE_SIZE[0]),
-                    int(obstacle.position[1] / assets.TILE_SIZE[1]))
-            offsets = itertools.product(
-                range(-2, 3, 1),
-                range(-2, 3, 1),
+        (chains, _) = borders.optimize_borders(self.racetrack.borders)
+        self.borders = [BorderChain(chain) for chain in chains]
+        self.static = bvh.SegmentBVH(
+            (obstacle, obstacle_line)
+            for obstacle in self.borders
+            for obstacle_line in borders.get_segments(obstacle.pts)
+        )
+
+    def add_moving(self, obstacle):
+        self.moving.add(obstacle, obstacle.position)
+        self.pairs.add(obstacle)
+
+    def remove_moving(self, obstacle):
+        self.moving.remove(obstacle)
+        self.pairs.remove(obstacle)
+        self.contacts.forget(obstacle)
+
+    def set_sleeping(self, obstacle, sleeping):
+        """
+        Sleeping obstacles don't move: the broadphase doesn't look for
+        collisions between 2 of them
+        """
+        self.pairs.set_sleeping(obstacle, sleeping)
+
+    def update_moving(self, obstacle):
+        """
+        Must be called each time the obstacle position changes
+        """
+        self.moving.update(obstacle, obstacle.position)
+
+    def update_pairs(self, *args, **kwargs):
+        """
+        Animator: must be called on each tick, before the cars move
+        """
+        self.pairs.update()
+        if util.g_profiler is not None:
+            contacts = self.contacts
+            nb_lookups = (
+                contacts.nb_hits + contacts.nb_misses + contacts.nb_drops
+            )
+            util.g_profiler.set_gauge("car pairs", self.pairs.nb_pairs)
+            util.g_profiler.set_gauge("collision queries", self.nb_queries)
+            util.g_profiler.set_gauge("narrow-phase tests", self.nb_tests)
+            util.g_profiler.set_gauge("sleeping bodies",
+                                      len(self.pairs.sleeping))
+            util.g_profiler.set_gauge("contact cache pairs", len(contacts))
+            util.g_profiler.set_gauge(
+                "contact cache hit rate",
+                "{:.0%}".format(contacts.nb_hits / max(nb_lookups, 1))
             )
-            for offset in offsets:
-                pos = (grid[0] + offset[0], grid[1] + offset[1])
-                if pos not in self.precomputed_moving:
-                    self.precomputed_moving[pos] = set()
-                self.precomputed_moving[pos].add(obstacle)
-
-    def get_possible_obstacle(self, precomputed, position):
-        grid = (
-            int(position[0] / assets.TILE_SIZE[0]),
-            int(position[1] / assets.TILE_SIZE[1]),
+            util.g_profiler.set_gauge("contact cache drops",
+                                      contacts.nb_drops)
+        self.contacts.new_tick()
+        self.nb_queries = 0
+        self.nb_tests = 0
+
+    def get_close_cars(self, moving):
+        """
+        Cars that may collide with 'moving'
+        """
+        if moving in self.pairs:
+            return self.pairs.get_neighbours(moving)
+        # not a car (missile, ...)
+        return self.moving.query_radius(
+            moving.position, self.MIN_DISTANCE_FOR_MOVING_COLLISION
         )
-        try:
-            return precomputed[grid]
-        except KeyError:
-            return []
 
-    def has_obstacle_in_path(self, moving, path, optim=True):
+    def has_obstacle_in_path(self, moving, path, optim=True,
+                             mask=LAYER_CAR):
         """
         Figure out if an moving element has a moving obstacle on its path.
         Return *approximate* result
         """
-        car = self.racetrack.cars
+        cars = self.racetrack.cars
         if optim:
-            cars = self.get_possible_obstacle(
-                self.precomputed_moving, moving.position
-            )
+            cars = self.get_close_cars(moving)
         for car in cars:
-            if car is moving:
-                # ignore self
+            if car is moving or not car.COLLISION_LAYER & mask:
+                # ignore self, and the layers not in the mask
                 continue
             dist = util.distance_sq_pt_to_segment(path, car.position)
             if dist < self.car_diameter_sq:
                 return True
         return False
 
-    def get_obstacles_on_segment(self, segment, limit=None):
-        found = 0
-        for (x, y) in util.raytrace(segment, grid_size=assets.TILE_SIZE[0]):
-            position = (
-                x * assets.TILE_SIZE[0],
-                y * assets.TILE_SIZE[1],
+    def _get_segment_hit(self, segment, obstacle_lines):
+        for obstacle_line in obstacle_lines:
+            self.nb_tests += 1
+            if not geometry.segments_aabb_overlap(segment, obstacle_line):
+                continue
+            collision_pt = geometry.get_segment_intersect_point(
+                segment, obstacle_line
+            )
+            if collision_pt is not None:
+                return collision_pt
+        return None
+
+    def get_obstacles_on_segment(self, segment, limit=None,
+                                 mask=LAYER_BORDER | LAYER_CAR, ignore=()):
+        """
+        Yields (obstacle, collision point), the closest to segment[0] first.
+        Obstacles not in the layers of 'mask' and the ones in 'ignore' are
+        skipped.
+        """
+        hits = {}
+        if mask & LAYER_BORDER:
+            for (obstacle, obstacle_line) in self.static.query_segment(
+                        segment
+                    ):
+                if obstacle in hits:
+                    continue
+                collision_pt = self._get_segment_hit(
+                    segment, (obstacle_line,)
+                )
+                if collision_pt is not None:
+                    hits[obstacle] = collision_pt
+        # cars are smaller than a tile: a car crossing the segment has its
+        # center less than a tile away from it
+        for obstacle in self.moving.query_segment(
+                    segment, radius=assets.TILE_SIZE[0]
+                ):
+            if not obstacle.COLLISION_LAYER & mask or obstacle in ignore:
+                continue
+            collision_pt = self._get_segment_hit(
+                segment, util.pairwise(obstacle.pts)
             )
-            obstacles = [
-                self.get_possible_obstacle(self.precomputed_static, position),
-                self.get_possible_obstacle(self.precomputed_moving, position),
-            ]
-            for obstacle in itertools.chain(*obstacles):
-                for obstacle_line in util.pairwise(obstacle.pts):
-                    if not self.can_collide(segment, obstacle_line):
-                        continue
-                    collision_pt = self.get_collision_point(
-                        segment, obstacle_line
-                    )
-                    if collision_pt is None:
-                        continue
-                    yield((obstacle, collision_pt))
-                    found += 1
-                    break
-            if limit is not None and found >= limit:
-                return
-
-    def get_collisions(self, moving, limit=None, optim=True, debug=False):
+            if collision_pt is not None:
+                hits[obstacle] = collision_pt
+
+        hits = sorted(
+            hits.items(),
+            key=lambda hit: util.distance_sq_pt_to_pt(segment[0], hit[1])
+        )
+        if limit is not None:
+            hits = hits[:limit]
+        for hit in hits:
+            yield hit
+
+    def _check_pair(self, moving, pts, obstacle, segment, obstacle_pts,
+                    collisions):
+        self.nb_tests += 1
+        contact = self.contacts.check(moving, pts, obstacle, segment,
+                                      obstacle_pts)
+        if contact is not None:
+            collisions.append(Collision(obstacle, *contact))
+
+    def get_collisions(self, moving, limit=None, optim=True, debug=False,
+                       mask=None, ignore=()):
+        """
+        Obstacles overlapping the moving object. Only the layers of 'mask'
+        are looked at (default: moving.COLLISION_MASK), and the obstacles
+        in 'ignore' are skipped before any geometry test.
+        """
+        self.nb_queries += 1
         collisions = []
+        pts = list(moving.pts)
+        if len(pts) <= 0:
+            return collisions
+        if mask is None:
+            mask = moving.COLLISION_MASK
+
+        # warm start: what was touching on the previous ticks probably
+        # still is
+        tested = set()
+        for (obstacle, segment) in self.contacts.get_contacts(moving):
+            tested.add((obstacle, segment))
+            if not obstacle.COLLISION_LAYER & mask or obstacle in ignore:
+                continue
+            if segment is not None:
+                obstacle_pts = segment
+            else:
+                obstacle_pts = list(obstacle.pts)
+            self._check_pair(moving, pts, obstacle, segment, obstacle_pts,
+                             collisions)
+            if limit is not None and len(collisions) >= limit:
+                return collisions
+
+        if mask & LAYER_BORDER:
+            box = bvh.get_pts_box(pts)
+            for (obstacle, obstacle_line) in self.static.query_box(box):
+                if (obstacle, obstacle_line) in tested:
+                    continue
+                self._check_pair(moving, pts, obstacle, obstacle_line,
+                                 obstacle_line, collisions)
+                if limit is not None and len(collisions) >= limit:
+                    return collisions
+
+        if not mask & ~LAYER_BORDER:
+            return collisions
         if optim:
-            obstacles = [
-                self.get_possible_obstacle(
-                    self.precomputed_static, moving.position
-                ),
-                self.get_possible_obstacle(
-                    self.precomputed_moving, moving.position
-                ),
-            ]
+            cars = self.get_close_cars(moving)
         else:
-            obstacles = [
-                self.get_possible_obstacle(
-                    self.precomputed_static, moving.position
-                ),
-                self.racetrack.cars,
-            ]
-        for obstacle in itertools.chain(*obstacles):
-            if obstacle is moving:
-                # ignore self
+            cars = self.racetrack.cars
+        for obstacle in cars:
+            if (obstacle is moving or not obstacle.COLLISION_LAYER & mask or
+                    obstacle in ignore or (obstacle, None) in tested):
+                # ignore self, the layers not in the mask, and the cars
+                # already tested
                 continue
-            if hasattr(obstacle, 'position'):
-                p1 = moving.position
-                p2 = obstacle.position
-                dist = util.distance_sq_pt_to_pt(p1, p2)
-                if dist >= self.MIN_SQ_DISTANCE_FOR_MOVING_COLLISION:
-                    # not close enough
-                    continue
-            for moving_line in util.pairwise(moving.pts):
-                for obstacle_line in util.pairwise(obstacle.pts):
-                    # did we collide ?
-                    if not self.can_collide(moving_line, obstacle_line):
-                        continue
-                    collision_pt = self.get_collision_point(
-                        moving_line, obstacle_line
-                    )
-                    if collision_pt is None:
-                        continue
-                    collisions.append(Collision(
-                        moving_line=moving_line,
-                        obstacle=obstacle,
-                        obstacle_line=obstacle_line,
-                        point=collision_pt
-                    ))
-                    if limit is not None and len(collisions) >= limit:
-                        return collisions
+            p1 = moving.position
+            p2 = obstacle.position
+            dist = util.distance_sq_pt_to_pt(p1, p2)
+            if dist >= self.MIN_SQ_DISTANCE_FOR_MOVING_COLLISION:
+                # not close enough
+                continue
+            self._check_pair(moving, pts, obstacle, None, list(obstacle.pts),
+                             collisions)
+            if limit is not None and len(collisions) >= limit:
+                return collisions
         return collisions
 
+    def sweep(self, moving, delta, mask=None):
+        """
+        Continuous collision detection: moves the moving object by 'delta'
+        (without rotating it), and finds the first obstacle it would hit
+        on the way (other cars are considered as not moving). Only the
+        layers of 'mask' are looked at (default: moving.COLLISION_MASK).
+
+        Returns (t, collision): the fraction of 'delta' the object can
+        travel (0 <= t <= 1), already reduced so it doesn't touch the
+        obstacle, and the collision (None if nothing was hit).
+
+        Obstacles the object moves away from are ignored: an object
+        stuck in another one can always get out.
+        """
+        self.nb_queries += 1
+        pts = list(moving.pts)
+        length = math.hypot(delta[0], delta[1])
+        if len(pts) <= 0 or length == 0:
+            return (1.0, None)
+        if mask is None:
+            mask = moving.COLLISION_MASK
+
+        obstacles = []
+        if mask & LAYER_BORDER:
+            box = bvh.get_pts_box(
+                pts + [(x + delta[0], y + delta[1]) for (x, y) in pts]
+            )
+            for (obstacle, obstacle_line) in self.static.query_box(box):
+                obstacles.append((obstacle, (obstacle_line,)))
+        if length < assets.TILE_SIZE[0] / 2:
+            # the pairs include cars up to 2 tiles away: enough
+            cars = self.get_close_cars(moving)
+        else:
+            cars = self.moving.query_segment(
+                (moving.position, (moving.position[0] + delta[0],
+                                   moving.position[1] + delta[1])),
+                radius=self.MIN_DISTANCE_FOR_MOVING_COLLISION
+            )
+        for car in cars:
+            if car is not moving and car.COLLISION_LAYER & mask:
+                obstacles.append((car, list(util.pairwise(car.pts))))
+
+        best = None
+        for (obstacle, obstacle_lines) in obstacles:
+            for obstacle_line in obstacle_lines:
+                self.nb_tests += 1
+                r = geometry.get_polygon_segment_toi(pts, delta,
+                                                     obstacle_line)
+                if r is None or (best is not None and r[0] >= best[0]):
+                    continue
+                (t, moving_line, contact_line, point) = r
+                best = (t, Collision(
+                    obstacle=obstacle,
+                    normal=narrowphase.get_segment_normal(
+                        contact_line, moving.position
+                    ),
+                    depth=0.0,
+                    point=point,
+                ))
+
+        if best is None:
+            return (1.0, None)
+        return (max(0.0, best[0] - (self.SKIN / length)), best[1])
+
     def collide(self, moving, collisions, frame_interval):
         if collisions is None or len(collisions) <= 0:
             return
@@ -357,42 +476,23 @@ class CollisionHandler(object):
             frame_interval
         )
 
-        position = moving.position
         speed = moving.speed
         radians = moving.radians
 
         for collision in collisions:
-            moving_line = collision.moving_line
             obstacle = collision.obstacle
-            obstacle_line = collision.obstacle_line
 
             if not obstacle.static:
                 # did we collide with them, or did they collide with us ?
-                speed_polar_rel = util.to_polar(speed)
-                if speed[0] < self.MIN_SPEED_FOR_COLLISION_SOURCE:
-                    other_speed = util.to_polar(obstacle.speed)
-                    if other_speed[0] >= self.MIN_SPEED_FOR_COLLISION_SOURCE:
-                        continue
-                speed_angle_abs = speed_polar_rel[1] + radians
-                obstacle_pos = obstacle.position
-                collision_angle = -math.atan2(
-                    obstacle_pos[1] - position[1],
-                    obstacle_pos[0] - position[0]
-                )
-                diff = collision_angle - speed_angle_abs
-                diff %= 2 * math.pi
-                if (diff > self.MAX_ANGLE_FOR_COLLISION_SOURCE and
-                        diff < ((2 * math.pi) -
-                                self.MAX_ANGLE_FOR_COLLISION_SOURCE)):
+                track_speed = self.to_track(speed, radians)
+                approach = -((track_speed[0] * collision.normal[0]) +
+                             (track_speed[1] * collision.normal[1]))
+                if approach < self.MIN_SPEED_FOR_COLLISION_SOURCE:
                     continue
 
-            collision_angle = self.get_collision_angle(
-                moving_line, obstacle_line, position
-            )
-
             # we did collide --> compute correction
             obstacle_angle = self.get_obstacle_angle(
-                obstacle_line, radians
+                collision.normal, radians
             )
 
             if obstacle.static:
@@ -401,7 +501,7 @@ class CollisionHandler(object):
                 factor = self.game_settings['collision']['propagation']
 
             (speed, removed_speed) = self.nullify_speed(
-                speed, radians, collision_angle, factor,
+                speed, radians, collision.normal, factor,
             )
             radians = self.update_angle(
                 radians, obstacle_angle, angle_trans
@@ -411,5 +511,7 @@ class CollisionHandler(object):
             obstacle.speed = self.add_speed(
                 obstacle.speed, obstacle.radians, removed_speed
             )
+            if obstacle.asleep:
+                obstacle.wake()
 
         return (speed, radians)
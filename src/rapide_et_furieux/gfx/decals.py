@@ -0,0 +1,184 @@
+"""
+Marks left on the ground (skidmarks, oil).
+
+Instead of one sprite per mark, the marks are stamped into chunks: surfaces
+covering CHUNK_TILES x CHUNK_TILES tiles of the race track, created when
+the first mark lands on them. Drawing costs one blit per visible chunk,
+however many marks there are.
+
+Marks fade: every FADE_INTERVAL simulated seconds, the alpha of the chunks
+is multiplied by FADE_FACTOR. The fading is applied lazily, when a chunk is
+stamped or drawn. Chunks without any new mark for LIFE_LENGTH simulated
+seconds are dropped, and so are the least recently stamped chunks when the
+chunks use more than MAX_MEMORY bytes.
+"""
+
+import collections
+import itertools
+import logging
+import math
+
+import pygame
+
+from . import rotation
+from .. import assets
+from .. import util
+
+
+logger = logging.getLogger(__name__)
+
+
+class Chunk(object):
+    def __init__(self, size, now):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        self.faded_at = now
+        self.stamped_at = now
+
+    def fade(self, now, interval, factor):
+        nb_fades = int((now - self.faded_at) / interval)
+        if nb_fades <= 0:
+            return
+        self.faded_at += nb_fades * interval
+        alpha = int(255 * (factor ** nb_fades))
+        self.surface.fill(
+            (255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT
+        )
+
+
+class DecalLayer(object):
+    CHUNK_TILES = 2
+    MAX_MEMORY = 16 * 1024 * 1024  # bytes
+    # marks last about 2 seconds, like the former SkidMark sprites: after
+    # LIFE_LENGTH, they are down to 0.6 ** 8 (< 2%) of their alpha
+    FADE_INTERVAL = 0.25  # simulated seconds
+    FADE_FACTOR = 0.6
+    LIFE_LENGTH = 2.0  # simulated seconds
+
+    def __init__(self, chunk_tiles=CHUNK_TILES, max_memory=MAX_MEMORY,
+                 fade_interval=FADE_INTERVAL, fade_factor=FADE_FACTOR,
+                 life_length=LIFE_LENGTH):
+        self.chunk_size = (
+            assets.TILE_SIZE[0] * chunk_tiles,
+            assets.TILE_SIZE[1] * chunk_tiles,
+        )
+        self.chunk_memory = self.chunk_size[0] * self.chunk_size[1] * 4
+        self.max_chunks = max(1, max_memory // self.chunk_memory)
+        self.fade_interval = fade_interval
+        self.fade_factor = fade_factor
+        self.life_length = life_length
+
+        # (x, y) --> Chunk, the most recently stamped last
+        self.chunks = collections.OrderedDict()
+        self.last_sweep = 0
+
+        # metrics since the last call to publish()
+        self.nb_stamps = 0
+        self.nb_evictions = 0
+
+    def __len__(self):
+        return len(self.chunks)
+
+    @property
+    def memory(self):
+        return len(self.chunks) * self.chunk_memory
+
+    def clear(self):
+        self.chunks.clear()
+
+    def get_keys(self, position, size):
+        """
+        Chunks covering the rectangle (position, size)
+        """
+        (chunk_w, chunk_h) = self.chunk_size
+        return itertools.product(
+            range(math.floor(position[0] / chunk_w),
+                  math.floor((position[0] + size[0] - 1) / chunk_w) + 1),
+            range(math.floor(position[1] / chunk_h),
+                  math.floor((position[1] + size[1] - 1) / chunk_h) + 1),
+        )
+
+    def _sweep(self, now):
+        """
+        Drops the chunks that faded away
+        """
+        if now - self.last_sweep < self.fade_interval:
+            return
+        self.last_sweep = now
+        deadline = now - self.life_length
+        # the least recently stamped chunks come first
+        while len(self.chunks) > 0:
+            (key, chunk) = next(iter(self.chunks.items()))
+            if chunk.stamped_at > deadline:
+                break
+            self.chunks.pop(key)
+
+    def _get_chunk(self, key, now):
+        try:
+            chunk = self.chunks[key]
+        except KeyError:
+            while len(self.chunks) >= self.max_chunks:
+                self.chunks.popitem(last=False)
+                self.nb_evictions += 1
+            chunk = self.chunks[key] = Chunk(self.chunk_size, now)
+            return chunk
+        chunk.fade(now, self.fade_interval, self.fade_factor)
+        chunk.stamped_at = now
+        self.chunks.move_to_end(key)
+        return chunk
+
+    def stamp(self, image, position, angle):
+        """
+        Stamps 'image', rotated by 'angle' (degrees, clockwise), centered on
+        'position' (race track coordinates)
+        """
+        now = util.sim_time()
+        self._sweep(now)
+        self.nb_stamps += 1
+
+        image = rotation.rotate(image, -angle)
+        size = image.get_size()
+        pos = (
+            int(position[0]) - (size[0] // 2),
+            int(position[1]) - (size[1] // 2),
+        )
+        (chunk_w, chunk_h) = self.chunk_size
+        for key in self.get_keys(pos, size):
+            chunk = self._get_chunk(key, now)
+            chunk.surface.blit(image, (
+                pos[0] - (key[0] * chunk_w),
+                pos[1] - (key[1] * chunk_h),
+            ))
+
+    def draw(self, screen, absolute):
+        """
+        'absolute': position of the race track on the screen
+        """
+        if len(self.chunks) <= 0:
+            return
+        now = util.sim_time()
+        self._sweep(now)
+
+        (chunk_w, chunk_h) = self.chunk_size
+        chunks = self.chunks
+        for key in self.get_keys((-absolute[0], -absolute[1]),
+                                 screen.get_size()):
+            chunk = chunks.get(key)
+            if chunk is None:
+                continue
+            chunk.fade(now, self.fade_interval, self.fade_factor)
+            screen.blit(chunk.surface, (
+                absolute[0] + (key[0] * chunk_w),
+                absolute[1] + (key[1] * chunk_h),
+            ))
+
+    def publish(self, profiler):
+        """
+        Sets the profiler gauges and resets the metrics
+        """
+        profiler.set_gauge("decal chunks", len(self.chunks))
+        profiler.set_gauge("decal memory (KiB)", self.memory // 1024)
+        profiler.set_gauge("decal stamps", self.nb_stamps)
+        profiler.set_gauge("decal evictions", self.nb_evictions)
+        self.nb_stamps = 0
+        self.nb_evictions = 0
@@ -5,7 +5,10 @@ import pygame
 
 from . import RelativeGroup
 from .. import assets
+from .. import terrain
 from .. import util
+from . import decals
+from . import rotation
 from .collisions import CollisionHandler
 from .collisions import CollisionObject
 from .objects import RaceTrackObject
@@ -257,7 +260,8 @@ class RaceTrack(RelativeGroup):
     DELETION_MARGIN = 15
 
     def __init__(self, grid_margin=0, debug=False,
-                 game_settings=util.GAME_SETTINGS_TEMPLATE):
+                 game_settings=util.GAME_SETTINGS_TEMPLATE,
+                 max_decal_memory=decals.DecalLayer.MAX_MEMORY):
         super().__init__()
 
         self.debug = debug
@@ -277,6 +281,15 @@ class RaceTrack(RelativeGroup):
 
         self.game_settings = game_settings
         self.collisions = CollisionHandler(self, game_settings)
+        # distance to the borders, see clearance.ClearanceField
+        # (only loaded when needed)
+        self.clearance = None
+        # see get_terrain(). Built on the first call, reset by
+        # invalidate_terrain()
+        self.terrain = None
+        self.physics = None
+        # skidmarks
+        self.decals = decals.DecalLayer(max_memory=max_decal_memory)
 
     def start_race(self):
         for car in self.cars:
@@ -311,10 +324,11 @@ class RaceTrack(RelativeGroup):
                 continue
 
     def draw(self, screen):
-        self.tiles.draw(screen)
+        util.profiled(self.tiles.draw, screen)
         super().draw(screen)
 
         absolute = self.absolute
+        util.profiled(self.decals.draw, screen, absolute)
         screen_size = screen.get_size()
         max_dist = assets.TILE_SIZE[0] * 2
         screen_rect = pygame.Rect(
@@ -347,6 +361,10 @@ class RaceTrack(RelativeGroup):
         for el in itertools.chain(*to_draw):
             el.draw(screen)
 
+        if util.g_profiler is not None:
+            rotation.g_cache.publish(util.g_profiler)
+            self.decals.publish(util.g_profiler)
+
     def add_bonus(self, obj):
         self.bonuses.add(obj)
 
@@ -372,12 +390,32 @@ class RaceTrack(RelativeGroup):
         if not isinstance(crap_area, CrapArea):
             crap_area = CrapArea(self, crap_area)
         self.crap_areas.append(crap_area)
+        self.invalidate_terrain()
+
+    def invalidate_terrain(self):
+        """
+        Must be called each time the tiles or the crap areas change
+        """
+        self.terrain = None
+
+    def get_terrain_map(self):
+        if self.terrain is None:
+            self.terrain = terrain.TerrainMap(
+                {pos: tile.resource for (pos, tile) in self.tiles.grid.items()},
+                [(area.pt_a, area.pt_b) for area in self.crap_areas]
+            )
+        return self.terrain
 
     def get_terrain(self, position):
-        for area in self.crap_areas:
-            if area.inside(position):
-                return "crap"
-        return "normal"
+        return self.get_terrain_map().get_terrain(position)
+
+    def get_physics(self, position):
+        """
+        Physics of the terrain at this position (see terrain.Physics)
+        """
+        if self.physics is None:
+            self.physics = terrain.get_physics_table(self.game_settings)
+        return self.physics[self.get_terrain(position)]
 
     def update_checkpoints(self):
         for (idx, checkpoint) in enumerate(self.checkpoints):
@@ -402,9 +440,11 @@ class RaceTrack(RelativeGroup):
 
     def add_car(self, car):
         self.cars.append(car)
+        self.collisions.add_moving(car)
 
     def remove_car(self, car):
         self.cars.remove(car)
+        self.collisions.remove_moving(car)
 
     def get_track_border(self, position):
         for border in self.borders:
@@ -458,6 +498,7 @@ class RaceTrack(RelativeGroup):
         if el is not None:
             logger.info("Removing crap area: %s", el)
             self.crap_areas.remove(el)
+            self.invalidate_terrain()
             return
 
         # position matches an object ?
@@ -477,6 +518,7 @@ class RaceTrack(RelativeGroup):
         if el is not None:
             logger.info("Removing tile: %s / %s", mouse_position, el)
             if self.tiles.remove_tile(el):
+                self.invalidate_terrain()
                 return
 
         logger.info("Unable to find element to remove at %s / %s",
@@ -499,6 +541,7 @@ class RaceTrack(RelativeGroup):
         self.borders = []
         self.crap_areas = []
         self.checkpoints = []
+        self.invalidate_terrain()
 
         # loading
         self.tiles.unserialize(data['tiles'])
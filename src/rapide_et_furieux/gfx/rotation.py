@@ -0,0 +1,111 @@
+"""
+Cache of rotated sprites.
+
+pygame.transform.rotate() is one of the most expensive calls we make, and
+the sprites keep being rotated to the same angles: angles are quantized to
+STEPS steps per turn and each (image, step) is rendered only once. The
+least recently used frames are dropped when the cache uses more than
+MAX_MEMORY bytes.
+
+Images are identified by the surface object itself: sprites sharing the
+same original surface share their frames. Surfaces must not be modified
+once rotated.
+"""
+
+import collections
+import logging
+
+import pygame
+
+
+logger = logging.getLogger(__name__)
+
+
+class RotationCache(object):
+    STEPS = 256  # per turn
+    MAX_MEMORY = 64 * 1024 * 1024  # bytes
+
+    def __init__(self, steps=STEPS, max_memory=MAX_MEMORY):
+        self.steps = steps
+        self.max_memory = max_memory
+        # (image, step) --> rotated image, the most recently used last
+        self.frames = collections.OrderedDict()
+        self.memory = 0
+
+        # metrics since the last call to publish()
+        self.nb_hits = 0
+        self.nb_misses = 0
+        self.nb_evictions = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def get_step(self, angle):
+        return round(angle * self.steps / 360) % self.steps
+
+    @staticmethod
+    def get_memory(image):
+        return image.get_width() * image.get_height() * image.get_bytesize()
+
+    def rotate(self, image, angle):
+        """
+        Same as pygame.transform.rotate(image, angle), with the angle
+        (degrees, counterclockwise) rounded to the closest step
+        """
+        key = (image, self.get_step(angle))
+        frames = self.frames
+        try:
+            rotated = frames[key]
+        except KeyError:
+            pass
+        else:
+            self.nb_hits += 1
+            frames.move_to_end(key)
+            return rotated
+
+        self.nb_misses += 1
+        rotated = pygame.transform.rotate(image, key[1] * 360 / self.steps)
+        frames[key] = rotated
+        self.memory += self.get_memory(rotated)
+        while self.memory > self.max_memory and len(frames) > 1:
+            (_, dropped) = frames.popitem(last=False)
+            self.memory -= self.get_memory(dropped)
+            self.nb_evictions += 1
+        return rotated
+
+    def prerender(self, image):
+        """
+        Renders all the steps of this image now instead of on the first
+        use (at load time for instance)
+        """
+        for step in range(0, self.steps):
+            self.rotate(image, step * 360 / self.steps)
+
+    def clear(self):
+        self.frames.clear()
+        self.memory = 0
+
+    def publish(self, profiler):
+        """
+        Sets the profiler gauges and resets the metrics
+        """
+        nb_lookups = self.nb_hits + self.nb_misses
+        profiler.set_gauge("rotation cache frames", len(self.frames))
+        profiler.set_gauge("rotation cache memory (KiB)",
+                           self.memory // 1024)
+        profiler.set_gauge(
+            "rotation cache hit rate",
+            "{:.0%}".format(self.nb_hits / max(nb_lookups, 1))
+        )
+        profiler.set_gauge("rotation cache evictions", self.nb_evictions)
+        self.nb_hits = 0
+        self.nb_misses = 0
+        self.nb_evictions = 0
+
+
+# shared by all the sprites
+g_cache = RotationCache()
+
+
+def rotate(image, angle):
+    return g_cache.rotate(image, angle)
@@ -30,6 +30,7 @@ class Tile(RelativeSprite):
             return
         element = self.copy()
         race_track.tiles.set_tile(grid_position, element)
+        race_track.invalidate_terrain()
 
 
 class TileGrid(RelativeGroup):
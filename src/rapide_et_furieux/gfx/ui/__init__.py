@@ -63,13 +63,15 @@ class FPSCounter(object):
         self.font = font
         self.position = position
         self.surface = None
-        self.last_measure = time.time()
+        self.last_measure = util.clock()
         self.nb_frames = 0
 
-    def on_frame(self, interval):
+    def on_frame(self):
+        # animators are called on each simulation tick, not on each rendered
+        # frame, so we count the frames when drawing
         self.nb_frames += 1
 
-        now = time.time()
+        now = util.clock()
         if now - self.last_measure >= 1.0:
             self.surface = self.font.render(
                 "%d FPS" % self.nb_frames, True, self.COLOR
@@ -79,11 +81,82 @@ class FPSCounter(object):
             return
 
     def draw(self, screen):
+        self.on_frame()
         if self.surface is None:
             return
         screen.blit(self.surface, self.position)
 
 
+class PerfOverlay(object):
+    """
+    Show the breakdown measured by util.g_profiler and a graph of the last
+    frame times.
+    """
+    COLOR = (255, 255, 255)
+    BG_COLOR = (0, 0, 0, 160)
+    GRAPH_COLOR = (0, 255, 0)
+    GRAPH_LIMIT_COLORS = [
+        (1.0 / 60, (255, 255, 0)),
+        (1.0 / 30, (255, 0, 0)),
+    ]
+    GRAPH_SIZE = (300, 100)
+    GRAPH_MAX = 1.0 / 20  # seconds
+    MAX_LINES = 15
+    REFRESH_INTERVAL = 0.5
+
+    def __init__(self, font, position=(0, 0)):
+        self.font = font
+        self.position = position
+        self.surface = None
+        self.last_refresh = 0
+
+    def refresh(self, profiler):
+        lines = [
+            self.font.render(line, True, self.COLOR)
+            for line in (profiler.format_breakdown(self.MAX_LINES) +
+                         profiler.format_gauges())
+        ]
+        line_height = self.font.get_linesize()
+        size = (
+            max(self.GRAPH_SIZE[0], max(line.get_size()[0] for line in lines)),
+            (line_height * len(lines)) + self.GRAPH_SIZE[1],
+        )
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.surface.fill(self.BG_COLOR)
+        for (idx, line) in enumerate(lines):
+            self.surface.blit(line, (0, idx * line_height))
+
+    def draw_graph(self, screen, profiler):
+        (w, h) = self.GRAPH_SIZE
+        x = self.position[0]
+        y = self.position[1] + self.surface.get_size()[1]
+        frame_times = list(profiler.frame_times)[-w:]
+        for (idx, frame_time) in enumerate(frame_times):
+            frame_h = min(h, int(h * frame_time / self.GRAPH_MAX))
+            pygame.draw.line(
+                screen, self.GRAPH_COLOR,
+                (x + idx, y), (x + idx, y - frame_h)
+            )
+        for (limit, color) in self.GRAPH_LIMIT_COLORS:
+            limit_h = int(h * limit / self.GRAPH_MAX)
+            pygame.draw.line(
+                screen, color, (x, y - limit_h), (x + w, y - limit_h)
+            )
+
+    def draw(self, screen):
+        profiler = util.g_profiler
+        if profiler is None:
+            return
+        now = util.clock()
+        if self.surface is None or (
+                    now - self.last_refresh >= self.REFRESH_INTERVAL
+                ):
+            self.refresh(profiler)
+            self.last_refresh = now
+        screen.blit(self.surface, self.position)
+        self.draw_graph(screen, profiler)
+
+
 class ElementSelector(RelativeGroup):
     MARGIN = 5
     COLUMNS = 4
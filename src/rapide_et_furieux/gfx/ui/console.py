@@ -5,7 +5,9 @@ import random
 import pygame
 
 from . import FPSCounter
+from . import PerfOverlay
 from ... import assets
+from ... import profiler
 from ... import util
 from ..cars.ai import IACar
 from ..weapons import get_weapons
@@ -43,7 +45,57 @@ class CommandShowFPS(object):
             self.screen_size[0] - 128, 0
         ))
         util.register_drawer(assets.OSD_LAYER - 1, fps_counter)
-        util.register_animator(fps_counter.on_frame)
+
+
+class CommandPerf(object):
+    DEFAULT_DUMP_FRAMES = 60
+
+    def __init__(self, *args, **kwargs):
+        self.console = None
+        self.overlay = None
+
+    def enable(self):
+        if util.g_profiler is None:
+            util.set_profiler(profiler.FrameProfiler())
+
+    def show(self):
+        self.enable()
+        if self.overlay is None:
+            self.overlay = PerfOverlay(self.console.font, position=(0, 0))
+            util.register_drawer(assets.OSD_LAYER, self.overlay)
+
+    def hide(self):
+        util.set_profiler(None)
+        if self.overlay is not None:
+            util.unregister_drawer(self.overlay)
+            self.overlay = None
+
+    def run(self, cmd, args):
+        if len(args) <= 0:
+            if self.overlay is None:
+                self.show()
+            else:
+                self.hide()
+        elif args[0] == "on":
+            self.show()
+        elif args[0] == "off":
+            self.hide()
+        elif args[0] == "dump":
+            nb_frames = self.DEFAULT_DUMP_FRAMES
+            if len(args) >= 2:
+                nb_frames = int(args[1])
+            self.enable()
+            util.g_profiler.dump_cprofile(nb_frames)
+            self.console.add_line(
+                "Profiling the next {} frames".format(nb_frames)
+            )
+            return
+        else:
+            self.console.add_line("perf [on|off|dump [nb_frames]]")
+            return
+        self.console.add_line("Profiler: {}".format(
+            util.g_profiler is not None
+        ))
 
 
 class CommandEcho(object):
@@ -95,6 +147,7 @@ class CommandKillAll(object):
                 continue
             self.race_track.remove_car(car)
             util.unregister_animator(car.move)
+            car.unregister_animators()
             nb += 1
         self.console.add_line("{} cars removed".format(nb))
 
@@ -1,13 +1,17 @@
 import logging
 import math
 import random
-import time
 
 import pygame
 
 from .. import RelativeSprite
+from .. import rotation
+from ..collisions import LAYER_BORDER
+from ..collisions import LAYER_CAR
+from ..collisions import LAYER_PROJECTILE
 from ... import assets
 from ... import sounds
+from ... import transform
 from ... import util
 
 
@@ -37,7 +41,7 @@ def load_explosions():
         EXPLOSION_SURFACES[size] = []
         for imgs in assets.EXPLOSIONS:
             # first image give us the reference size
-            src_imgs = [assets.load_image(img) for img in imgs]
+            src_imgs = [assets.get_image(img) for img in imgs]
             src_size = src_imgs[0].get_size()
             ratio = max(
                 src_size[0] / size,
@@ -76,18 +80,12 @@ class Explosion(object):
         self.relative = (position[0] - (size / 2), position[1] - (size / 2))
         self.anim_length = anim_length
         self.size = (size, size)
-        self.t = 0
+        self.start = util.sim_time()
         util.register_drawer(assets.WEAPONS_LAYER, self)
-        util.register_animator(self.anim)
+        util.add_timer(anim_length, self.disappear)
 
     def disappear(self):
         util.unregister_drawer(self)
-        util.unregister_animator(self.anim)
-
-    def anim(self, frame_interval):
-        self.t += frame_interval
-        if self.t > self.anim_length:
-            self.disappear()
 
     @property
     def absolute(self):
@@ -98,8 +96,9 @@ class Explosion(object):
         )
 
     def draw(self, screen):
-        frame_idx = int(len(self.frames) * self.t / self.anim_length)
-        if frame_idx > len(self.frames):
+        t = util.sim_time() - self.start
+        frame_idx = int(len(self.frames) * t / self.anim_length)
+        if frame_idx >= len(self.frames):
             frame_idx = len(self.frames) - 1
         screen.blit(
             self.frames[frame_idx],
@@ -120,8 +119,11 @@ class Projectile(RelativeSprite):
     EXPLOSION_DAMAGE = 0
     ASSETS = None
     DEFAULT_ASSET = None
+    # transformations of the asset before scaling (see assets.get_image())
+    ASSET_RECIPE = ()
     ASSET_ANGLE = 0
-    SIZE_FACTOR = 1.0
+    COLLISION_LAYER = LAYER_PROJECTILE
+    COLLISION_MASK = LAYER_BORDER | LAYER_CAR
 
     def __init__(self, race_track, shooter, angle):
         self.shooter = shooter
@@ -132,45 +134,29 @@ class Projectile(RelativeSprite):
             projectile = self.ASSETS[color]
         else:
             projectile = self.DEFAULT_ASSET
-        super().__init__(projectile)
-        if self.SIZE_FACTOR != 1.0:
-            self.original = self.image = pygame.transform.scale(
-                self.image, (
-                    int(self.size[0] * self.SIZE_FACTOR),
-                    int(self.size[1] * self.SIZE_FACTOR),
-                )
-            )
-        self.original = self.image = pygame.transform.scale(
-            self.image, (
-                int(self.size[0] * assets.CAR_SCALE_FACTOR),
-                int(self.size[1] * assets.CAR_SCALE_FACTOR),
-            )
-        )
+        recipe = self.ASSET_RECIPE + (("scale", assets.CAR_SCALE_FACTOR),)
         if self.ASSET_ANGLE != 0:
-            self.original = self.image = pygame.transform.rotate(
-                self.image, self.ASSET_ANGLE
-            )
+            recipe += (("rotate", self.ASSET_ANGLE),)
+        super().__init__(projectile, assets.get_image(projectile, *recipe))
 
-        self.image = pygame.transform.rotate(self.image, -angle)
+        self.image = rotation.rotate(self.image, -angle)
         self.size = self.image.get_size()
         self.parent = race_track
         self.relative = (
             shooter.position[0] - (self.size[0] / 2),
             shooter.position[1] - (self.size[1] / 2),
         )
+        # relative position at the previous simulation tick (for rendering)
+        self.last_relative = self.relative
 
         angle -= 90
         angle *= math.pi / 180
-        (cos, sin) = (math.cos(angle), math.sin(angle))
 
         util.register_drawer(assets.WEAPONS_LAYER, self)
         util.register_animator(self.move)
 
         # relative to the race_track
-        self.speed = (
-            self.SPEED * cos,
-            self.SPEED * sin,
-        )
+        self.speed = transform.rotate((self.SPEED, 0), angle)
         self.radians = angle  # to make collide() happy
 
         self._pts = ()
@@ -216,7 +202,17 @@ class Projectile(RelativeSprite):
         # most projectiles actually don't turn
         return
 
+    def draw(self, screen):
+        absolute = self.parent.absolute
+        relative = util.interpolate(self.last_relative, self.relative)
+        screen.blit(
+            self.image,
+            (absolute[0] + relative[0], absolute[1] + relative[1]),
+            ((0, 0), self.size)
+        )
+
     def move(self, frame_interval):
+        self.last_relative = self.relative
         self.turn(frame_interval)
 
         if self.speed[0] == 0 and self.speed[1] == 0:
@@ -255,11 +251,9 @@ class Projectile(RelativeSprite):
                 self.disappear()
                 return
 
-        collisions = self.parent.collisions.get_collisions(self)
-        collisions = [
-            collision for collision in collisions
-            if collision.obstacle is not self.shooter
-        ]
+        collisions = self.parent.collisions.get_collisions(
+            self, ignore=(self.shooter,)
+        )
         if len(collisions) <= 0:
             return
 
@@ -293,13 +287,13 @@ class Weapon(object):
         self.parent = generator
         self.shooter = shooter
         self.shooter.weapon = self
-        self.last_shot = 0
+        self.last_shot = -self.MIN_FIRE_INTERVAL
 
     def deactivate(self):
         pass
 
     def fire(self):
-        n = time.time()
+        n = util.sim_time()
         if n - self.last_shot <= self.MIN_FIRE_INTERVAL:
             return False
         self.last_shot = n
@@ -314,34 +308,24 @@ class Turret(Weapon):
         super().__init__(generator, shooter)
         self.shooter.extra_drawers_above.add(self)
         self.angle = 0
-        self.turret_base = assets.load_image(assets.TURRET_BASE)
-        self.turret_base = pygame.transform.scale(
-            self.turret_base,
-            (
-                int(self.turret_base.get_size()[0] * assets.CAR_SCALE_FACTOR),
-                int(self.turret_base.get_size()[1] * assets.CAR_SCALE_FACTOR),
-            ),
+        self.turret_base = assets.get_image(
+            assets.TURRET_BASE, ("scale", assets.CAR_SCALE_FACTOR)
         )
-        self.turret = assets.load_image(turret_rsc)
-        self.turret = pygame.transform.scale(
-            self.turret,
-            (
-                int(self.turret.get_size()[0] * assets.CAR_SCALE_FACTOR),
-                int(self.turret.get_size()[1] * assets.CAR_SCALE_FACTOR),
-            ),
+        self.turret = assets.get_image(
+            turret_rsc, ("scale", assets.CAR_SCALE_FACTOR),
+            ("rotate", self.TURRET_ANGLE)
         )
-        self.turret = pygame.transform.rotate(self.turret, self.TURRET_ANGLE)
 
     def draw(self, screen, shooter):
         turret_base = self.turret_base
         turret_base_size = turret_base.get_size()
 
         turret = self.turret
-        turret = pygame.transform.rotate(turret, -self.angle)
+        turret = rotation.rotate(turret, -self.angle)
         turret_size = turret.get_size()
 
         shooter_parent_abs = shooter.parent.absolute
-        shooter_position = shooter.position
+        shooter_position = shooter.render_position
 
         for (size, el) in [
                     (turret_base_size, turret_base),
@@ -391,13 +375,9 @@ class AutomaticTurret(Turret):
         super().__init__(generator, shooter, turret_rsc)
         self.race_track = race_track
         if shooter.color in assets.CROSSAIRS:
-            crossair = assets.load_image(
-                assets.CROSSAIRS[shooter.color][:2]
-            )
+            crossair = assets.get_image(assets.CROSSAIRS[shooter.color])
         else:
-            crossair = assets.load_image(
-                assets.CROSSAIRS[(255, 255, 255)][:2]
-            )
+            crossair = assets.get_image(assets.CROSSAIRS[(255, 255, 255)])
         self.target = None
         self.crossair = CrossairDrawer(self, crossair)
         util.register_drawer(assets.WEAPONS_LAYER, self.crossair)
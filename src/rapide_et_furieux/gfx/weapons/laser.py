@@ -3,8 +3,6 @@
 import logging
 import random
 
-import pygame
-
 from . import common
 from ... import assets
 from ... import sounds
@@ -35,7 +33,7 @@ class ForwardLaserGun(common.StaticTurret):
     def __init__(self, generator, race_track, shooter):
         super().__init__(generator, shooter, assets.GUN_LASER)
         self.race_track = race_track
-        self.sound = random.sample(assets.SOUNDS['laser'], 1)[0]
+        self.sound = random.sample(sorted(assets.SOUNDS['laser']), 1)[0]
 
     def fire(self):
         if not super().fire():
@@ -52,8 +50,9 @@ class ForwardLaserGenerator(object):
     category = common.CATEGORY_GUNS
 
     def __init__(self):
-        self.image = assets.load_image(assets.LASERS[(0, 0, 255)])
-        self.image = pygame.transform.rotate(self.image, -90)
+        self.image = assets.get_image(
+            assets.LASERS[(0, 0, 255)], ("rotate", -90)
+        )
 
     def activate(self, race_track, shooter):
         return ForwardLaserGun(self, race_track, shooter)
@@ -76,7 +75,7 @@ class AutomaticLaserGun(common.AutomaticTurret):
     def __init__(self, generator, race_track, shooter):
         super().__init__(generator, race_track, shooter, assets.GUN_LASER)
         self.race_track = race_track
-        self.sound = random.sample(assets.SOUNDS['laser'], 1)[0]
+        self.sound = random.sample(sorted(assets.SOUNDS['laser']), 1)[0]
 
     def fire(self):
         if not super().fire():
@@ -93,8 +92,9 @@ class AutomaticLaserGenerator(object):
     category = common.CATEGORY_GUIDED
 
     def __init__(self):
-        self.image = assets.load_image(assets.LASERS[(255, 0, 0)])
-        self.image = pygame.transform.rotate(self.image, -90)
+        self.image = assets.get_image(
+            assets.LASERS[(255, 0, 0)], ("rotate", -90)
+        )
 
     def activate(self, race_track, shooter):
         return AutomaticLaserGun(self, race_track, shooter)
@@ -23,13 +23,14 @@ class GunFire(RelativeSprite):
         self.race_track = race_track
         self.line = line
         self.color = color
-        self.t = 0
+        self.start = util.sim_time()
         util.register_drawer(assets.WEAPONS_LAYER, self)
-        util.register_animator(self.anim)
+        util.add_timer(self.TIME_VISIBLE, self.disappear)
 
     def draw(self, screen):
         absolute = self.race_track.absolute
-        r = 128 * self.t / self.TIME_VISIBLE
+        t = util.sim_time() - self.start
+        r = min(128, 128 * t / self.TIME_VISIBLE)
         color = (
             max(r, self.color[0]),
             max(r, self.color[1]),
@@ -47,12 +48,8 @@ class GunFire(RelativeSprite):
             ),
         )
 
-    def anim(self, frame_interval):
-        self.t += frame_interval
-        if self.t < self.TIME_VISIBLE:
-            return
+    def disappear(self):
         util.unregister_drawer(self)
-        util.unregister_animator(self.anim)
 
 
 class MachineGun(common.AutomaticTurret):
@@ -66,7 +63,7 @@ class MachineGun(common.AutomaticTurret):
     def __init__(self, generator, race_track, shooter):
         super().__init__(generator, race_track, shooter, assets.GUN_MACHINEGUN)
         self.race_track = race_track
-        self.sound = random.sample(assets.SOUNDS['machinegun'], 1)[0]
+        self.sound = random.sample(sorted(assets.SOUNDS['machinegun']), 1)[0]
 
         # make sure to cross the whole race track
         self.max_length = util.distance_pt_to_pt(
@@ -95,11 +92,11 @@ class MachineGun(common.AutomaticTurret):
         )
 
         # find where the shoots ends
-        obstacles = self.race_track.collisions.get_obstacles_on_segment(line)
+        obstacles = self.race_track.collisions.get_obstacles_on_segment(
+            line, ignore=(self.shooter,)
+        )
         closest = (0xFFFFFFFF, None, None)
         for (obstacle, collision_pt) in obstacles:
-            if obstacle is self.shooter:
-                continue
             dist = util.distance_sq_pt_to_pt(position, collision_pt)
             if dist < closest[0]:
                 closest = (dist, obstacle, collision_pt)
@@ -127,8 +124,7 @@ class MachineGunGenerator(object):
     category = common.CATEGORY_GUIDED
 
     def __init__(self):
-        self.image = assets.load_image(assets.BULLET)
-        self.image = pygame.transform.rotate(self.image, -90)
+        self.image = assets.get_image(assets.BULLET, ("rotate", -90))
 
     def activate(self, race_track, shooter):
         return MachineGun(self, race_track, shooter)
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
-import pygame
-
 from . import common
+from ..collisions import LAYER_CAR
+from ..collisions import LAYER_HAZARD
 from ... import assets
 
 
@@ -20,7 +20,8 @@ class Mine(common.Projectile):
     ASSETS = None
     DEFAULT_ASSET = assets.MINE
     ASSET_ANGLE = 0
-    SIZE_FACTOR = 1.0
+    COLLISION_LAYER = LAYER_HAZARD
+    COLLISION_MASK = LAYER_CAR
 
 
 class MineGun(common.Weapon):
@@ -45,14 +46,7 @@ class MineGenerator(object):
     category = common.CATEGORY_COUNTER_MEASURES
 
     def __init__(self):
-        self.image = assets.load_image(assets.MINE)
-        img_size = self.image.get_size()
-        ratio = max(
-            img_size[0] / 32,
-            img_size[1] / 32,
-        )
-        img_size = (int(img_size[0] / ratio), int(img_size[1] / ratio))
-        self.image = pygame.transform.scale(self.image, img_size)
+        self.image = assets.get_image(assets.MINE, ("fit", 32))
 
     def activate(self, race_track, shooter):
         return MineGun(self, race_track, shooter)
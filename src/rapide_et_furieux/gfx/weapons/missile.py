@@ -2,10 +2,10 @@
 
 import math
 
-import pygame
-
 from . import common
+from .. import rotation
 from ... import assets
+from ... import transform
 from ... import util
 
 
@@ -23,7 +23,6 @@ class Missile(common.Projectile):
     ASSETS = None
     DEFAULT_ASSET = assets.MISSILE
     ASSET_ANGLE = 0
-    SIZE_FACTOR = 0.75
     MAX_TURN_SPEED = math.pi * 4
 
     def __init__(self, target, *args, **kwargs):
@@ -64,7 +63,7 @@ class Missile(common.Projectile):
         )
         # The gfx are oriented to the up side, but radians=0 == right
         self.angle = self.radians * 180 / math.pi
-        self.image = pygame.transform.rotate(self.original, -self.angle)
+        self.image = rotation.rotate(self.original, -self.angle)
         self.size = self.image.get_size()
         self.relative = (
             int(position[0]) - (self.size[0] / 2),
@@ -78,9 +77,7 @@ class Missile(common.Projectile):
         self.recompute_pts()
 
         # missile turns, so does its speed momentum
-        speed = util.to_polar(self.speed)
-        speed = (speed[0], speed[1] + angle_change)
-        self.speed = util.to_cartesian(speed)
+        self.speed = transform.rotate(self.speed, angle_change)
         return angle_change
 
     def turn(self, frame_interval):
@@ -125,7 +122,7 @@ class GuidedMissileGenerator(object):
     category = common.CATEGORY_GUIDED
 
     def __init__(self):
-        self.image = assets.load_image(assets.MISSILE)
+        self.image = assets.get_image(assets.MISSILE)
 
     def activate(self, race_track, shooter):
         return MissileGun(self, race_track, shooter)
@@ -2,10 +2,9 @@
 
 import random
 
-import pygame
-
 from . import common
 from .. import RelativeSprite
+from .. import rotation
 from ... import assets
 from ... import util
 
@@ -20,14 +19,12 @@ class Oil(RelativeSprite):
     LIFE_LENGTH = 15
 
     def __init__(self, race_track, shooter):
-        super().__init__(self.ASSET)
+        super().__init__(
+            self.ASSET, assets.get_image(self.ASSET, ("scale", 0.75))
+        )
 
         self.angle = random.randint(0, 360)
-        self.image = pygame.transform.scale(self.image, (
-            int(self.image.get_size()[0] * 0.75),
-            int(self.image.get_size()[1] * 0.75),
-        ))
-        self.image = pygame.transform.rotate(self.image, self.angle)
+        self.image = rotation.rotate(self.image, self.angle)
         self.size = self.image.get_size()
 
         self.parent = race_track
@@ -38,19 +35,15 @@ class Oil(RelativeSprite):
             shooter.position[1] - (self.size[1] / 2),
         )
         self.shooter = shooter
-        self.time_remaining = self.LIFE_LENGTH
         util.register_drawer(assets.WEAPONS_LAYER, self)
-        util.register_animator(self.anim)
+        util.register_animator(self.check_contacts)
+        util.add_timer(self.LIFE_LENGTH, self.disappear)
 
     def disappear(self):
         util.unregister_drawer(self)
-        util.unregister_animator(self.anim)
+        util.unregister_animator(self.check_contacts)
 
-    def anim(self, frame_interval):
-        self.time_remaining -= frame_interval
-        if self.time_remaining <= 0:
-            self.disappear()
-            return
+    def check_contacts(self, frame_interval):
         for car in self.parent.cars:
             if car is self.shooter:
                 continue
@@ -81,14 +74,7 @@ class OilGenerator(object):
     category = common.CATEGORY_COUNTER_MEASURES
 
     def __init__(self):
-        self.image = assets.load_image(assets.OIL)
-        img_size = self.image.get_size()
-        ratio = max(
-            img_size[0] / 32,
-            img_size[1] / 32,
-        )
-        img_size = (int(img_size[0] / ratio), int(img_size[1] / ratio))
-        self.image = pygame.transform.scale(self.image, img_size)
+        self.image = assets.get_image(assets.OIL, ("fit", 32))
 
     def activate(self, race_track, shooter):
         return OilGun(self, race_track, shooter)
@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import pygame
-
 from . import common
 from ... import assets
 
@@ -19,7 +17,6 @@ class TankShell(common.Projectile):
     EXPLOSION_DAMAGE = 50
     ASSETS = assets.BULLETS
     DEFAULT_ASSET = assets.BULLETS[(0, 0, 255)]
-    SIZE_FACTOR = 1.0
 
 
 class TankGun(common.StaticTurret):
@@ -44,11 +41,9 @@ class TankShellGenerator(object):
     category = common.CATEGORY_GUNS
 
     def __init__(self):
-        self.image = assets.load_image(assets.BULLET)
-        self.image = pygame.transform.rotate(self.image, -90)
-        img_size = self.image.get_size()
-        img_size = (img_size[0] * 2, img_size[1] * 2)
-        self.image = pygame.transform.scale(self.image, img_size)
+        self.image = assets.get_image(
+            assets.BULLET, ("rotate", -90), ("scale", 2)
+        )
 
     def activate(self, race_track, shooter):
         return TankGun(self, race_track, shooter)
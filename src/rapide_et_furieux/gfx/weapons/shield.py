@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import pygame
-
 from . import common
 from ... import assets
 
@@ -30,14 +28,7 @@ class ShieldGenerator(object):
     category = common.CATEGORY_COUNTER_MEASURES
 
     def __init__(self):
-        self.image = assets.load_image(assets.SHIELD)
-        img_size = self.image.get_size()
-        ratio = max(
-            img_size[0] / 32,
-            img_size[1] / 32,
-        )
-        img_size = (int(img_size[0] / ratio), int(img_size[1] / ratio))
-        self.image = pygame.transform.scale(self.image, img_size)
+        self.image = assets.get_image(assets.SHIELD, ("fit", 32))
 
     def activate(self, race_track, shooter):
         return ShieldGun(self, race_track, shooter)
@@ -14,15 +14,17 @@ class MusicPlayer(object):
     def __init__(self, change_interval=40):
         self.min_change_interval = change_interval
         self.change_interval = 0
-        self.t = 0
+        self.timer = None
         self.playing = None
-        util.register_animator(self._change_track)
 
     def play_next(self):
-        asset_music = random.sample(assets.MUSICS, 1)[0]
+        asset_music = random.sample(sorted(assets.MUSICS), 1)[0]
         logger.info("Playing: {}".format(asset_music))
         self.playing = assets.get_resource(asset_music)
         self.change_interval = max(self.min_change_interval, asset_music[3])
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = util.add_timer(self.change_interval, self.play_next)
 
         if pygame.mixer.music.get_busy():
             pygame.mixer.music.stop()
@@ -32,15 +34,9 @@ class MusicPlayer(object):
 
     def stop(self):
         logger.info("Stopping music playback")
-        self.t = 0
-        util.unregister_animator(self._change_track)
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
         self.playing = None
         pygame.mixer.music.pause()
         pygame.mixer.music.stop()
-
-    def _change_track(self, frame_interval):
-        self.t += frame_interval
-        if self.t < self.change_interval:
-            return
-        self.t = 0
-        self.play_next()
@@ -0,0 +1,258 @@
+"""
+Narrow phase: exact overlap test between 2 convex shapes (car boxes,
+projectiles, border segments), with the information needed to react to
+it.
+
+Shapes are lists of points. Shapes of 4 points are considered as oriented
+boxes (rectangles), shapes of 2 points as segments.
+"""
+
+import collections
+import math
+
+
+Contact = collections.namedtuple(
+    typename="contact",
+    field_names=(
+        # unit vector, pushing the shape 'a' out of the shape 'b'
+        "normal",
+        # how much they overlap along the normal (pixels)
+        "depth",
+        "point",
+    ),
+)
+
+
+def get_bounding_circle(pts):
+    nb_pts = len(pts)
+    (cx, cy) = (0.0, 0.0)
+    for (x, y) in pts:
+        cx += x
+        cy += y
+    (cx, cy) = (cx / nb_pts, cy / nb_pts)
+    radius_sq = 0.0
+    for (x, y) in pts:
+        dist_sq = ((x - cx) * (x - cx)) + ((y - cy) * (y - cy))
+        if dist_sq > radius_sq:
+            radius_sq = dist_sq
+    return ((cx, cy), math.sqrt(radius_sq))
+
+
+def get_axes(pts):
+    """
+    Normals of the edges (not normalized), without the ones that are
+    parallel for sure
+    """
+    if len(pts) == 2:
+        edges = ((pts[0], pts[1]),)
+    elif len(pts) == 4:
+        # rectangle: opposite edges are parallel
+        edges = ((pts[0], pts[1]), (pts[1], pts[2]))
+    else:
+        edges = zip(pts, pts[1:] + pts[:1])
+    return [(a[1] - b[1], b[0] - a[0]) for (a, b) in edges]
+
+
+def _project(pts, ax, ay):
+    low = high = (pts[0][0] * ax) + (pts[0][1] * ay)
+    for (x, y) in pts:
+        dot = (x * ax) + (y * ay)
+        if dot < low:
+            low = dot
+        elif dot > high:
+            high = dot
+    return (low, high)
+
+
+def _support(pts, direction):
+    """
+    Point of the shape the furthest along the direction
+    """
+    return max(pts, key=lambda pt: (pt[0] * direction[0]) +
+               (pt[1] * direction[1]))
+
+
+def check(pts_a, pts_b):
+    """
+    Separating axis test. Returns (contact, gap): a Contact and 0 if the
+    shapes overlap, or None and a gap between them if they don't. The gap
+    is never bigger than the actual distance between the shapes.
+    Shapes touching each other overlap (depth = 0).
+    """
+    (center_a, radius_a) = get_bounding_circle(pts_a)
+    (center_b, radius_b) = get_bounding_circle(pts_b)
+    (dx, dy) = (center_a[0] - center_b[0], center_a[1] - center_b[1])
+    dist_sq = (dx * dx) + (dy * dy)
+    if dist_sq > (radius_a + radius_b) ** 2:
+        return (None, math.sqrt(dist_sq) - radius_a - radius_b)
+
+    best = None
+    for (owner, axes) in ((pts_a, get_axes(pts_a)), (pts_b, get_axes(pts_b))):
+        for (ax, ay) in axes:
+            length = math.hypot(ax, ay)
+            if length == 0:
+                # degenerated edge
+                continue
+            (ax, ay) = (ax / length, ay / length)
+            (min_a, max_a) = _project(pts_a, ax, ay)
+            (min_b, max_b) = _project(pts_b, ax, ay)
+            if max_a < min_b or max_b < min_a:
+                # separating axis: the gap along it is enough
+                return (None, max(min_b - max_a, min_a - max_b))
+            depth = min(max_a - min_b, max_b - min_a)
+            if best is None or depth < best[0]:
+                best = (depth, (ax, ay), owner)
+
+    if best is None:
+        return (None, 0.0)
+    (depth, normal, owner) = best
+    if (dx * normal[0]) + (dy * normal[1]) < 0:
+        normal = (-normal[0], -normal[1])
+    if owner is pts_b:
+        # a vertex of 'a' went through an edge of 'b'
+        point = _support(pts_a, (-normal[0], -normal[1]))
+    else:
+        point = _support(pts_b, normal)
+    return (Contact(normal=normal, depth=depth, point=point), 0.0)
+
+
+def get_contact(pts_a, pts_b):
+    """
+    Returns a Contact, or None if the shapes don't overlap. See check().
+    """
+    return check(pts_a, pts_b)[0]
+
+
+def get_segment_normal(segment, position):
+    """
+    Unit normal of the segment, on the side of 'position'
+    """
+    ((x0, y0), (x1, y1)) = segment
+    normal = (y0 - y1, x1 - x0)
+    length = math.hypot(normal[0], normal[1])
+    if length == 0:
+        return (0.0, 0.0)
+    normal = (normal[0] / length, normal[1] / length)
+    side = ((position[0] - x0) * normal[0]) + ((position[1] - y0) * normal[1])
+    if side < 0:
+        normal = (-normal[0], -normal[1])
+    return normal
+
+
+def get_max_move(pts_a, pts_b):
+    """
+    Largest distance between the points of 2 positions of the same shape.
+    None of the points of the shape moved further than that.
+    """
+    if pts_a is pts_b:
+        return 0.0
+    if len(pts_a) != len(pts_b):
+        return math.inf
+    move_sq = 0.0
+    for ((xa, ya), (xb, yb)) in zip(pts_a, pts_b):
+        dist_sq = ((xb - xa) * (xb - xa)) + ((yb - ya) * (yb - ya))
+        if dist_sq > move_sq:
+            move_sq = dist_sq
+    return math.sqrt(move_sq)
+
+
+CachedPair = collections.namedtuple(
+    typename="cached_pair",
+    field_names=(
+        "tick",  # last tick on which the pair was looked at
+        "pts",  # shapes when the pair was last tested
+        "obstacle_pts",
+        "contact",  # None if they were separated
+        "gap",
+    ),
+)
+
+
+class ContactCache(object):
+    """
+    Results of the narrow phase, kept from one tick to the next and keyed
+    by (moving object, obstacle, segment). The segment is None when the
+    whole obstacle is tested.
+
+    Objects move only by a few pixels per tick, so:
+    - pairs that were in contact are re-tested first (warm start): the
+      queries that only need one collision often stop there;
+    - pairs that were separated can't touch until the shapes moved by more
+      than the gap between them: they are not tested again until then.
+
+    Pairs not looked at during a whole tick are dropped.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self.pairs = {}  # moving --> {(obstacle, segment): CachedPair}
+
+        # metrics, since the last new_tick()
+        self.nb_hits = 0  # answered from the cache, or contact confirmed
+        self.nb_misses = 0  # pair unknown, or moved too much
+        self.nb_drops = 0  # contacts that disappeared
+
+    def __len__(self):
+        return sum(len(pairs) for pairs in self.pairs.values())
+
+    def new_tick(self):
+        self.tick += 1
+        oldest = self.tick - 1
+        for (moving, pairs) in list(self.pairs.items()):
+            for (key, pair) in list(pairs.items()):
+                if pair.tick < oldest:
+                    del pairs[key]
+            if len(pairs) <= 0:
+                del self.pairs[moving]
+        self.nb_hits = 0
+        self.nb_misses = 0
+        self.nb_drops = 0
+
+    def forget(self, moving):
+        self.pairs.pop(moving, None)
+
+    def get_contacts(self, moving):
+        """
+        (obstacle, segment) of the pairs that were in contact the last time
+        they were tested
+        """
+        pairs = self.pairs.get(moving)
+        if pairs is None:
+            return []
+        return [key for (key, pair) in pairs.items()
+                if pair.contact is not None]
+
+    def check(self, moving, pts, obstacle, segment, obstacle_pts):
+        """
+        Same as get_contact(pts, obstacle_pts), using the cache when
+        possible
+        """
+        key = (obstacle, segment)
+        try:
+            pairs = self.pairs[moving]
+        except KeyError:
+            pairs = self.pairs[moving] = {}
+        pair = pairs.get(key)
+
+        if pair is not None and pair.contact is None:
+            move = (get_max_move(pair.pts, pts) +
+                    get_max_move(pair.obstacle_pts, obstacle_pts))
+            if move < pair.gap:
+                # still separated: keep the shapes the gap applies to
+                self.nb_hits += 1
+                pairs[key] = pair._replace(tick=self.tick)
+                return None
+
+        (contact, gap) = check(pts, obstacle_pts)
+        if pair is not None and pair.contact is not None:
+            if contact is not None:
+                self.nb_hits += 1
+            else:
+                self.nb_drops += 1
+        else:
+            self.nb_misses += 1
+        pairs[key] = CachedPair(
+            tick=self.tick, pts=pts, obstacle_pts=obstacle_pts,
+            contact=contact, gap=gap,
+        )
+        return contact
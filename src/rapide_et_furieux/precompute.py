@@ -7,10 +7,13 @@ import math
 import sys
 import threading
 
+import numpy
 import pygame
 
 from . import assets
+from . import geometry
 from . import util
+from .clearance import ClearanceField
 from .gfx import ui
 from .gfx.cars import ai
 from .gfx.racetrack import RaceTrack
@@ -35,6 +38,20 @@ MIN_DISTANCE_FROM_WAYPOINTS = assets.TILE_SIZE[0] / 4
 MIN_DISTANCE_FROM_PATHS = assets.TILE_SIZE[0] / 8
 
 
+def get_border_distances(positions, clearance):
+    """
+    Square distance from each position to its closest border
+    """
+    return clearance.get_clearances(positions) ** 2
+
+
+def get_path_border_distances(segments, clearance):
+    """
+    Square distance from each segment to its closest border
+    """
+    return clearance.get_segment_clearances(segments) ** 2
+
+
 class FindAllWaypointsThread(threading.Thread):
     def __init__(self, racetrack, ret_cb):
         super().__init__()
@@ -146,9 +163,19 @@ class DropUselessWaypoints(threading.Thread):
         for wpt in wpts:
             wpt.score = self.score_wpt(wpt)
 
-        borders = self.racetrack.borders
         m_border = MIN_DISTANCE_FROM_BORDERS ** 2
         m_waypoint = MIN_DISTANCE_FROM_WAYPOINTS ** 2
+
+        # drop all the waypoints on a border or close to it
+        all_wpts = list(wpts)
+        border_dists = get_border_distances(
+            [wpt.position for wpt in all_wpts], self.racetrack.clearance
+        )
+        too_close = {
+            wpt for (wpt, dist) in zip(all_wpts, border_dists)
+            if dist < m_border
+        }
+
         removed = set()
         for wpt in set(wpts):
             if wpt.checkpoint is not None:
@@ -158,18 +185,7 @@ class DropUselessWaypoints(threading.Thread):
             if wpt in removed:
                 continue
 
-            keep = True
-            for border in borders:
-                # drop all the waypoints on a border
-                if wpt.position in border.pts:
-                    keep = False
-                    break
-                # or close to it
-                dist = util.distance_sq_pt_to_segment(border.pts, wpt.position)
-                if dist < m_border:
-                    keep = False
-                    break
-            if not keep:
+            if wpt in too_close:
                 removed.add(wpt)
                 try:
                     wpts.remove(wpt)
@@ -226,7 +242,9 @@ class FindReachableWaypointsThread(threading.Thread):
             if wpt.reachable:
                 to_examine.add(wpt)
 
-        borders = self.racetrack.borders
+        clearance = self.racetrack.clearance
+        all_wpts = list(wpts)
+        positions = geometry.to_points([wpt.position for wpt in all_wpts])
 
         print("Looking for reachable waypoints ...")
 
@@ -234,6 +252,7 @@ class FindReachableWaypointsThread(threading.Thread):
         current = 0
         m_border = MIN_DISTANCE_FROM_BORDERS ** 2
         m_path = MIN_DISTANCE_FROM_PATHS ** 2
+        update = None
 
         while RUNNING:
             try:
@@ -244,44 +263,32 @@ class FindReachableWaypointsThread(threading.Thread):
                 origin, current, nb_wpts
             ))
 
-            new_paths = []
-            for dest in wpts:
-                if origin is dest:
-                    continue
+            # all the paths from this origin at once
+            origin_idx = all_wpts.index(origin)
+            segments = numpy.hstack((
+                numpy.broadcast_to(positions[origin_idx], positions.shape),
+                positions
+            ))
 
-                # drop path too close to borders
-                keep = True
-                m_dist = 0xFFFFFFFF
-                for border in borders:
-                    dist = util.distance_sq_segment_to_segment(
-                        (origin.position, dest.position),
-                        border.pts
-                    )
-                    m_dist = min(m_dist, dist)
-                    if dist < m_border:
-                        # car won't be able to follow this path easily
-                        # (or at all if the path goes through a border)
-                        keep = False
-                        break
-                if not keep:
-                    continue
+            # drop path too close to borders: car won't be able to follow
+            # them easily (or at all if the path goes through a border)
+            m_dists = get_path_border_distances(segments, clearance)
+            candidates = numpy.flatnonzero(m_dists >= m_border)
+            candidates = candidates[candidates != origin_idx]
 
-                # drop paths too close to other waypoints
-                for wpt in wpts:
-                    if wpt is origin or wpt is dest:
-                        continue
-                    dist = util.distance_sq_pt_to_segment(
-                        (origin.position, dest.position),
-                        wpt.position
-                    )
-                    if dist < m_path:
-                        # no point in having similar path twice
-                        keep = False
-                        break
-                if not keep:
-                    continue
+            # drop paths too close to other waypoints: no point in having
+            # similar path twice
+            wpt_dists = geometry.distance_sq_pts_to_segments(
+                positions, segments[candidates]
+            )
+            wpt_dists[origin_idx, :] = numpy.inf
+            wpt_dists[candidates, numpy.arange(len(candidates))] = numpy.inf
+            candidates = candidates[(wpt_dists >= m_path).all(axis=0)]
 
-                path = ai.Path(origin, dest, m_dist)
+            new_paths = []
+            for dest_idx in candidates:
+                path = ai.Path(origin, all_wpts[dest_idx],
+                               float(m_dists[dest_idx]))
                 path.compute_score_length()
                 new_paths.append(path)
             if len(new_paths) <= 0:
@@ -302,9 +309,11 @@ class FindReachableWaypointsThread(threading.Thread):
             print("{} new paths found (max {} kept)".format(
                 kept, self.MAX_PATHS_BY_PT)
             )
-            if kept > 0:
-                util.idle_add(self.update_cb, wpts, paths,
-                              current, len(to_examine), nb_wpts)
+            # no need to queue another update if the main loop hasn't
+            # run the previous one yet
+            if kept > 0 and (update is None or update.done):
+                update = util.idle_add(self.update_cb, wpts, paths,
+                                       current, len(to_examine), nb_wpts)
             current += 1
 
         print("Done. Got {} waypoints and {} paths".format(
@@ -324,21 +333,18 @@ class ComputeScoreThread(threading.Thread):
         self.ret_cb = ret_cb
 
     def run(self):
-        borders = self.racetrack.borders
+        clearance = self.racetrack.clearance
         wpts = self.waypoints
         paths = self.paths
 
         print("Computing {} waypoint scores ...".format(len(wpts)))
 
-        for wpt in wpts:
-            if not wpt.reachable:
-                continue
-            score = 0xFFFFFFFF
-            for border in borders:
-                score = min(
-                    score,
-                    util.distance_sq_pt_to_segment(border.pts, wpt.position)
-                )
+        reachables = [wpt for wpt in wpts if wpt.reachable]
+        scores = get_border_distances(
+            [wpt.position for wpt in reachables], clearance
+        )
+        for (wpt, score) in zip(reachables, scores):
+            score = float(score)
             terrain = self.racetrack.get_terrain(wpt.position)
             if terrain != 'normal':
                 score = math.sqrt(score)
@@ -348,16 +354,13 @@ class ComputeScoreThread(threading.Thread):
 
         print("Computing {} path scores ...".format(len(paths)))
 
-        for path in paths:
-            score = 0xFFFFFFFF
-            for border in borders:
-                score = min(
-                    score,
-                    util.distance_sq_segment_to_segment(
-                        border.pts, (path.a.position, path.b.position)
-                    )
-                )
-            path.score = score
+        all_paths = list(paths)
+        scores = get_path_border_distances(
+            [(path.a.position, path.b.position) for path in all_paths],
+            clearance
+        )
+        for (path, score) in zip(all_paths, scores):
+            path.score = float(score)
 
         print("Done")
         util.idle_add(self.ret_cb, wpts, paths)
@@ -384,7 +387,6 @@ class Precomputing(object):
         util.register_drawer(OSD_LAYER, self.osd_message)
         util.register_drawer(BACKGROUND_LAYER, self.background)
         util.register_drawer(OSD_LAYER - 1, fps_counter)
-        util.register_animator(fps_counter.on_frame)
         util.register_event_listener(self.on_key)
         util.register_event_listener(self.on_mouse_motion)
         util.register_animator(self.scroll)
@@ -396,13 +398,20 @@ class Precomputing(object):
 
     def _load(self):
         assets.load_resources()
+        yield
         with open(self.filepath, 'r') as fd:
             data = json.load(fd)
+        yield
         game_settings = util.GAME_SETTINGS_TEMPLATE
         game_settings.update(data['game_settings'])
         self.race_track = RaceTrack(grid_margin=0, debug=True,
                                     game_settings=game_settings)
         self.race_track.unserialize(data['race_track'])
+        yield
+        self.race_track.collisions.precompute_static()
+        self.race_track.clearance = ClearanceField.load_or_build(
+            self.filepath, self.race_track.collisions.borders
+        )
         util.register_drawer(RACE_TRACK_LAYER, self.race_track)
         self.waypoint_mgmt = ai.WaypointManager(game_settings, self.race_track)
         util.register_drawer(WAYPOINTS_LAYER, self.waypoint_mgmt)
@@ -523,9 +532,12 @@ class Precomputing(object):
         self.osd_message.show("All done")
         with open(self.filepath, 'r') as fd:
             data = json.load(fd)
+        yield
         data['ia'] = self.waypoint_mgmt.serialize()
+        yield
         with open(self.filepath, 'w') as fd:
-            json.dump(data, fd, indent=4, sort_keys=True)
+            yield from util.json_dump_steps(data, fd, indent=4,
+                                            sort_keys=True)
         print("All Done")
 
 
@@ -0,0 +1,186 @@
+import collections
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tempfile
+import time
+import types
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_group(func):
+    """
+    Name under which a callable is accounted: its owning class and its name
+    (all the cars share the same group)
+    """
+    obj = getattr(func, '__self__', None)
+    if isinstance(obj, types.ModuleType):
+        return "{}.{}".format(obj.__name__, func.__name__)
+    if obj is not None:
+        return "{}.{}".format(type(obj).__name__, func.__name__)
+    return getattr(func, '__qualname__', repr(func))
+
+
+def get_drawer_group(drawer):
+    return "{}.draw".format(type(drawer).__name__)
+
+
+class FrameProfiler(object):
+    """
+    Measure the time spent in each animator, drawer and event listener,
+    grouped by owning class, and keep the per-frame totals of the last frames
+    to compute percentiles.
+
+    Some expensive sub-steps are measured too (see util.profiled()). Their
+    time is also included in the time of their caller.
+    """
+    HISTORY = 300  # frames
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, history=HISTORY):
+        self.history_length = history
+        # group --> time spent in the current frame
+        self.current = collections.defaultdict(float)
+        # group --> per-frame times (seconds)
+        self.history = {}
+        self.frame_times = collections.deque(maxlen=history)
+        self.nb_frames = 0
+        self.group_cache = {}
+        # name --> formatted value (queue depths, cache hit rates, ...)
+        self.gauges = {}
+
+        self.cprofile = None
+        self.cprofile_remaining = 0
+        self.cprofile_filepath = None
+
+    def get_group_cached(self, func):
+        obj = getattr(func, '__self__', None)
+        key = (type(obj), getattr(func, '__func__', func))
+        try:
+            return self.group_cache[key]
+        except KeyError:
+            group = get_group(func)
+            self.group_cache[key] = group
+            return group
+
+    def call(self, func, *args, **kwargs):
+        start = time.perf_counter()
+        r = func(*args, **kwargs)
+        group = self.get_group_cached(func)
+        self.current[group] += time.perf_counter() - start
+        return r
+
+    def draw(self, drawer, screen):
+        start = time.perf_counter()
+        drawer.draw(screen)
+        group = self.group_cache.get(type(drawer))
+        if group is None:
+            group = get_drawer_group(drawer)
+            self.group_cache[type(drawer)] = group
+        self.current[group] += time.perf_counter() - start
+
+    def add(self, group, duration):
+        self.current[group] += duration
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def begin_frame(self):
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    def end_frame(self, frame_time):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile_remaining -= 1
+            if self.cprofile_remaining <= 0:
+                self._write_cprofile()
+
+        self.nb_frames += 1
+        self.frame_times.append(frame_time)
+        for group in self.current:
+            if group not in self.history:
+                history = collections.deque(maxlen=self.history_length)
+                # group didn't exist in the previous frames
+                history.extend([0.0] * min(self.nb_frames - 1,
+                                           self.history_length))
+                self.history[group] = history
+        for (group, history) in self.history.items():
+            history.append(self.current.get(group, 0.0))
+        self.current.clear()
+
+    @staticmethod
+    def _get_percentiles(values, percentiles):
+        values = sorted(values)
+        if len(values) <= 0:
+            return tuple(0.0 for p in percentiles)
+        return tuple(
+            values[min(len(values) - 1, int(len(values) * p / 100))]
+            for p in percentiles
+        )
+
+    def get_frame_percentiles(self):
+        return self._get_percentiles(self.frame_times, self.PERCENTILES)
+
+    def get_breakdown(self):
+        """
+        Returns [(group, (p50, p95, p99)), ...], worst p95 first.
+        """
+        breakdown = [
+            (group, self._get_percentiles(history, self.PERCENTILES))
+            for (group, history) in self.history.items()
+        ]
+        breakdown.sort(key=lambda x: x[1][1], reverse=True)
+        return breakdown
+
+    def format_breakdown(self, limit=None):
+        (p50, p95, p99) = self.get_frame_percentiles()
+        lines = [
+            "{:<40} {:>7} {:>7} {:>7}".format("(ms)", "p50", "p95", "p99"),
+            "{:<40} {:>7.2f} {:>7.2f} {:>7.2f}".format(
+                "frame", p50 * 1000, p95 * 1000, p99 * 1000
+            ),
+        ]
+        breakdown = self.get_breakdown()
+        if limit is not None:
+            breakdown = breakdown[:limit]
+        for (group, (p50, p95, p99)) in breakdown:
+            lines.append("{:<40} {:>7.2f} {:>7.2f} {:>7.2f}".format(
+                group[:40], p50 * 1000, p95 * 1000, p99 * 1000
+            ))
+        return lines
+
+    def format_gauges(self):
+        return [
+            "{:<40} {:>23}".format(name[:40], str(value))
+            for (name, value) in sorted(self.gauges.items())
+        ]
+
+    def dump_cprofile(self, nb_frames, filepath=None):
+        """
+        Run cProfile on the next 'nb_frames' frames and write the pstats
+        to 'filepath'.
+        """
+        if filepath is None:
+            filepath = os.path.join(
+                tempfile.gettempdir(),
+                "rapide_et_furieux-{}.pstats".format(int(time.time()))
+            )
+        self.cprofile = cProfile.Profile()
+        self.cprofile_remaining = nb_frames
+        self.cprofile_filepath = filepath
+
+    def _write_cprofile(self):
+        self.cprofile.dump_stats(self.cprofile_filepath)
+        out = io.StringIO()
+        stats = pstats.Stats(self.cprofile, stream=out)
+        stats.sort_stats('cumulative').print_stats(15)
+        logger.info("cProfile stats written to %s", self.cprofile_filepath)
+        for line in out.getvalue().split("\n"):
+            if line.strip() != "":
+                logger.info(line)
+        self.cprofile = None
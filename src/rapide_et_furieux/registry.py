@@ -0,0 +1,155 @@
+import bisect
+
+
+class Handle(object):
+    """
+    Returned when registering something. Unregistering with the handle
+    is O(1).
+    """
+    __slots__ = ('value', 'owner', 'alive')
+
+    def __init__(self, value, owner):
+        self.value = value
+        self.owner = owner
+        self.alive = True
+
+    def __repr__(self):
+        return "Handle({}, alive={})".format(self.value, self.alive)
+
+
+class Registry(object):
+    """
+    Ordered collection of callbacks (animators, event listeners, ...).
+
+    Unregistering only marks the handle as dead. Dead handles are skipped
+    when iterating and are removed ("compacted") when an iteration begins
+    and they outnumber the living ones. So callbacks can register or
+    unregister anything (including themselves) while we iterate:
+    - an unregistered callback that hasn't been called yet won't be called
+    - a callback registered during an iteration will only be called by the
+      next one
+    """
+    MIN_DEAD_TO_COMPACT = 32
+
+    def __init__(self):
+        self.entries = []
+        # value --> [handle, ...] (the same value may be registered twice)
+        self.handles = {}
+        self.nb_dead = 0
+
+    def register(self, value):
+        handle = Handle(value, self)
+        self.entries.append(handle)
+        try:
+            self.handles[value].append(handle)
+        except KeyError:
+            self.handles[value] = [handle]
+        return handle
+
+    def unregister(self, handle_or_value):
+        """
+        Accepts either the handle returned by register() or the registered
+        value itself (in which case, its oldest registration is removed).
+        Raises KeyError if it is not registered.
+        """
+        if isinstance(handle_or_value, Handle):
+            handle = handle_or_value
+            if not handle.alive or handle.owner is not self:
+                raise KeyError("Unknown handle: {}".format(handle))
+            handles = self.handles[handle.value]
+            handles.remove(handle)
+        else:
+            handles = self.handles[handle_or_value]
+            handle = handles.pop(0)
+        if len(handles) <= 0:
+            del self.handles[handle.value]
+        handle.alive = False
+        self.nb_dead += 1
+
+    def __contains__(self, value):
+        return value in self.handles
+
+    def __len__(self):
+        return len(self.entries) - self.nb_dead
+
+    def compact(self):
+        if self.nb_dead <= 0:
+            return
+        # we build a new list instead of updating the current one: iterations
+        # in progress keep going on the old one
+        self.entries = [handle for handle in self.entries if handle.alive]
+        self.nb_dead = 0
+
+    def _prepare_iteration(self):
+        if (self.nb_dead >= self.MIN_DEAD_TO_COMPACT and
+                self.nb_dead >= len(self.entries) - self.nb_dead):
+            self.compact()
+        return self.entries
+
+    def __iter__(self):
+        """
+        Registration order
+        """
+        # the copy is cheap and hides the callbacks registered meanwhile
+        for handle in self._prepare_iteration()[:]:
+            if handle.alive:
+                yield handle.value
+
+    def __reversed__(self):
+        """
+        Reversed registration order
+        """
+        # callbacks registered meanwhile are appended: reversed() never
+        # reaches them
+        for handle in reversed(self._prepare_iteration()):
+            if handle.alive:
+                yield handle.value
+
+
+class LayeredRegistry(object):
+    """
+    Registry of drawers: one bucket (Registry) per layer. Iterates over the
+    layers in increasing order, and in each layer in registration order.
+    """
+
+    def __init__(self):
+        self.layers = {}  # layer --> Registry
+        self.sorted_layers = []
+
+    def register(self, layer, value):
+        try:
+            bucket = self.layers[layer]
+        except KeyError:
+            bucket = Registry()
+            self.layers[layer] = bucket
+            bisect.insort(self.sorted_layers, layer)
+        return bucket.register(value)
+
+    def unregister(self, handle_or_value):
+        if isinstance(handle_or_value, Handle):
+            handle_or_value.owner.unregister(handle_or_value)
+            return
+        # there are only a few layers
+        for layer in self.sorted_layers:
+            bucket = self.layers[layer]
+            if handle_or_value in bucket:
+                bucket.unregister(handle_or_value)
+                return
+        raise KeyError("Unknown drawer: {}".format(handle_or_value))
+
+    def __contains__(self, value):
+        for bucket in self.layers.values():
+            if value in bucket:
+                return True
+        return False
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.layers.values())
+
+    def __iter__(self):
+        """
+        Returns (layer, value)
+        """
+        for layer in list(self.sorted_layers):
+            for value in self.layers[layer]:
+                yield (layer, value)
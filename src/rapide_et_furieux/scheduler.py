@@ -0,0 +1,152 @@
+import collections
+import heapq
+import itertools
+import threading
+import time
+import types
+
+
+PRIORITY_HIGH = 0
+PRIORITY_DEFAULT = 50
+PRIORITY_LOW = 100
+
+
+class Task(object):
+    __slots__ = ('priority', 'seq', 'action', 'args', 'kwargs', 'generator',
+                 'added', 'done')
+
+    def __init__(self, priority, seq, action, args, kwargs):
+        self.priority = priority
+        self.seq = seq
+        self.action = action
+        self.args = args
+        self.kwargs = kwargs
+        self.generator = None
+        self.added = time.perf_counter()
+        self.done = False
+
+    def __lt__(self, o):
+        return (self.priority, self.seq) < (o.priority, o.seq)
+
+
+class Scheduler(object):
+    """
+    Runs the idle callbacks, a few of them on each frame, within a time
+    budget.
+
+    Tasks are run by priority (lowest value first), and in the order they
+    were added for a given priority.
+
+    If a task returns a generator, the generator is run one step at a time,
+    until it is exhausted. A task that yields keeps its place in the queue:
+    it is resumed before the tasks of same priority added after it (so
+    'load the assets, then load the map' keeps working), but tasks with an
+    higher priority may run between its steps.
+
+    At least one step is run on each frame, even if it exceeds the budget.
+
+    Tasks may be added from other threads.
+    """
+    DEFAULT_BUDGET = 0.004  # seconds per frame
+    LATENCY_HISTORY = 256  # tasks
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.queue = []  # heap
+        self.seq = itertools.count()
+        self.lock = threading.Lock()
+
+        # metrics
+        # time between the moment a task was added and its first step
+        self.latencies = collections.deque(maxlen=self.LATENCY_HISTORY)
+        self.nb_steps = 0
+        self.nb_done = 0
+        self.last_run_time = 0.0
+
+    def add(self, priority, action, *args, **kwargs):
+        task = Task(priority, next(self.seq), action, args, kwargs)
+        with self.lock:
+            heapq.heappush(self.queue, task)
+        return task
+
+    def __len__(self):
+        return len(self.queue)
+
+    def _step(self, task):
+        """
+        Returns True if the task is done
+        """
+        if task.generator is None:
+            self.latencies.append(time.perf_counter() - task.added)
+            r = task.action(*task.args, **task.kwargs)
+            if not isinstance(r, types.GeneratorType):
+                return True
+            task.generator = r
+        try:
+            next(task.generator)
+        except StopIteration:
+            return True
+        return False
+
+    def _profiled_step(self, profiler, task):
+        start = time.perf_counter()
+        r = self._step(task)
+        profiler.add(profiler.get_group_cached(task.action),
+                     time.perf_counter() - start)
+        return r
+
+    def run(self, budget=None, profiler=None):
+        """
+        Run tasks until the queue is empty or the budget (seconds) is
+        exhausted.
+        """
+        if budget is None:
+            budget = self.budget
+        start = time.perf_counter()
+        deadline = start + budget
+        now = start
+        while True:
+            with self.lock:
+                if len(self.queue) <= 0:
+                    break
+                task = heapq.heappop(self.queue)
+            done = True  # if it raises an exception, we drop it
+            try:
+                if profiler is None:
+                    done = self._step(task)
+                else:
+                    done = self._profiled_step(profiler, task)
+            finally:
+                self.nb_steps += 1
+                if done:
+                    task.done = True
+                    self.nb_done += 1
+                else:
+                    # keeps its place in the queue (same priority and seq)
+                    with self.lock:
+                        heapq.heappush(self.queue, task)
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+        self.last_run_time = now - start
+
+    def get_latency_percentiles(self, percentiles=(50, 95, 99)):
+        latencies = sorted(self.latencies)
+        if len(latencies) <= 0:
+            return tuple(0.0 for p in percentiles)
+        return tuple(
+            latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+            for p in percentiles
+        )
+
+    def get_stats(self):
+        (p50, p95, p99) = self.get_latency_percentiles()
+        return {
+            'depth': len(self.queue),
+            'steps': self.nb_steps,
+            'done': self.nb_done,
+            'latency_p50': p50,
+            'latency_p95': p95,
+            'latency_p99': p99,
+            'last_run_time': self.last_run_time,
+        }
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import random
+
+import pygame
+
+from . import assets
+from . import profiler
+from . import sounds
+from . import util
+from .gfx.bonuses import BonusGenerator
+from .gfx.cars.ai import IACar
+from .gfx.cars.ai import WaypointManager
+from .gfx.racetrack import RaceTrack
+from .gfx.weapons.common import load_explosions
+
+
+CAPTION = "Rapide et Furieux {} - Simulation".format(util.VERSION)
+
+# we don't need any window or any sound card
+SDL_DRIVERS = {
+    'SDL_VIDEODRIVER': 'dummy',
+    'SDL_AUDIODRIVER': 'dummy',
+}
+SCREEN_SIZE = (1280, 720)
+
+logger = logging.getLogger(__name__)
+
+
+class Simulation(object):
+    """
+    Run a race with AI cars only, without display and without waiting for the
+    wall clock. Report how many simulated seconds we run per wall second.
+    """
+    REPORT_INTERVAL = 10.0  # simulated seconds
+
+    def __init__(self, track_filepath, nb_cars, duration):
+        self.track_filepath = track_filepath
+        self.nb_cars = nb_cars
+        self.duration = duration
+
+        self.game_settings = util.GAME_SETTINGS_TEMPLATE
+        self.race_track = None
+
+        self.sim_start = None
+        self.wall_start = None
+        self.next_report = self.REPORT_INTERVAL
+
+    def load(self):
+        logger.info("Loading '%s' ...", self.track_filepath)
+        util.idle_add(self._load)
+
+    def _load(self):
+        assets.load_resources()
+        load_explosions()
+        yield
+
+        with open(self.track_filepath, 'r') as fd:
+            data = json.load(fd)
+        self.game_settings.update(data['game_settings'])
+        self.race_track = RaceTrack(grid_margin=0,
+                                    game_settings=self.game_settings)
+        self.race_track.unserialize(data['race_track'])
+        yield
+        self.race_track.collisions.precompute_static()
+        yield
+
+        waypoint_mgmt = WaypointManager.unserialize(
+            data['ia'], self.game_settings, self.race_track
+        )
+        yield
+        waypoint_mgmt.optimize(self.race_track)
+        yield
+
+        bonus = BonusGenerator(self.race_track, self.game_settings,
+                               waypoint_mgmt)
+        util.register_animator(bonus.add_bonus)
+        util.register_animator(self.race_track.collisions.update_pairs)
+
+        spawn_points = list(self.race_track.tiles.get_spawn_points())
+        if self.nb_cars > len(spawn_points):
+            logger.warning("Only %d spawn points for %d cars",
+                           len(spawn_points), self.nb_cars)
+        iter_car_rsc = iter(itertools.cycle(assets.CARS))
+        iter_spawn_point = iter(itertools.cycle(spawn_points))
+        for _ in range(0, self.nb_cars):
+            (spawn_point, orientation) = next(iter_spawn_point)
+            car = IACar(next(iter_car_rsc), self.race_track,
+                        self.game_settings, spawn_point, orientation,
+                        waypoint_mgmt=waypoint_mgmt)
+            self.race_track.add_car(car)
+            util.register_animator(car.move)
+
+        self.race_track.start_race()
+        assets.set_race_started(True)
+
+        self.sim_start = util.sim_time()
+        self.wall_start = util.clock()
+        util.register_animator(self.report)
+        logger.info("Done. Running %d cars for %.1f simulated seconds",
+                    self.nb_cars, self.duration)
+
+    def get_ratio(self):
+        sim = util.sim_time() - self.sim_start
+        wall = util.clock() - self.wall_start
+        if wall <= 0:
+            return (sim, wall, 0.0)
+        return (sim, wall, sim / wall)
+
+    def report(self, frame_interval):
+        (sim, wall, ratio) = self.get_ratio()
+        if sim >= self.next_report:
+            logger.info("%.1f simulated seconds in %.1fs (x%.1f)",
+                        sim, wall, ratio)
+            self.next_report += self.REPORT_INTERVAL
+        if sim >= self.duration:
+            util.exit()
+
+
+def main():
+    util.init_logging()
+
+    parser = argparse.ArgumentParser(description=CAPTION)
+    parser.add_argument("track", help="race track (.map)")
+    parser.add_argument("-n", "--cars", type=int, default=8,
+                        help="number of AI cars")
+    parser.add_argument("-d", "--duration", type=float, default=60.0,
+                        help="simulated seconds to run")
+    parser.add_argument("-t", "--tick-rate", type=int, default=util.TICK_RATE,
+                        help="simulation ticks per simulated second")
+    parser.add_argument("-s", "--seed", type=int, default=None,
+                        help="random seed")
+    parser.add_argument("-p", "--profile", action="store_true",
+                        help="report the time spent in each subsystem")
+    parser.add_argument("--disk-access",
+                        choices=(assets.DISK_ACCESS_CHECK_LOG,
+                                 assets.DISK_ACCESS_CHECK_RAISE),
+                        default=None,
+                        help="log or fail on files read during the race")
+    args = parser.parse_args()
+
+    logger.info(CAPTION)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    for (k, v) in SDL_DRIVERS.items():
+        os.environ.setdefault(k, v)
+    sounds.pre_init()
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    sounds.init(screen.get_size())
+
+    assets.set_disk_access_check(args.disk_access)
+    if args.profile:
+        util.set_profiler(profiler.FrameProfiler())
+
+    simulation = Simulation(args.track, args.cars, args.duration)
+    simulation.load()
+
+    util.main_loop(screen, tick_rate=args.tick_rate, realtime=False)
+
+    (sim, wall, ratio) = simulation.get_ratio()
+    print("{:.1f} simulated seconds in {:.1f} wall seconds: {:.2f}"
+          " simulated seconds per wall second".format(sim, wall, ratio))
+    if util.g_profiler is not None:
+        print("\n".join(util.g_profiler.format_breakdown()))
+        print("\n".join(util.g_profiler.format_gauges()))
+
+
+if __name__ == "__main__":
+    main()
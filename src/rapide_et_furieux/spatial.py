@@ -0,0 +1,123 @@
+"""
+Spatial hash for moving objects (cars, ...)
+"""
+
+import math
+
+from . import util
+
+
+class SpatialHash(object):
+    """
+    Grid of square cells. Each object is only stored in the cell containing
+    its position. Queries look at the neighbour cells instead.
+
+    Moving an object is a dict lookup, and the object only changes of
+    cell when it crosses a cell boundary. Adding and removing are O(1).
+
+    Queries filter on the positions given to add() and update().
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}  # (x, y) --> {obj, ...}
+        self.objects = {}  # obj --> (x, y)
+        self.positions = {}  # obj --> position
+
+        # metrics
+        self.nb_moves = 0  # number of cell changes
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, obj):
+        return obj in self.objects
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def get_cell(self, position):
+        return (
+            math.floor(position[0] / self.cell_size),
+            math.floor(position[1] / self.cell_size),
+        )
+
+    def _insert(self, obj, cell):
+        self.objects[obj] = cell
+        try:
+            self.cells[cell].add(obj)
+        except KeyError:
+            self.cells[cell] = {obj}
+
+    def _remove(self, obj, cell):
+        objs = self.cells[cell]
+        objs.remove(obj)
+        if len(objs) <= 0:
+            del self.cells[cell]
+
+    def add(self, obj, position):
+        if obj in self.objects:
+            raise KeyError("Already in the spatial hash: {}".format(obj))
+        self._insert(obj, self.get_cell(position))
+        self.positions[obj] = position
+
+    def remove(self, obj):
+        cell = self.objects.pop(obj)
+        del self.positions[obj]
+        self._remove(obj, cell)
+
+    def update(self, obj, position):
+        """
+        Returns True if the object changed of cell
+        """
+        self.positions[obj] = position
+        cell = self.get_cell(position)
+        previous = self.objects[obj]
+        if cell == previous:
+            return False
+        self._remove(obj, previous)
+        self._insert(obj, cell)
+        self.nb_moves += 1
+        return True
+
+    def query_cells(self, cell, nb_cells=1):
+        """
+        Objects in the square of cells around 'cell' (included),
+        'nb_cells' cells in each direction.
+        """
+        (cx, cy) = cell
+        for x in range(cx - nb_cells, cx + nb_cells + 1):
+            for y in range(cy - nb_cells, cy + nb_cells + 1):
+                objs = self.cells.get((x, y))
+                if objs is not None:
+                    yield from objs
+
+    def query_radius(self, position, radius):
+        """
+        Objects at a distance <= radius from the position
+        """
+        radius_sq = radius * radius
+        nb_cells = math.ceil(radius / self.cell_size)
+        positions = self.positions
+        return [
+            obj for obj in self.query_cells(self.get_cell(position), nb_cells)
+            if util.distance_sq_pt_to_pt(positions[obj], position) <= radius_sq
+        ]
+
+    def query_segment(self, segment, radius=0):
+        """
+        Objects at a distance <= radius from the segment, ordered by the
+        order in which the segment reaches their cells.
+        """
+        radius_sq = radius * radius
+        nb_cells = math.ceil(radius / self.cell_size)
+        positions = self.positions
+        seen = set()
+        for cell in util.raytrace(segment, grid_size=self.cell_size):
+            for obj in self.query_cells(cell, nb_cells):
+                if obj in seen:
+                    continue
+                seen.add(obj)
+                dist = util.distance_sq_pt_to_segment(segment, positions[obj])
+                if dist <= radius_sq:
+                    yield obj
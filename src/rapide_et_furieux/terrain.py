@@ -0,0 +1,179 @@
+"""
+Terrain map: terrain type of any point of the race track.
+
+The terrain comes from the tiles (roads, or off-road land) and from the
+crap areas drawn in the editor (rectangles overriding the tiles). Both are
+rasterized once: each tile gets a single terrain, except the tiles cut by
+a crap area that get a grid of SUBDIVISIONS x SUBDIVISIONS cells. Lookups
+are constant time, whatever the number of crap areas.
+
+Each terrain has its physics (see get_physics_table()), taken from the game
+settings.
+"""
+
+import collections
+import logging
+import math
+
+import numpy
+
+from . import assets
+
+
+logger = logging.getLogger(__name__)
+
+TERRAIN_NORMAL = "normal"
+TERRAIN_CRAP = "crap"
+# the terrain ids used in the raster are the indexes in this list
+TERRAINS = [TERRAIN_NORMAL, TERRAIN_CRAP]
+
+# terrain of a tile, based on the start of its resource name. Tiles not
+# listed here are roads.
+TILE_TERRAINS = [
+    ("dirt.png", TERRAIN_CRAP),
+    ("grass.png", TERRAIN_CRAP),
+    ("sand.png", TERRAIN_CRAP),
+    ("land_", TERRAIN_CRAP),
+    ("road_", TERRAIN_NORMAL),
+]
+# where there is no tile
+DEFAULT_TERRAIN = TERRAIN_NORMAL
+DEFAULT_TERRAIN_ID = TERRAINS.index(DEFAULT_TERRAIN)
+
+(TILE_WIDTH, TILE_HEIGHT) = assets.TILE_SIZE
+
+
+Physics = collections.namedtuple(
+    typename="Physics",
+    field_names=(
+        "acceleration",
+        "braking",
+        "engine_braking",
+        "lateral_speed_slowdown",
+        "steering",
+        "max_speed_forward",
+        "max_speed_reverse",
+    ),
+)
+
+
+def get_physics_table(game_settings):
+    """
+    Returns a dict: terrain --> Physics
+    """
+    return {
+        terrain: Physics(
+            acceleration=game_settings['acceleration'][terrain],
+            braking=game_settings['braking'][terrain],
+            engine_braking=game_settings['engine braking'][terrain],
+            lateral_speed_slowdown=(
+                game_settings['lateral_speed_slowdown'][terrain]
+            ),
+            steering=game_settings['steering'][terrain],
+            max_speed_forward=game_settings['max_speed'][terrain]['forward'],
+            max_speed_reverse=game_settings['max_speed'][terrain]['reverse'],
+        )
+        for terrain in TERRAINS
+    }
+
+
+def get_tile_terrain(resource):
+    name = resource[1]
+    for (prefix, terrain) in TILE_TERRAINS:
+        if name.startswith(prefix):
+            return terrain
+    return TERRAIN_NORMAL
+
+
+class TerrainMap(object):
+    SUBDIVISIONS = 16  # 8 pixels per cell with the current tile size
+
+    def __init__(self, tiles, areas):
+        """
+        tiles: dict (tile_x, tile_y) --> tile resource
+        areas: iterable of crap areas: ((x_min, y_min), (x_max, y_max))
+        """
+        areas = list(areas)
+        (tile_w, tile_h) = assets.TILE_SIZE
+        default = DEFAULT_TERRAIN_ID
+        crap = TERRAINS.index(TERRAIN_CRAP)
+
+        # extent of the raster, in tiles
+        xs = [pos[0] for pos in tiles]
+        ys = [pos[1] for pos in tiles]
+        for (pt_a, pt_b) in areas:
+            xs += [int(pt_a[0] // tile_w), int(pt_b[0] // tile_w)]
+            ys += [int(pt_a[1] // tile_h), int(pt_b[1] // tile_h)]
+        if len(xs) <= 0:
+            (xs, ys) = ([0], [0])
+        self.origin = (min(xs), min(ys))
+        self.size = (max(xs) - self.origin[0] + 1,
+                     max(ys) - self.origin[1] + 1)
+        (self.origin_x, self.origin_y) = self.origin
+        (self.width, self.height) = self.size
+
+        grid = numpy.full((self.size[1], self.size[0]), default,
+                          dtype=numpy.uint8)
+        for (pos, resource) in tiles.items():
+            grid[pos[1] - self.origin[1], pos[0] - self.origin[0]] = \
+                TERRAINS.index(get_tile_terrain(resource))
+
+        # (tile_x, tile_y) --> cells of the tile
+        subgrids = {}
+        sub = self.SUBDIVISIONS
+        cell = (tile_w / sub, tile_h / sub)
+        centers = (numpy.arange(sub) + 0.5)
+        for (pt_a, pt_b) in areas:
+            for tile_y in range(int(pt_a[1] // tile_h),
+                                int(pt_b[1] // tile_h) + 1):
+                for tile_x in range(int(pt_a[0] // tile_w),
+                                    int(pt_b[0] // tile_w) + 1):
+                    (x0, y0) = (tile_x * tile_w, tile_y * tile_h)
+                    (gx, gy) = (tile_x - self.origin[0],
+                                tile_y - self.origin[1])
+                    if (pt_a[0] <= x0 and pt_a[1] <= y0 and
+                            x0 + tile_w <= pt_b[0] and
+                            y0 + tile_h <= pt_b[1]):
+                        # whole tile
+                        grid[gy, gx] = crap
+                        subgrids.pop((gx, gy), None)
+                        continue
+                    if (gx, gy) not in subgrids:
+                        subgrids[(gx, gy)] = numpy.full(
+                            (sub, sub), grid[gy, gx], dtype=numpy.uint8
+                        )
+                    # cells with their center in the area
+                    cxs = x0 + (centers * cell[0])
+                    cys = y0 + (centers * cell[1])
+                    in_x = (pt_a[0] <= cxs) & (cxs <= pt_b[0])
+                    in_y = (pt_a[1] <= cys) & (cys <= pt_b[1])
+                    subgrids[(gx, gy)][numpy.outer(in_y, in_x)] = crap
+
+        # Lookups are done one by one, and Python lists are much faster than
+        # numpy arrays for that. grid[y][x] is the terrain name of the tile,
+        # or the list of lists of terrain names of its cells.
+        self.grid = [[TERRAINS[t] for t in row] for row in grid.tolist()]
+        for ((gx, gy), subgrid) in subgrids.items():
+            self.grid[gy][gx] = [
+                [TERRAINS[t] for t in row] for row in subgrid.tolist()
+            ]
+        self.nb_subgrids = len(subgrids)
+        logger.info("Terrain map: %dx%d tiles, %d with sub-tile cells",
+                    self.size[0], self.size[1], self.nb_subgrids)
+
+    def get_terrain(self, position):
+        # called for each car on each tick: keep it short
+        x = position[0] / TILE_WIDTH
+        y = position[1] / TILE_HEIGHT
+        tile_x = math.floor(x)
+        tile_y = math.floor(y)
+        gx = tile_x - self.origin_x
+        gy = tile_y - self.origin_y
+        if gx < 0 or gy < 0 or gx >= self.width or gy >= self.height:
+            return DEFAULT_TERRAIN
+        t = self.grid[gy][gx]
+        if t.__class__ is str:
+            return t
+        return t[int((y - tile_y) * self.SUBDIVISIONS)][
+            int((x - tile_x) * self.SUBDIVISIONS)
+        ]
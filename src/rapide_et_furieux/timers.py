@@ -0,0 +1,134 @@
+import time
+
+
+class Timer(object):
+    __slots__ = ('wheel', 'expires', 'interval', 'callback', 'args', 'active')
+
+    def __init__(self, wheel, expires, interval, callback, args):
+        self.wheel = wheel
+        self.expires = expires  # tick
+        self.interval = interval  # ticks, None if not periodic
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+    def cancel(self):
+        """
+        Can be called more than once, and even once the timer has fired.
+        """
+        if not self.active:
+            return
+        self.active = False
+        self.wheel.nb_timers -= 1
+
+    def __repr__(self):
+        return "Timer({}, expires={}, interval={}, active={})".format(
+            self.callback, self.expires, self.interval, self.active
+        )
+
+
+class TimerWheel(object):
+    """
+    Hierarchical timer wheel: timers are put in buckets ("slots") according
+    to the tick on which they expire. Level 0 has one slot per tick for the
+    next 64 ticks, level 1 one slot per 64 ticks for the next 64*64 ticks,
+    etc. When the ticks of a slot of level N begin, the slot is emptied
+    and its timers are dispatched in the slots of the lower levels.
+
+    So on each tick, we only look at the timers that fire (and
+    occasionally at the ones we move to a lower level), not at all the
+    pending ones.
+
+    Cancelled timers are left in their slot and ignored when it is emptied.
+    """
+    LEVEL_BITS = 6
+    NB_SLOTS = 1 << LEVEL_BITS
+    SLOT_MASK = NB_SLOTS - 1
+    NB_LEVELS = 4
+    # 64 ** 4 ticks = ~38 hours at 120 ticks/s
+    MAX_DELAY = 1 << (LEVEL_BITS * NB_LEVELS)
+
+    def __init__(self):
+        self.now = 0  # ticks
+        self.levels = [
+            [[] for slot in range(0, self.NB_SLOTS)]
+            for level in range(0, self.NB_LEVELS)
+        ]
+        self.nb_timers = 0
+        self.nb_fired = 0  # since the last call to advance()
+
+    def __len__(self):
+        return self.nb_timers
+
+    def _insert(self, timer):
+        delay = timer.expires - self.now
+        for level in range(0, self.NB_LEVELS):
+            if delay < (1 << (self.LEVEL_BITS * (level + 1))):
+                idx = (timer.expires >> (self.LEVEL_BITS * level)) \
+                    & self.SLOT_MASK
+                self.levels[level][idx].append(timer)
+                return
+        raise ValueError("Timer delay too long: {} ticks".format(delay))
+
+    def add(self, delay, callback, *args, interval=None):
+        """
+        Call 'callback(*args)' in 'delay' ticks (>= 1), and then every
+        'interval' ticks if 'interval' is not None.
+        """
+        if delay < 1:
+            delay = 1
+        if interval is not None and interval < 1:
+            interval = 1
+        timer = Timer(self, self.now + delay, interval, callback, args)
+        self._insert(timer)
+        self.nb_timers += 1
+        return timer
+
+    def _cascade(self, level):
+        idx = (self.now >> (self.LEVEL_BITS * level)) & self.SLOT_MASK
+        slot = self.levels[level][idx]
+        if len(slot) <= 0:
+            return
+        self.levels[level][idx] = []
+        for timer in slot:
+            if timer.active:
+                self._insert(timer)
+
+    def advance(self, profiler=None):
+        """
+        Move to the next tick and call the timers expiring on it
+        """
+        self.now += 1
+        self.nb_fired = 0
+
+        # find the highest level whose slot begins on this tick, and move
+        # its timers down, level by level
+        top = 0
+        while (top + 1 < self.NB_LEVELS and
+               self.now & ((1 << (self.LEVEL_BITS * (top + 1))) - 1) == 0):
+            top += 1
+        for level in range(top, 0, -1):
+            self._cascade(level)
+
+        idx = self.now & self.SLOT_MASK
+        slot = self.levels[0][idx]
+        if len(slot) <= 0:
+            return
+        self.levels[0][idx] = []
+        for timer in slot:
+            if not timer.active:
+                continue
+            if timer.interval is None:
+                timer.active = False
+                self.nb_timers -= 1
+            else:
+                timer.expires += timer.interval
+                self._insert(timer)
+            self.nb_fired += 1
+            if profiler is None:
+                timer.callback(*timer.args)
+            else:
+                start = time.perf_counter()
+                timer.callback(*timer.args)
+                profiler.add(profiler.get_group_cached(timer.callback),
+                             time.perf_counter() - start)
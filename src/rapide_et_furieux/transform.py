@@ -0,0 +1,101 @@
+"""
+2D transforms between the race track and the objects moving on it.
+
+Each moving object (car, projectile) has its own frame: x goes forward and
+y goes to the side, 'radians' being the angle between the x axis of the
+track and the forward direction of the object (counterclockwise, as seen
+on screen). The speed of the cars is expressed in their own frame. The
+race track uses screen coordinates (y going down).
+
+Rotating a vector takes a cos() and a sin() instead of a round-trip
+through polar coordinates (sqrt() + atan2() + cos() + sin()). Rotation
+keeps the cos/sin of an object angle until the angle changes.
+"""
+
+import math
+
+
+def rotate(vector, angle):
+    """
+    Same as util.to_cartesian() of util.to_polar(vector) with 'angle' added
+    to its angle
+    """
+    (cos, sin) = (math.cos(angle), math.sin(angle))
+    return (
+        (vector[0] * cos) - (vector[1] * sin),
+        (vector[0] * sin) + (vector[1] * cos),
+    )
+
+
+def to_track(vector, angle):
+    """
+    Converts a vector in the frame of an object turned by 'angle' into a
+    vector relative to the track
+    """
+    return rotate(vector, -angle)
+
+
+def to_local(vector, angle):
+    """
+    Reverse of to_track()
+    """
+    return rotate(vector, angle)
+
+
+def get_box(size, margin=0):
+    """
+    Corners of a sprite of this size, in its own frame (see above). The
+    sprites are drawn facing up.
+    """
+    (half_w, half_h) = ((size[0] / 2) - margin, (size[1] / 2) - margin)
+    return (
+        (half_h, -half_w),
+        (half_h, half_w),
+        (-half_h, half_w),
+        (-half_h, -half_w),
+    )
+
+
+class Rotation(object):
+    """
+    cos/sin of an object angle, recomputed only when the angle changes
+    """
+
+    __slots__ = ("angle", "cos", "sin")
+
+    def __init__(self, angle=0.0):
+        self.angle = None
+        self.set(angle)
+
+    def set(self, angle):
+        if angle != self.angle:
+            self.angle = angle
+            self.cos = math.cos(angle)
+            self.sin = math.sin(angle)
+        return self
+
+    def to_track(self, vector):
+        (cos, sin) = (self.cos, self.sin)
+        return (
+            (vector[0] * cos) + (vector[1] * sin),
+            (vector[1] * cos) - (vector[0] * sin),
+        )
+
+    def to_local(self, vector):
+        (cos, sin) = (self.cos, self.sin)
+        return (
+            (vector[0] * cos) - (vector[1] * sin),
+            (vector[0] * sin) + (vector[1] * cos),
+        )
+
+    def get_pts(self, local_pts, position):
+        """
+        Points of the object frame --> points of the track, for an object
+        at 'position'
+        """
+        (cos, sin) = (self.cos, self.sin)
+        (x, y) = position
+        return [
+            (x + (px * cos) + (py * sin), y + (py * cos) - (px * sin))
+            for (px, py) in local_pts
+        ]
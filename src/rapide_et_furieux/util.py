@@ -1,4 +1,5 @@
 import itertools
+import json
 import logging
 import math
 import sys
@@ -6,17 +7,41 @@ import time
 
 import pygame
 
+from . import geometry
+from . import registry
+from . import scheduler
+from . import timers
+
 
 VERSION = "0.1"
 
-g_event_listeners = []
-g_animators = []
-g_drawers = []
+g_event_listeners = registry.Registry()
+g_animators = registry.Registry()
+g_drawers = registry.LayeredRegistry()
 g_loop = True
-g_rnd = 0
-g_on_idle = []
+# idle callbacks. See idle_add()
+g_scheduler = scheduler.Scheduler()
+# timers, in simulated time. See add_timer()
+g_timers = timers.TimerWheel()
 g_paused = False
 
+# Simulation runs at a fixed rate, independently from the rendering
+TICK_RATE = 120  # ticks per second
+# if we are really late, we drop simulation time instead of trying to
+# catch up forever
+MAX_TICKS_PER_FRAME = 8
+
+g_tick_interval = 1.0 / TICK_RATE
+# simulated time: seconds elapsed in the game world (sum of all the ticks).
+# game logic must use it instead of the wall clock, so it behaves the same
+# when the simulation runs slower or faster than real time
+g_sim_time = 0.0
+# see profiler.FrameProfiler. None = disabled
+g_profiler = None
+# progression between the last simulation tick and the next one (0.0 -> 1.0).
+# used to interpolate the positions of the sprites when rendering
+g_alpha = 1.0
+
 logger = logging.getLogger(__name__)
 
 GAME_SETTINGS_TEMPLATE = {
@@ -85,6 +110,19 @@ def pairwise(iterable):
         yield (last, first)
 
 
+def interpolate(previous, current):
+    """
+    Position to render, between the position at the previous simulation tick
+    and the position at the current one.
+    """
+    if previous is None:
+        return current
+    return (
+        previous[0] + ((current[0] - previous[0]) * g_alpha),
+        previous[1] + ((current[1] - previous[1]) * g_alpha),
+    )
+
+
 def to_polar(coord):
     # coord are from the top-left of the screen
     return (
@@ -101,182 +139,63 @@ def to_cartesian(polar):
     )
 
 
-def _calculate_gradient(line):
-    # Ensure that the line is not vertical
-    if (line[0][0] != line[1][0]):
-        return (line[0][1] - line[1][1]) / (line[0][0] - line[1][0])
-    return None
-
-
-def _calculate_y_axis_intersect(p, m):
-    """Compute the point 'b' where line crosses the Y axis"""
-    return p[1] - (m * p[0])
-
-
-def _get_line_intersect_points(line_a, line_b):
+def get_segment_intersect_point(line_a, line_b):
     """
-    Calc the point where two infinitely long lines (p1 to p2 and p3 to p4)
-    intersect.
-    Handle parallel lines and vertical lines (the later has infinite 'm').
-    Returns a point tuple of points like this ((x,y),...)  or None
-    In non parallel cases the tuple will contain just one point.
-    For parallel lines that lay on top of one another the tuple will contain
-    all four points of the two lines
+    Returns the point where the segments intersect, or None.
+    See geometry.get_segment_intersect_point()
     """
-    (p1, p2) = line_a
-    (p3, p4) = line_b
-    m1 = _calculate_gradient(line_a)
-    m2 = _calculate_gradient(line_b)
-
-    # See if the lines are parallel
-    if m1 != m2:
-        # Not parallel
-
-        # See if either line is vertical
-        if (m1 is not None and m2 is not None):
-            # Neither line vertical
-            b1 = _calculate_y_axis_intersect(p1, m1)
-            b2 = _calculate_y_axis_intersect(p3, m2)
-            x = (b2 - b1) / (m1 - m2)
-            y = (m1 * x) + b1
-        elif m1 is None:
-            # Line 1 is vertical so use line 2's values
-            b2 = _calculate_y_axis_intersect(p3, m2)
-            x = p1[0]
-            y = (m2 * x) + b2
-        else:
-            # Line 2 is vertical so use line 1's values
-            b1 = _calculate_y_axis_intersect(p1, m1)
-            x = p3[0]
-            y = (m1 * x) + b1
-        return ((x, y),)
-
-    # Parallel lines with same 'b' value must be the same line so they intersect
-    # everywhere in this case we return the start and end points of both lines
-    # the _calculate_intersect_point method will sort out which of these points
-    # lays on both line segments
-    (b1, b2) = (None, None)  # vertical lines have no b value
-    if m1 is not None:
-        b1 = _calculate_y_axis_intersect(p1, m1)
-
-    if m2 is not None:
-        b2 = _calculate_y_axis_intersect(p3, m2)
-
-    # If these parallel lines lay on one another
-    if b1 == b2:
-        return (p1, p2, p3, p4)
-
-    return None
-
-
-def line_to_int(line):
-    return (
-        (
-            int(line[0][0]),
-            int(line[0][1]),
-        ),
-        (
-            int(line[1][0]),
-            int(line[1][1]),
-        ),
-    )
+    return geometry.get_segment_intersect_point(line_a, line_b)
 
 
-def get_segment_intersect_point(line_a, line_b):
+def raytrace(line, grid_size=1):
     """
-    For line segments (ie not infinitely long lines) the intersect point
-    may not lay on both lines.
-
-    If the point where two lines intersect is inside both line's bounding
-    rectangles then the lines intersect. Returns intersect point if the line
-    intesect o None if not
+    Yields the cells of the grid (cell = (floor(x / grid_size),
+    floor(y / grid_size))) crossed by the segment, in order, each cell once.
+    Amanatides & Woo traversal: we go from one cell border to the next one,
+    so the cost depends on the number of cells crossed, not on the length of
+    the segment.
+    Consecutive cells always share a side.
     """
-    line_a = line_to_int(line_a)
-    line_b = line_to_int(line_b)
-
-    (p1, p2) = line_a
-    (p3, p4) = line_b
-    intersects = _get_line_intersect_points(line_a, line_b)
-    if intersects is None:
-        return None
-
-    (p1, p2) = (
-        (
-            min(p1[0], p2[0]) - 1,
-            min(p1[1], p2[1]) - 1,
-        ),
-        (
-            max(p1[0], p2[0]) + 2,
-            max(p1[1], p2[1]) + 2,
-        )
-    )
-    (p3, p4) = (
-        (
-            min(p3[0], p4[0]) - 1,
-            min(p3[1], p4[1]) - 1,
-        ),
-        (
-            max(p3[0], p4[0]) + 2,
-            max(p3[1], p4[1]) + 2,
-        )
-    )
-
-    width = p2[0] - p1[0]
-    height = p2[1] - p1[1]
-    # approximate because _get_line_intersect_points
-    # may reply with crappy numbers like 0.9999
-    r1 = pygame.Rect(p1, (width, height))
-
-    width = p4[0] - p3[0]
-    height = p4[1] - p3[1]
-    # approximate because _get_line_intersect_points
-    # may reply with crappy numbers like 0.9999
-    r2 = pygame.Rect(p3, (width, height))
-
-    for point in intersects:
-        point = (int(point[0]), int(point[1]))
-        res1 = r1.collidepoint(point)
-        res2 = r2.collidepoint(point)
-        if res1 and res2:
-            point = [int(pp) for pp in point]
-            return point
-
-    # This is the case where the infinitely long lines crossed but
-    # the line segments didn't
-    return None
-
+    (x0, y0) = (line[0][0], line[0][1])
+    (x1, y1) = (line[1][0], line[1][1])
+
+    x = math.floor(x0 / grid_size)
+    y = math.floor(y0 / grid_size)
+    end_x = math.floor(x1 / grid_size)
+    end_y = math.floor(y1 / grid_size)
+    yield (x, y)
+
+    dx = x1 - x0
+    dy = y1 - y0
+    # t = position along the segment (0.0 -> 1.0)
+    # t_max_* = t of the next cell border
+    # t_delta_* = t needed to cross a whole cell
+    if dx > 0:
+        (step_x, t_max_x) = (1, (((x + 1) * grid_size) - x0) / dx)
+        t_delta_x = grid_size / dx
+    elif dx < 0:
+        (step_x, t_max_x) = (-1, ((x * grid_size) - x0) / dx)
+        t_delta_x = -grid_size / dx
+    else:
+        (step_x, t_max_x, t_delta_x) = (0, math.inf, math.inf)
+    if dy > 0:
+        (step_y, t_max_y) = (1, (((y + 1) * grid_size) - y0) / dy)
+        t_delta_y = grid_size / dy
+    elif dy < 0:
+        (step_y, t_max_y) = (-1, ((y * grid_size) - y0) / dy)
+        t_delta_y = -grid_size / dy
+    else:
+        (step_y, t_max_y, t_delta_y) = (0, math.inf, math.inf)
 
-def raytrace(line, grid_size=1):
-    ((x0, y0), (x1, y1)) = line
-    x0 = int(x0)
-    y0 = int(y0)
-    x1 = int(x1)
-    y1 = int(y1)
-
-    dx = abs(x1 - x0)
-    dy = abs(y1 - y0)
-    x = x0
-    y = y0
-    n = 1 + dx + dy
-    x_inc = 1 if (x1 > x0) else -1
-    y_inc = 1 if (y1 > y0) else -1
-    error = dx - dy
-    dx *= 2
-    dy *= 2
-
-    last_pos = None
-    for n in range(0, round(n)):
-        new_pos = (int(x / grid_size), int(y / grid_size))
-        if new_pos != last_pos:
-            yield(new_pos)
-            last_pos = new_pos
-
-        if error > 0:
-            x += x_inc
-            error -= dy
+    for _ in range(0, abs(end_x - x) + abs(end_y - y)):
+        # the checks on end_* protect us against rounding errors
+        if y == end_y or (x != end_x and t_max_x < t_max_y):
+            x += step_x
+            t_max_x += t_delta_x
         else:
-            y += y_inc
-            error += dx
+            y += step_y
+            t_max_y += t_delta_y
+        yield (x, y)
 
 
 def distance_pt_to_pt(pt_a, pt_b):
@@ -393,6 +312,16 @@ def set_default_resolution():
     return screen
 
 
+def clock():
+    # monotonic and high resolution: never goes backward when the system
+    # time is changed
+    return time.perf_counter()
+
+
+def sim_time():
+    return g_sim_time
+
+
 def exit():
     global g_loop
     g_loop = False
@@ -414,97 +343,218 @@ def check_base_keys(event):
 
 
 def register_event_listener(event_listener):
-    global g_event_listeners
-    g_event_listeners.append(event_listener)
+    """
+    Returns a handle that can be used to unregister the listener.
+    Listeners are called in registration order. If one of them returns True,
+    the following ones don't get the event.
+    """
+    return g_event_listeners.register(event_listener)
 
 
 def unregister_event_listener(event_listener):
-    global g_event_listeners
-    g_event_listeners.remove(event_listener)
+    """
+    Accepts either the handle returned by register_event_listener() or the
+    listener itself.
+    """
+    g_event_listeners.unregister(event_listener)
 
 
 def register_animator(animator):
-    global g_animators
-    g_animators.append(animator)
+    """
+    Returns a handle that can be used to unregister the animator.
+    Animators are called in reversed registration order.
+    """
+    return g_animators.register(animator)
 
 
 def unregister_animator(animator):
-    global g_animators
-    g_animators.remove(animator)
+    g_animators.unregister(animator)
 
 
 def register_drawer(layer, drawer):
-    global g_drawers
-    global g_rnd
-    # g_rnd is only used to break ties when ordering
-    g_drawers.append((layer, g_rnd, drawer))
-    g_drawers.sort()
-    g_rnd += 1
+    """
+    Returns a handle that can be used to unregister the drawer.
+    Drawers are called by increasing layer, and in registration order within
+    a layer.
+    """
+    return g_drawers.register(layer, drawer)
 
 
 def unregister_drawer(drawer):
-    global g_drawers
-    for tup in g_drawers:
-        if tup[2] == drawer:
-            break
-    else:
-        raise KeyError("Unknown drawer")
-    g_drawers.remove(tup)
+    g_drawers.unregister(drawer)
+
+
+def set_profiler(profiler):
+    global g_profiler
+    g_profiler = profiler
+
+
+def profiled(func, *args, **kwargs):
+    """
+    Call func, and account for its time separately if the profiler is
+    enabled.
+    """
+    if g_profiler is None:
+        return func(*args, **kwargs)
+    return g_profiler.call(func, *args, **kwargs)
+
+
+def to_ticks(delay):
+    """
+    Converts a delay in seconds into a number of simulation ticks (>= 1)
+    """
+    return max(1, int(math.ceil(delay / g_tick_interval - 1e-9)))
+
+
+def add_timer(delay, callback, *args):
+    """
+    Call 'callback(*args)' once, in 'delay' simulated seconds.
+    Returns a timers.Timer that can be cancelled.
+    """
+    return g_timers.add(to_ticks(delay), callback, *args)
+
+
+def add_periodic_timer(interval, callback, *args):
+    """
+    Call 'callback(*args)' every 'interval' simulated seconds, until the
+    returned timers.Timer is cancelled.
+    """
+    ticks = to_ticks(interval)
+    return g_timers.add(ticks, callback, *args, interval=ticks)
 
 
 def idle_add(action, *args, **kwargs):
-    global g_on_idle
-    g_on_idle.append((action, args, kwargs))
+    """
+    Run 'action' later, from the main loop. Can be called from any thread.
+    If 'action' returns a generator (for instance if it is a generator
+    function), it is run one step per 'yield', across several frames if
+    needed. Returns the task.
+    """
+    return g_scheduler.add(scheduler.PRIORITY_DEFAULT, action, *args, **kwargs)
 
 
-def main_loop(screen):
-    global g_animators
-    global g_drawers
-    global g_event_listeners
+def idle_add_priority(priority, action, *args, **kwargs):
+    """
+    See idle_add(). Tasks with the lowest priority value run first
+    (see scheduler.PRIORITY_*).
+    """
+    return g_scheduler.add(priority, action, *args, **kwargs)
+
+
+def json_dump_steps(data, fd, nb_chunks=4096, **kwargs):
+    """
+    Same as json.dump(), but it's a generator yielding every 'nb_chunks'
+    chunks written, so it can be run as an idle task (see idle_add())
+    without freezing the game.
+    """
+    encoder = json.JSONEncoder(**kwargs)
+    for (idx, chunk) in enumerate(encoder.iterencode(data)):
+        fd.write(chunk)
+        if idx % nb_chunks == nb_chunks - 1:
+            yield
+
+
+def main_loop(screen, tick_rate=TICK_RATE, max_fps=None, realtime=True,
+              idle_budget=None):
+    """
+    If realtime is False, the simulation doesn't wait for the wall clock:
+    each iteration runs exactly one tick, as fast as possible.
+
+    idle_budget: time (seconds) that can be spent running the idle callbacks
+    on each frame.
+    """
+    global g_alpha
     global g_loop
-    global g_on_idle
     global g_paused
+    global g_sim_time
+    global g_tick_interval
 
     g_loop = True
+    g_tick_interval = 1.0 / tick_rate
+    if idle_budget is not None:
+        g_scheduler.budget = idle_budget
+    min_frame_interval = (1.0 / max_fps) if max_fps else 0.0
 
     if check_base_keys not in g_event_listeners:
         register_event_listener(check_base_keys)
 
-    logger.info("Ready")
+    logger.info("Ready (%d ticks/s)", tick_rate)
 
-    previous_frame = time.time()
-    last_frame = time.time()
+    accumulator = 0.0
+    last_frame = clock()
 
     while g_loop:
-        while g_paused and g_loop:
-            time.sleep(0.1)
-            for event in pygame.event.get():
-                check_base_keys(event)
+        if g_paused:
+            while g_paused and g_loop:
+                time.sleep(0.1)
+                for event in pygame.event.get():
+                    check_base_keys(event)
+            # don't simulate the time spent in pause
+            last_frame = clock()
+
+        # profiling is opt-in: we don't want to pay for it when disabled
+        profiler = g_profiler
+        if profiler is not None:
+            profiler.begin_frame()
 
-        idle = True
         for event in pygame.event.get():
-            idle = False
-            for event_listener in set(g_event_listeners):
-                if event_listener(event):
+            for event_listener in g_event_listeners:
+                if profiler is None:
+                    r = event_listener(event)
+                else:
+                    r = profiler.call(event_listener, event)
+                if r:
                     break
 
-        if idle:
-            while len(g_on_idle) > 0:
-                (action, args, kwargs) = g_on_idle.pop(0)
-                action(*args, **kwargs)
-
-        frame_interval = last_frame - previous_frame
-        if frame_interval <= 0.0:
-            # avoid divisions by zero
-            frame_interval = 0.00001
-        for animator in reversed(g_animators):
-            animator(frame_interval)
-
-        for (layer, _, drawer) in g_drawers:
-            drawer.draw(screen)
-        pygame.display.flip()
-
-        previous_frame = last_frame
-        last_frame = time.time()
+        if len(g_scheduler) > 0:
+            g_scheduler.run(profiler=profiler)
+        if profiler is not None:
+            stats = g_scheduler.get_stats()
+            profiler.set_gauge("idle queue depth", stats['depth'])
+            profiler.set_gauge("idle latency p95 (ms)", "{:.1f}".format(
+                stats['latency_p95'] * 1000
+            ))
+            profiler.set_gauge("timers", len(g_timers))
+
+        now = clock()
+        if realtime:
+            accumulator += now - last_frame
+        else:
+            accumulator += g_tick_interval
+        frame_time = now - last_frame
+        last_frame = now
+
+        nb_ticks = 0
+        while accumulator >= g_tick_interval:
+            if nb_ticks >= MAX_TICKS_PER_FRAME:
+                # we can't keep up: slow down the game instead of freezing
+                accumulator %= g_tick_interval
+                break
+            g_sim_time += g_tick_interval
+            g_timers.advance(profiler)
+            if profiler is None:
+                for animator in reversed(g_animators):
+                    animator(g_tick_interval)
+            else:
+                for animator in reversed(g_animators):
+                    profiler.call(animator, g_tick_interval)
+            accumulator -= g_tick_interval
+            nb_ticks += 1
+        g_alpha = accumulator / g_tick_interval
+
+        if profiler is None:
+            for (layer, drawer) in g_drawers:
+                drawer.draw(screen)
+            pygame.display.flip()
+        else:
+            for (layer, drawer) in g_drawers:
+                profiler.draw(drawer, screen)
+            profiler.call(pygame.display.flip)
+            profiler.end_frame(frame_time)
+
+        if min_frame_interval > 0:
+            wait = min_frame_interval - (clock() - last_frame)
+            if wait > 0:
+                time.sleep(wait)
 
     logger.info("Good bye")
@@ -0,0 +1,54 @@
+import unittest
+
+import pygame
+
+from rapide_et_furieux import assets
+
+
+RESOURCE = ("rapide_et_furieux.tests", "image.png")
+
+
+class TestGetImage(unittest.TestCase):
+    def setUp(self):
+        self.resources = assets.g_resources
+        assets.g_resources = {
+            RESOURCE: pygame.Surface((40, 20), pygame.SRCALPHA),
+        }
+        assets.g_derived.clear()
+
+    def tearDown(self):
+        assets.g_resources = self.resources
+        assets.g_derived.clear()
+        assets.set_race_started(False)
+        assets.set_disk_access_check(assets.DISK_ACCESS_CHECK_NONE)
+
+    def test_recipe(self):
+        self.assertIs(assets.get_image(RESOURCE), assets.g_resources[RESOURCE])
+        # the color of car resources doesn't matter
+        self.assertIs(assets.get_image(RESOURCE + ((255, 0, 0),)),
+                      assets.g_resources[RESOURCE])
+
+        img = assets.get_image(RESOURCE, ("scale", 0.5), ("rotate", 90))
+        self.assertEqual(img.get_size(), (10, 20))
+        self.assertIs(
+            assets.get_image(RESOURCE, ("scale", 0.5), ("rotate", 90)), img
+        )
+        self.assertEqual(
+            assets.get_image(RESOURCE, ("fit", 10)).get_size(), (10, 5)
+        )
+        self.assertEqual(
+            assets.get_image(RESOURCE, ("crop", 8)).get_size(), (40, 8)
+        )
+        self.assertRaises(ValueError, assets.get_image, RESOURCE, ("x", 1))
+
+    def test_disk_access(self):
+        other = assets.MISSILE
+        assets.set_disk_access_check(assets.DISK_ACCESS_CHECK_RAISE)
+        assets.set_race_started(True)
+        # already in memory
+        assets.get_image(RESOURCE, ("scale", 2))
+        self.assertRaises(assets.DiskAccessError, assets.get_image, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from rapide_et_furieux import borders
+
+
+class TestOptimize(unittest.TestCase):
+    def test_collinear(self):
+        (chains, report) = borders.optimize([
+            ((0, 0), (100, 0)),
+            ((200, 0), (100, 0)),
+            ((200, 0), (300, 1)),
+            # turn
+            ((300, 1), (300, 100)),
+        ])
+        self.assertEqual(chains, [[(0, 0), (300, 1), (300, 100)]])
+        self.assertEqual(report.nb_segments, 4)
+        self.assertEqual(report.nb_chain_segments, 2)
+
+    def test_cleanup(self):
+        (chains, report) = borders.optimize([
+            ((0, 0), (100, 0)),
+            ((100, 0), (0, 0)),  # duplicate
+            ((50, 50), (50, 50)),  # zero-length
+            ((102, 1), (100, 100)),  # almost touching
+        ])
+        self.assertEqual(chains, [[(0, 0), (100, 0), (100, 100)]])
+        self.assertEqual(report.nb_chains, 1)
+
+    def test_u_turn(self):
+        (chains, _) = borders.optimize([
+            ((0, 0), (100, 0)),
+            ((100, 0), (50, 0)),
+        ])
+        self.assertEqual(chains, [[(0, 0), (100, 0), (50, 0)]])
+
+    def test_junction_and_loop(self):
+        (chains, _) = borders.optimize([
+            # T junction: 3 chains
+            ((0, 0), (100, 0)),
+            ((100, 0), (200, 0)),
+            ((100, 0), (100, 100)),
+            # closed triangle
+            ((500, 0), (600, 0)),
+            ((600, 0), (550, 100)),
+            ((550, 100), (500, 0)),
+        ])
+        self.assertEqual(len(chains), 4)
+        loop = chains[-1]
+        self.assertEqual(loop[0], loop[-1])
+        self.assertEqual(len(list(borders.get_segments(loop))), 3)
+        segments = {
+            frozenset(segment)
+            for chain in chains[:-1]
+            for segment in borders.get_segments(chain)
+        }
+        self.assertEqual(segments, {
+            frozenset(((0, 0), (100, 0))),
+            frozenset(((100, 0), (200, 0))),
+            frozenset(((100, 0), (100, 100))),
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from rapide_et_furieux import broadphase
+
+
+class Obj(object):
+    def __init__(self, position):
+        self.position = position
+
+
+class TestSweepAndPrune(unittest.TestCase):
+    def get_expected_pairs(self, objs, size):
+        return {
+            frozenset((a, b)) for a in objs for b in objs
+            if a is not b and
+            abs(a.position[0] - b.position[0]) < size and
+            abs(a.position[1] - b.position[1]) < size
+        }
+
+    def get_pairs(self, sap):
+        return {frozenset(pair) for pair in sap.get_pairs()}
+
+    def test_update(self):
+        rnd = random.Random(0)
+        objs = [
+            Obj((rnd.random() * 1000, rnd.random() * 1000))
+            for _ in range(0, 100)
+        ]
+        sap = broadphase.SweepAndPrune(50)
+        for obj in objs:
+            sap.add(obj)
+        self.assertEqual(self.get_pairs(sap),
+                         self.get_expected_pairs(objs, 50))
+
+        for _ in range(0, 20):
+            for obj in objs:
+                obj.position = (
+                    obj.position[0] + rnd.randint(-10, 10),
+                    obj.position[1] + rnd.randint(-10, 10),
+                )
+            sap.update()
+            expected = self.get_expected_pairs(objs, 50)
+            self.assertEqual(self.get_pairs(sap), expected)
+            self.assertEqual(sap.nb_pairs, len(expected))
+
+    def test_add_remove(self):
+        a = Obj((0, 0))
+        b = Obj((10, 10))
+        c = Obj((100, 0))
+        sap = broadphase.SweepAndPrune(50)
+        sap.add(a)
+        sap.add(b)
+        sap.add(c)
+        self.assertRaises(KeyError, sap.add, a)
+        self.assertEqual(sap.get_neighbours(a), [b])
+        self.assertEqual(sap.get_neighbours(c), [])
+        self.assertEqual(sap.nb_pairs, 1)
+
+        sap.remove(b)
+        self.assertNotIn(b, sap)
+        self.assertEqual(sap.get_neighbours(a), [])
+        self.assertEqual(sap.nb_pairs, 0)
+        self.assertEqual(len(sap), 2)
+
+    def test_sleeping(self):
+        a = Obj((0, 0))
+        b = Obj((10, 10))
+        c = Obj((20, 0))
+        sap = broadphase.SweepAndPrune(50)
+        for obj in (a, b, c):
+            sap.add(obj)
+        sap.set_sleeping(a, True)
+        sap.set_sleeping(b, True)
+        sap.update()
+        self.assertEqual(self.get_pairs(sap),
+                         {frozenset((a, c)), frozenset((b, c))})
+        sap.set_sleeping(b, False)
+        self.assertIn(a, sap.get_neighbours(b))
+        self.assertEqual(sap.nb_pairs, 3)
+        sap.update()
+        self.assertEqual(sap.nb_pairs, 3)
+        sap.remove(a)
+        self.assertEqual(sap.sleeping, set())
+        self.assertRaises(KeyError, sap.set_sleeping, a, True)
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from rapide_et_furieux import bvh
+from rapide_et_furieux import geometry
+
+
+class TestSegmentBVH(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(42)
+        self.items = []
+        for idx in range(0, 500):
+            (x, y) = (rnd.randint(0, 5000), rnd.randint(0, 5000))
+            segment = (
+                (x, y),
+                (x + rnd.randint(-300, 300), y + rnd.randint(-300, 300))
+            )
+            self.items.append((idx, segment))
+        # some vertical and horizontal segments
+        self.items.append((500, ((100, 100), (100, 900))))
+        self.items.append((501, ((100, 100), (900, 100))))
+        self.tree = bvh.SegmentBVH(self.items)
+
+    def test_empty(self):
+        tree = bvh.SegmentBVH()
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(list(tree.query_box((0, 0, 10, 10))), [])
+        self.assertEqual(list(tree.query_segment(((0, 0), (10, 10)))), [])
+        self.assertIsNone(tree.raycast(((0, 0), (10, 10))))
+
+    def test_query_box(self):
+        self.assertEqual(len(self.tree), len(self.items))
+        rnd = random.Random(1)
+        for _ in range(0, 100):
+            (x, y) = (rnd.randint(0, 5000), rnd.randint(0, 5000))
+            box = (x, y, x + rnd.randint(0, 400), y + rnd.randint(0, 400))
+            expected = {
+                idx for (idx, segment) in self.items
+                if geometry.segments_aabb_overlap(
+                    ((box[0], box[1]), (box[2], box[3])), segment
+                )
+            }
+            found = {idx for (idx, segment) in self.tree.query_box(box)}
+            self.assertEqual(found, expected)
+
+    def test_query_segment(self):
+        rnd = random.Random(2)
+        segments = [((100, 50), (100, 2000)), ((50, 100), (3000, 100))]
+        for _ in range(0, 100):
+            segments.append((
+                (rnd.randint(0, 5000), rnd.randint(0, 5000)),
+                (rnd.randint(0, 5000), rnd.randint(0, 5000)),
+            ))
+        for segment in segments:
+            expected = {
+                idx for (idx, other) in self.items
+                if geometry.get_segment_intersect_point(segment, other)
+            }
+            found = {idx for (idx, other) in self.tree.query_segment(segment)}
+            # candidates: everything that intersects, and a few more
+            self.assertTrue(expected.issubset(found))
+            self.assertLess(len(found), len(self.items) / 4)
+
+    def test_raycast(self):
+        rnd = random.Random(3)
+        for _ in range(0, 100):
+            segment = (
+                (rnd.randint(0, 5000), rnd.randint(0, 5000)),
+                (rnd.randint(0, 5000), rnd.randint(0, 5000)),
+            )
+            hits = []
+            for (idx, other) in self.items:
+                pt = geometry.get_segment_intersect_point(segment, other)
+                if pt is not None:
+                    dist = ((pt[0] - segment[0][0]) ** 2 +
+                            (pt[1] - segment[0][1]) ** 2)
+                    hits.append((dist, idx))
+            r = self.tree.raycast(segment)
+            if len(hits) <= 0:
+                self.assertIsNone(r)
+                continue
+            (idx, other, pt) = r
+            dist = ((pt[0] - segment[0][0]) ** 2 +
+                    (pt[1] - segment[0][1]) ** 2)
+            self.assertAlmostEqual(dist, min(hits)[0])
@@ -0,0 +1,148 @@
+import os
+import unittest
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import cars
+from rapide_et_furieux.gfx.racetrack import RaceTrack
+
+
+class TestExplodedCar(unittest.TestCase):
+    def setUp(self):
+        self.image = pygame.Surface((4, 2), pygame.SRCALPHA)
+        self.image.fill((200, 100, 30, 255))
+        self.image.set_at((0, 0), (250, 250, 240, 255))  # almost white
+        self.image.set_at((1, 0), (10, 20, 30, 100))
+
+    def test_frames(self):
+        imgs = cars.ExplodedCar.generate_base_exploded(self.image)
+        self.assertEqual(len(imgs), 7)
+        # grayscale, no overflow on the sum of the channels
+        self.assertEqual(imgs[0].get_at((3, 1)), (110, 110, 110, 255))
+        self.assertEqual(imgs[0].get_at((0, 0)), (8, 8, 8, 255))
+        self.assertEqual(imgs[0].get_at((1, 0)), (20, 20, 20, 100))
+        # fading
+        alphas = [img.get_at((3, 1)).a for img in imgs]
+        self.assertEqual(alphas, sorted(alphas, reverse=True))
+        self.assertEqual(alphas[-1], 255 - int(255 * 6 * 0.75 / 7.5))
+        self.assertEqual(imgs[-1].get_at((1, 0)).a, 100)
+        # the car image is untouched
+        self.assertEqual(self.image.get_at((3, 1)), (200, 100, 30, 255))
+
+    def test_cache(self):
+        imgs = cars.ExplodedCar.get_base_exploded(self.image)
+        self.assertIs(cars.ExplodedCar.get_base_exploded(self.image), imgs)
+
+
+class TestSleep(unittest.TestCase):
+    TICK = 1 / 64
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        assets.load_resources()
+
+    def setUp(self):
+        self.race_track = RaceTrack()
+        self.race_track.add_checkpoint((0, 0))
+        self.race_track.add_checkpoint((5000, 0))
+        self.race_track.collisions.precompute_static()
+
+    def add_car(self, position):
+        car = cars.Car(assets.CARS[0], self.race_track,
+                       util.GAME_SETTINGS_TEMPLATE, position, 0)
+        car.can_move = True
+        self.race_track.add_car(car)
+        return car
+
+    def run_car(self, car, duration):
+        for _ in range(0, int(duration / self.TICK)):
+            car.move(self.TICK)
+
+    def test_sleep(self):
+        car = self.add_car((1000, 1000))
+        car.speed = (cars.Car.SLEEP_SPEED * 2, 0)
+        car.move(self.TICK)
+        self.assertEqual(car.idle_time, 0)
+
+        # slow enough, but not for long enough yet
+        car.speed = (cars.Car.SLEEP_SPEED / 2, 0)
+        self.run_car(car, cars.Car.SLEEP_DELAY - (2 * self.TICK))
+        self.assertFalse(car.asleep)
+        self.assertGreater(car.idle_time, 0)
+        self.run_car(car, 2 * self.TICK)
+        self.assertTrue(car.asleep)
+        self.assertEqual(car.speed, (0, 0))
+
+        # asleep: not moved anymore
+        position = car.position
+        self.run_car(car, 1.0)
+        self.assertEqual(car.position, position)
+
+    def test_controls(self):
+        car = self.add_car((1000, 1000))
+        self.run_car(car, cars.Car.SLEEP_DELAY / 2)
+        self.assertGreater(car.idle_time, 0)
+        # pressing a control while awake resets the idle time
+        car.controls.brake = True
+        car.move(self.TICK)
+        self.assertEqual(car.idle_time, 0)
+        car.controls.brake = False
+        car.speed = (0, 0)
+        self.run_car(car, cars.Car.SLEEP_DELAY)
+        self.assertTrue(car.asleep)
+
+        for control in ("accelerate", "brake", "steer_left", "steer_right"):
+            self.run_car(car, cars.Car.SLEEP_DELAY)
+            self.assertTrue(car.asleep)
+            setattr(car.controls, control, True)
+            car.move(self.TICK)
+            self.assertFalse(car.asleep, control)
+            self.assertEqual(car.idle_time, 0)
+            setattr(car.controls, control, False)
+            car.speed = (0, 0)
+
+    def test_damage(self):
+        car = self.add_car((1000, 1000))
+        self.run_car(car, cars.Car.SLEEP_DELAY)
+        self.assertTrue(car.asleep)
+        car.damage(10)
+        self.assertFalse(car.asleep)
+        self.assertEqual(car.idle_time, 0)
+
+    def test_respawn(self):
+        car = self.add_car((1000, 1000))
+        self.run_car(car, cars.Car.SLEEP_DELAY)
+        self.assertTrue(car.asleep)
+        car.next_checkpoint = self.race_track.checkpoints[0]
+        car.respawn()
+        self.assertFalse(car.asleep)
+        self.assertEqual(car.idle_time, 0)
+
+    def test_collision(self):
+        obstacle = self.add_car((1000, 1000))
+        self.run_car(obstacle, cars.Car.SLEEP_DELAY)
+        self.assertTrue(obstacle.asleep)
+
+        # another car, right behind, running into the sleeping one
+        forward = obstacle.get_rotation().to_track((1, 0))
+        dist = obstacle.original_size[1] - 10
+        car = self.add_car((1000 - (forward[0] * dist),
+                            1000 - (forward[1] * dist)))
+        car.speed = (500, 0)
+        collisions = self.race_track.collisions
+        collisions.update_pairs()
+        hits = collisions.get_collisions(car)
+        self.assertEqual([hit.obstacle for hit in hits], [obstacle])
+        collisions.collide(car, hits, self.TICK)
+        self.assertFalse(obstacle.asleep)
+        self.assertNotEqual(obstacle.speed, (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import math
+import os
+import random
+import tempfile
+import unittest
+
+from rapide_et_furieux import clearance
+from rapide_et_furieux import geometry
+
+
+class Border(object):
+    def __init__(self, pts):
+        self.pts = pts
+
+
+BORDERS = [
+    Border([(0, 0), (400, 0), (600, 200)]),
+    Border([(0, 150), (350, 150), (450, 300)]),
+]
+
+
+class TestClearanceField(unittest.TestCase):
+    def setUp(self):
+        self.segments = clearance.get_segments(BORDERS)
+        self.field = clearance.ClearanceField.build(self.segments)
+
+    def test_points(self):
+        rnd = random.Random(0)
+        positions = [
+            (rnd.random() * 600, rnd.random() * 300) for _ in range(0, 200)
+        ]
+        expected = geometry.distance_sq_pts_to_segments(
+            positions, self.segments
+        ).min(axis=1)
+        clearances = self.field.get_clearances(positions)
+        for (position, dist, dist_sq) in zip(positions, clearances, expected):
+            self.assertAlmostEqual(dist, math.sqrt(dist_sq),
+                                   delta=self.field.cell_size)
+            self.assertAlmostEqual(self.field.get_clearance(position), dist,
+                                   places=3)
+
+    def test_segments(self):
+        # crosses the first border
+        self.assertLess(
+            self.field.get_segment_clearance(((200, -50), (200, 50))),
+            self.field.cell_size
+        )
+        # between the borders
+        self.assertAlmostEqual(
+            self.field.get_segment_clearance(((50, 75), (300, 75))), 75,
+            delta=self.field.cell_size
+        )
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            map_path = os.path.join(tmp_dir, "test.map")
+            field = clearance.ClearanceField.load_or_build(map_path, BORDERS)
+            self.assertTrue(
+                os.path.exists(clearance.get_cache_path(map_path))
+            )
+            loaded = clearance.ClearanceField.load_or_build(map_path, BORDERS)
+            self.assertEqual(loaded.key, field.key)
+            self.assertEqual(loaded.origin, field.origin)
+            self.assertEqual(loaded.distances.tolist(),
+                             field.distances.tolist())
+
+            # borders changed: the field must be rebuilt
+            borders = [Border([(0, 0), (400, 0)])]
+            rebuilt = clearance.ClearanceField.load_or_build(map_path,
+                                                             borders)
+            self.assertNotEqual(rebuilt.key, field.key)
+            self.assertAlmostEqual(rebuilt.get_clearance((200, 50)), 50,
+                                   delta=rebuilt.cell_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
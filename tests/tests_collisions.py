@@ -0,0 +1,163 @@
+import math
+import unittest
+
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import collisions
+
+
+class Box(object):
+    SIZE = (86, 47)
+    COLLISION_LAYER = collisions.LAYER_CAR
+    COLLISION_MASK = collisions.LAYER_BORDER | collisions.LAYER_CAR
+
+    def __init__(self, position):
+        self.static = False
+        self.position = position
+        self.radians = 0
+        self.speed = (0, 0)
+
+    @property
+    def pts(self):
+        (w, h) = (self.SIZE[0] / 2, self.SIZE[1] / 2)
+        (x, y) = self.position
+        return [(x - w, y - h), (x + w, y - h), (x + w, y + h), (x - w, y + h)]
+
+
+class Border(collisions.CollisionObject):
+    def __init__(self, pts):
+        super().__init__()
+        self.pts = pts
+
+
+class RaceTrack(object):
+    def __init__(self, borders):
+        self.borders = borders
+        self.cars = []
+
+
+class TestSweep(unittest.TestCase):
+    WALL_X = 1000
+
+    def setUp(self):
+        self.racetrack = RaceTrack([
+            Border([(self.WALL_X, -1000), (self.WALL_X, 1000)]),
+        ])
+        self.handler = collisions.CollisionHandler(
+            self.racetrack, util.GAME_SETTINGS_TEMPLATE
+        )
+        self.handler.precompute_static()
+
+    def add(self, box):
+        self.racetrack.cars.append(box)
+        self.handler.add_moving(box)
+        return box
+
+    def run_box(self, box, speed, tick_rate, duration=2.0):
+        """
+        Returns the lowest distance between the front of the box and the
+        wall
+        """
+        min_dist = math.inf
+        for _ in range(0, int(duration * tick_rate)):
+            self.handler.update_pairs()
+            delta = (speed[0] / tick_rate, speed[1] / tick_rate)
+            (t, collision) = self.handler.sweep(box, delta)
+            box.position = (
+                box.position[0] + (t * delta[0]),
+                box.position[1] + (t * delta[1]),
+            )
+            self.handler.update_moving(box)
+            min_dist = min(
+                min_dist, self.WALL_X - (box.position[0] + box.SIZE[0] / 2)
+            )
+        return min_dist
+
+    def test_no_tunnelling(self):
+        # at 10 FPS, the box moves by 200 pixels per frame: more than its
+        # own size
+        for tick_rate in (10, 500):
+            box = self.add(Box((0, 0)))
+            min_dist = self.run_box(box, (2000, 50), tick_rate)
+            self.assertGreaterEqual(min_dist, 0)
+            self.assertLess(min_dist, 1)
+            self.handler.remove_moving(box)
+            self.racetrack.cars.remove(box)
+
+    def test_no_tunnelling_cars(self):
+        for tick_rate in (10, 500):
+            box = self.add(Box((0, 0)))
+            other = self.add(Box((600, 10)))
+            self.run_box(box, (2000, 0), tick_rate)
+            self.assertLessEqual(box.position[0] + box.SIZE[0],
+                                 other.position[0])
+            self.assertGreater(box.position[0] + box.SIZE[0],
+                               other.position[0] - 1)
+            for b in (box, other):
+                self.handler.remove_moving(b)
+                self.racetrack.cars.remove(b)
+
+    def test_get_out(self):
+        # already in the wall: it can still move away from it
+        box = self.add(Box((self.WALL_X - 10, 0)))
+        (t, collision) = self.handler.sweep(box, (-100, 0))
+        self.assertEqual(t, 1.0)
+        self.assertIsNone(collision)
+        # going further in: stopped by the vertices still outside
+        (t, collision) = self.handler.sweep(box, (100, 0))
+        self.assertLess(t, 1.0)
+        self.assertIs(collision.obstacle, self.handler.borders[0])
+
+    def test_layers(self):
+        box = self.add(Box((0, 0)))
+        other = self.add(Box((50, 0)))
+        self.handler.update_pairs()
+        collisions_found = self.handler.get_collisions(box)
+        self.assertEqual([c.obstacle for c in collisions_found], [other])
+        self.assertEqual(
+            self.handler.get_collisions(box, mask=collisions.LAYER_BORDER),
+            []
+        )
+        self.assertEqual(
+            self.handler.get_collisions(box, ignore=(other,)), []
+        )
+        # the wall only
+        box.position = (self.WALL_X - 10, 0)
+        self.handler.update_moving(box)
+        collisions_found = self.handler.get_collisions(
+            box, mask=collisions.LAYER_BORDER
+        )
+        self.assertEqual([c.obstacle for c in collisions_found],
+                         [self.handler.borders[0]])
+        self.assertEqual(
+            self.handler.get_collisions(box, mask=collisions.LAYER_CAR), []
+        )
+
+
+class TestCollide(unittest.TestCase):
+    def check(self, result, expected):
+        for (a, b) in zip(result, expected):
+            self.assertAlmostEqual(a, b)
+
+    def test_nullify_speed(self):
+        handler = collisions.CollisionHandler
+        # going right, into a wall on the right
+        (speed, removed) = handler.nullify_speed((100, 0), 0, (-1, 0), 1.0)
+        self.check(speed, (0, 0))
+        self.check(removed, (100, 0))
+        # turned toward the top of the screen, into a wall above
+        (speed, removed) = handler.nullify_speed(
+            (100, 20), math.pi / 2, (0, 1), 1.0
+        )
+        self.check(speed, (0, 20))
+        self.check(removed, (0, -100))
+        # moving away from the obstacle: untouched
+        (speed, removed) = handler.nullify_speed((100, 0), 0, (1, 0), 1.0)
+        self.check(speed, (100, 0))
+        self.check(removed, (0, 0))
+
+    def test_add_speed(self):
+        handler = collisions.CollisionHandler
+        speed = handler.add_speed((0, 0), math.pi / 2, (0, -100))
+        self.check(speed, (100, 0))
+        speed = handler.add_speed((100, 0), 0, (0, 10))
+        self.check(speed, (100, 10))
@@ -0,0 +1,73 @@
+import unittest
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx import decals
+
+
+class TestDecalLayer(unittest.TestCase):
+    def setUp(self):
+        util.g_sim_time = 0.0
+        self.image = pygame.Surface((20, 20), pygame.SRCALPHA)
+        self.image.fill((0, 0, 0, 255))
+        self.layer = decals.DecalLayer(chunk_tiles=1)
+
+    def tearDown(self):
+        util.g_sim_time = 0.0
+
+    def test_chunks(self):
+        (w, h) = assets.TILE_SIZE
+        self.layer.stamp(self.image, (50, 50), 0)
+        self.assertEqual(list(self.layer.chunks), [(0, 0)])
+        self.layer.stamp(self.image, (60, 60), 0)
+        self.assertEqual(len(self.layer), 1)
+        # across the corner of 4 chunks
+        self.layer.stamp(self.image, (w, h), 45)
+        self.assertEqual(
+            sorted(self.layer.chunks), [(0, 0), (0, 1), (1, 0), (1, 1)]
+        )
+        self.layer.stamp(self.image, (-50, -50), 0)
+        self.assertIn((-1, -1), self.layer.chunks)
+
+        surface = self.layer.chunks[(0, 0)].surface
+        self.assertEqual(surface.get_at((50, 50)).a, 255)
+        self.assertEqual(surface.get_at((100, 10)).a, 0)
+
+    def test_fade(self):
+        self.layer.stamp(self.image, (50, 50), 0)
+        chunk = self.layer.chunks[(0, 0)]
+        util.g_sim_time = decals.DecalLayer.FADE_INTERVAL * 2
+        self.layer.draw(pygame.Surface((64, 64)), (0, 0))
+        self.assertLess(chunk.surface.get_at((50, 50)).a, 255 * 0.7)
+        self.assertGreater(chunk.surface.get_at((50, 50)).a, 0)
+
+        # no new mark: dropped
+        util.g_sim_time = decals.DecalLayer.LIFE_LENGTH + 1
+        self.layer.draw(pygame.Surface((64, 64)), (0, 0))
+        self.assertEqual(len(self.layer), 0)
+
+    def test_life_length(self):
+        self.layer.stamp(self.image, (50, 50), 0)
+        chunk = self.layer.chunks[(0, 0)]
+        # a new mark keeps the chunk, but the old ones are (almost) gone
+        util.g_sim_time = decals.DecalLayer.LIFE_LENGTH - 0.01
+        self.layer.stamp(self.image, (100, 100), 0)
+        self.assertLess(chunk.surface.get_at((50, 50)).a, 255 * 0.05)
+        self.assertEqual(chunk.surface.get_at((100, 100)).a, 255)
+
+    def test_memory_cap(self):
+        (w, h) = assets.TILE_SIZE
+        layer = decals.DecalLayer(chunk_tiles=1, max_memory=w * h * 4 * 2)
+        layer.stamp(self.image, (50, 50), 0)
+        layer.stamp(self.image, (w + 50, 50), 0)
+        layer.stamp(self.image, (50, 50), 0)  # most recently stamped
+        layer.stamp(self.image, (50, h + 50), 0)
+        self.assertEqual(sorted(layer.chunks), [(0, 0), (0, 1)])
+        self.assertEqual(layer.nb_evictions, 1)
+        self.assertLessEqual(layer.memory, w * h * 4 * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
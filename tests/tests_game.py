@@ -0,0 +1,83 @@
+import os
+import unittest
+
+import pkg_resources
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import game
+from rapide_et_furieux import registry
+from rapide_et_furieux import scheduler
+from rapide_et_furieux import simulate
+from rapide_et_furieux import sounds
+from rapide_et_furieux import timers
+from rapide_et_furieux import util
+
+
+TRACK = pkg_resources.resource_filename(
+    "rapide_et_furieux.maps", "first.map"
+)
+
+
+class TestGame(unittest.TestCase):
+    GLOBALS = (
+        "g_animators", "g_drawers", "g_event_listeners", "g_timers",
+        "g_scheduler",
+    )
+
+    def setUp(self):
+        for (k, v) in simulate.SDL_DRIVERS.items():
+            os.environ.setdefault(k, v)
+        sounds.pre_init()
+        pygame.init()
+        self.screen = pygame.display.set_mode((640, 480))
+        sounds.init(self.screen.get_size())
+
+        self.globals = {name: getattr(util, name) for name in self.GLOBALS}
+        util.g_animators = registry.Registry()
+        util.g_drawers = registry.LayeredRegistry()
+        util.g_event_listeners = registry.Registry()
+        util.g_timers = timers.TimerWheel()
+        util.g_scheduler = scheduler.Scheduler()
+
+    def tearDown(self):
+        for (name, value) in self.globals.items():
+            setattr(util, name, value)
+        assets.set_race_started(False)
+
+    @staticmethod
+    def run_idle():
+        while len(util.g_scheduler) > 0:
+            util.g_scheduler.run(budget=60.0)
+
+    @staticmethod
+    def count():
+        return (len(util.g_animators), len(util.g_drawers),
+                len(util.g_event_listeners))
+
+    def test_reload(self):
+        g = game.Game(self.screen, TRACK)
+        self.run_idle()
+        initial = self.count()
+
+        g.load()
+        self.run_idle()
+        loaded = self.count()
+        self.assertIn(g.race_track, util.g_drawers)
+        self.assertIn(g, util.g_drawers)  # camera
+
+        g.unload()
+        self.assertEqual(self.count(), initial)
+
+        # reloading unloads the previous race track first
+        g.load()
+        self.run_idle()
+        g.load()
+        self.run_idle()
+        self.assertEqual(self.count(), loaded)
+        g.unload()
+        self.assertEqual(self.count(), initial)
+
+
+if __name__ == "__main__":
+    unittest.main()
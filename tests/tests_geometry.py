@@ -0,0 +1,157 @@
+import random
+import unittest
+
+import numpy
+
+from rapide_et_furieux import geometry
+from rapide_et_furieux import util
+
+
+class TestGeometry(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(42)
+        self.points = [
+            (rnd.randint(0, 200), rnd.randint(0, 200)) for _ in range(0, 40)
+        ]
+        self.segments = [
+            ((rnd.randint(0, 200), rnd.randint(0, 200)),
+             (rnd.randint(0, 200), rnd.randint(0, 200)))
+            for _ in range(0, 30)
+        ]
+        # degenerated segment (a point)
+        self.segments.append(((50, 50), (50, 50)))
+
+    def test_pts_to_segments(self):
+        dists = geometry.distance_sq_pts_to_segments(self.points,
+                                                     self.segments)
+        self.assertEqual(dists.shape, (len(self.points), len(self.segments)))
+        for (i, pt) in enumerate(self.points):
+            for (j, segment) in enumerate(self.segments):
+                self.assertAlmostEqual(
+                    dists[i, j], util.distance_sq_pt_to_segment(segment, pt)
+                )
+
+    def test_pts_to_pts(self):
+        dists = geometry.distance_sq_pts_to_pts(self.points[:5],
+                                                self.points[5:])
+        self.assertEqual(dists[1, 2], util.distance_sq_pt_to_pt(
+            self.points[1], self.points[7]
+        ))
+
+    def test_intersect(self):
+        segments = [
+            ((0, 0), (10, 10)),
+            ((0, 10), (10, 0)),  # crosses the 1st one
+            ((10, 10), (20, 10)),  # touches the 1st one
+            ((20, 20), (30, 30)),  # collinear with the 1st one, no overlap
+            ((5, 5), (15, 15)),  # collinear with the 1st one, overlap
+            ((11, 0), (11, 5)),  # vertical
+        ]
+        r = geometry.segments_intersect(segments, segments)
+        self.assertTrue(numpy.all(numpy.diag(r)))
+        self.assertTrue(numpy.all(r == r.T))
+        self.assertTrue(r[0, 1])
+        self.assertTrue(r[0, 2])
+        self.assertFalse(r[0, 3])
+        self.assertTrue(r[0, 4])
+        self.assertFalse(r[0, 5])
+        self.assertFalse(r[1, 5])
+
+    def test_segments_to_segments(self):
+        dists = geometry.distance_sq_segments_to_segments(self.segments,
+                                                          self.segments)
+        for (i, segment_a) in enumerate(self.segments):
+            for (j, segment_b) in enumerate(self.segments):
+                expected = util.distance_sq_segment_to_segment(segment_a,
+                                                              segment_b)
+                if expected == 0:
+                    # util.get_segment_intersect_point() is approximate
+                    self.assertLess(dists[i, j], 4)
+                else:
+                    self.assertAlmostEqual(dists[i, j], expected)
+
+
+class TestIntersectPoint(unittest.TestCase):
+    def test_cross(self):
+        pt = geometry.get_segment_intersect_point(((0, 0), (10, 10)),
+                                                  ((0, 10), (10, 0)))
+        self.assertEqual(pt, (5, 5))
+
+    def test_vertical(self):
+        pt = geometry.get_segment_intersect_point(((5, 0), (5, 10)),
+                                                  ((0, 3), (10, 3)))
+        self.assertEqual(pt, (5, 3))
+        pt = geometry.get_segment_intersect_point(((5, 0), (5, 10)),
+                                                  ((6, 0), (6, 10)))
+        self.assertIsNone(pt)
+
+    def test_touching(self):
+        pt = geometry.get_segment_intersect_point(((0, 0), (10, 0)),
+                                                  ((10, 0), (10, 10)))
+        self.assertEqual(pt, (10, 0))
+        pt = geometry.get_segment_intersect_point(((0, 0), (10, 0)),
+                                                  ((11, 0), (11, 10)))
+        self.assertIsNone(pt)
+
+    def test_collinear(self):
+        pt = geometry.get_segment_intersect_point(((0, 0), (10, 10)),
+                                                  ((5, 5), (20, 20)))
+        self.assertEqual(pt, (5, 5))
+        pt = geometry.get_segment_intersect_point(((0, 0), (10, 10)),
+                                                  ((11, 11), (20, 20)))
+        self.assertIsNone(pt)
+        # parallel
+        pt = geometry.get_segment_intersect_point(((0, 0), (10, 10)),
+                                                  ((0, 1), (10, 11)))
+        self.assertIsNone(pt)
+
+    def test_degenerated(self):
+        # a point within the bounding box of the other segment, but not on it
+        pt = geometry.get_segment_intersect_point(((2, 8), (2, 8)),
+                                                  ((0, 0), (10, 10)))
+        self.assertIsNone(pt)
+        pt = geometry.get_segment_intersect_point(((2, 2), (2, 2)),
+                                                  ((0, 0), (10, 10)))
+        self.assertEqual(pt, (2, 2))
+
+    def test_aabb(self):
+        self.assertTrue(geometry.segments_aabb_overlap(((0, 0), (10, 10)),
+                                                       ((10, 10), (0, 20))))
+        self.assertFalse(geometry.segments_aabb_overlap(((0, 0), (10, 10)),
+                                                        ((11, 0), (20, 5))))
+
+    def test_ray_toi(self):
+        wall = ((10, -5), (10, 5))
+        self.assertEqual(
+            geometry.get_ray_segment_toi((0, 0), (20, 0), wall), 0.5
+        )
+        self.assertIsNone(geometry.get_ray_segment_toi((0, 0), (5, 0), wall))
+        self.assertIsNone(
+            geometry.get_ray_segment_toi((0, 0), (-20, 0), wall)
+        )
+        # parallel
+        self.assertIsNone(
+            geometry.get_ray_segment_toi((10, -10), (0, 20), wall)
+        )
+
+    def test_polygon_toi(self):
+        square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+        wall = ((10, -5), (10, 5))
+        (t, edge, contact_line, pt) = geometry.get_polygon_segment_toi(
+            square, (12, 0), wall
+        )
+        self.assertEqual(t, 0.5)
+        self.assertEqual(contact_line, wall)
+        self.assertEqual(pt[0], 10)
+        # moving away
+        self.assertIsNone(
+            geometry.get_polygon_segment_toi(square, (-12, 0), wall)
+        )
+        # the end point of the wall hits an edge of the square
+        wall = ((10, 2), (20, 2))
+        (t, edge, contact_line, pt) = geometry.get_polygon_segment_toi(
+            square, (12, 0), wall
+        )
+        self.assertEqual(t, 0.5)
+        self.assertEqual(contact_line, ((4, 0), (4, 4)))
+        self.assertEqual(pt, (10, 2))
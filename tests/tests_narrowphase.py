@@ -0,0 +1,143 @@
+import math
+import unittest
+
+from rapide_et_furieux import narrowphase
+
+
+def get_box(center, size, angle=0):
+    (cos, sin) = (math.cos(angle), math.sin(angle))
+    (w, h) = (size[0] / 2, size[1] / 2)
+    return [
+        (center[0] + (x * cos) - (y * sin), center[1] + (x * sin) + (y * cos))
+        for (x, y) in ((-w, -h), (w, -h), (w, h), (-w, h))
+    ]
+
+
+class TestContact(unittest.TestCase):
+    SIZE = (86, 47)
+
+    def test_far_away(self):
+        a = get_box((0, 0), self.SIZE)
+        b = get_box((500, 0), self.SIZE)
+        self.assertIsNone(narrowphase.get_contact(a, b))
+
+    def test_separated_on_an_axis(self):
+        # bounding circles overlap, but not the boxes
+        a = get_box((0, 0), self.SIZE)
+        b = get_box((90, 50), self.SIZE)
+        self.assertIsNone(narrowphase.get_contact(a, b))
+
+    def test_overlap(self):
+        a = get_box((0, 0), self.SIZE)
+        b = get_box((80, 10), self.SIZE)
+        contact = narrowphase.get_contact(a, b)
+        self.assertIsNotNone(contact)
+        self.assertAlmostEqual(contact.depth, 6)
+        # pushes 'a' out of 'b': toward the left
+        self.assertAlmostEqual(contact.normal[0], -1)
+        self.assertAlmostEqual(contact.normal[1], 0)
+        self.assertAlmostEqual(contact.point[0], 80 - 43)
+
+        # and the other way around
+        contact = narrowphase.get_contact(b, a)
+        self.assertAlmostEqual(contact.depth, 6)
+        self.assertAlmostEqual(contact.normal[0], 1)
+        self.assertAlmostEqual(contact.point[0], 43)
+
+    def test_rotated(self):
+        a = get_box((0, 0), self.SIZE)
+        b = get_box((0, 60), self.SIZE, math.pi / 4)
+        contact = narrowphase.get_contact(a, b)
+        self.assertIsNotNone(contact)
+        self.assertGreater(contact.depth, 0)
+        # 'a' must go up to get out of 'b'
+        self.assertLess(contact.normal[1], 0)
+        self.assertAlmostEqual(math.hypot(*contact.normal), 1)
+
+    def test_contained(self):
+        a = get_box((0, 0), (10, 10))
+        b = get_box((5, 0), self.SIZE)
+        contact = narrowphase.get_contact(a, b)
+        self.assertIsNotNone(contact)
+        self.assertGreater(contact.depth, 10)
+
+    def test_touching(self):
+        a = get_box((0, 0), self.SIZE)
+        b = get_box((86, 0), self.SIZE)
+        contact = narrowphase.get_contact(a, b)
+        self.assertIsNotNone(contact)
+        self.assertEqual(contact.depth, 0)
+
+    def test_segment(self):
+        a = get_box((0, 0), self.SIZE)
+        contact = narrowphase.get_contact(a, ((40, -100), (40, 100)))
+        self.assertIsNotNone(contact)
+        self.assertAlmostEqual(contact.depth, 3)
+        self.assertEqual(contact.normal, (-1.0, 0.0))
+        self.assertIsNone(
+            narrowphase.get_contact(a, ((50, -100), (50, 100)))
+        )
+        # the segment doesn't reach the box
+        self.assertIsNone(
+            narrowphase.get_contact(a, ((40, 30), (40, 100)))
+        )
+
+    def test_segment_normal(self):
+        segment = ((0, 0), (100, 0))
+        self.assertEqual(
+            narrowphase.get_segment_normal(segment, (50, 10)), (0.0, 1.0)
+        )
+        self.assertEqual(
+            narrowphase.get_segment_normal(segment, (50, -10)), (-0.0, -1.0)
+        )
+
+
+class TestContactCache(unittest.TestCase):
+    SIZE = (86, 47)
+    WALL = ((100, -500), (100, 500))
+
+    def setUp(self):
+        self.cache = narrowphase.ContactCache()
+
+    def check(self, x):
+        pts = get_box((x, 0), self.SIZE)
+        return self.cache.check("car", pts, "border", self.WALL, self.WALL)
+
+    def test_separated(self):
+        self.assertIsNone(self.check(0))
+        self.assertEqual(self.cache.nb_misses, 1)
+        # the gap is 57 pixels: moving by less than that can't reach the
+        # wall
+        for x in range(0, 50, 5):
+            self.assertIsNone(self.check(x))
+        self.assertEqual(self.cache.nb_misses, 1)
+        self.assertEqual(self.cache.nb_hits, 10)
+        # too far: tested again
+        self.assertIsNotNone(self.check(60))
+        self.assertEqual(self.cache.nb_misses, 2)
+
+    def test_contact(self):
+        self.assertEqual(self.cache.get_contacts("car"), [])
+        contact = self.check(60)
+        self.assertAlmostEqual(contact.depth, 3)
+        self.assertEqual(self.cache.get_contacts("car"),
+                         [("border", self.WALL)])
+        self.assertIsNotNone(self.check(59))
+        self.assertEqual(self.cache.nb_hits, 1)
+        self.assertIsNone(self.check(0))
+        self.assertEqual(self.cache.nb_drops, 1)
+        self.assertEqual(self.cache.get_contacts("car"), [])
+
+    def test_aging(self):
+        self.check(60)
+        self.cache.new_tick()
+        self.assertEqual(len(self.cache), 1)
+        self.cache.new_tick()
+        self.assertEqual(len(self.cache), 0)
+        self.check(60)
+        self.cache.forget("car")
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pygame
+
+from rapide_et_furieux import profiler
+from rapide_et_furieux import util
+from rapide_et_furieux.gfx.ui import console
+
+
+class Animated(object):
+    def __init__(self):
+        self.callers = []
+
+    def move(self, frame_interval):
+        self.callers.append(sys._getframe(1).f_code.co_name)
+
+
+class Drawer(object):
+    def draw(self, screen):
+        pass
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_groups(self):
+        prof = profiler.FrameProfiler()
+        (a, b) = (Animated(), Animated())
+        prof.call(a.move, 0.1)
+        prof.call(b.move, 0.1)
+        prof.draw(Drawer(), None)
+        prof.add("custom", 0.002)
+        prof.end_frame(0.016)
+        # all the instances of a class share the same group
+        self.assertEqual(
+            sorted(prof.history),
+            ["Animated.move", "Drawer.draw", "custom"]
+        )
+        self.assertEqual(list(prof.history["custom"]), [0.002])
+
+        # groups appearing later get a history as long as the others
+        prof.add("late", 0.001)
+        prof.end_frame(0.016)
+        self.assertEqual(list(prof.history["late"]), [0.0, 0.001])
+        self.assertEqual(list(prof.history["custom"]), [0.002, 0.0])
+        self.assertEqual(len(prof.current), 0)
+
+    def test_percentiles(self):
+        prof = profiler.FrameProfiler(history=100)
+        for ms in range(1, 151):
+            prof.add("a", ms / 1000)
+            prof.add("b", 0.0)
+            prof.end_frame(ms / 1000)
+        # only the last 100 frames are kept
+        self.assertEqual(prof.get_frame_percentiles(), (0.101, 0.146, 0.150))
+        breakdown = prof.get_breakdown()
+        self.assertEqual([group for (group, _) in breakdown], ["a", "b"])
+        self.assertEqual(breakdown[0][1], (0.101, 0.146, 0.150))
+
+        lines = prof.format_breakdown(limit=1)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1].split(), ["frame", "101.00", "146.00",
+                                            "150.00"])
+        self.assertEqual(lines[2].split()[0], "a")
+
+        prof.set_gauge("queue", 12)
+        self.assertEqual(prof.format_gauges()[0].split(), ["queue", "12"])
+
+    def test_dump(self):
+        prof = profiler.FrameProfiler()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "out.pstats")
+            prof.dump_cprofile(2, filepath)
+            for _ in range(0, 2):
+                prof.begin_frame()
+                sorted(range(0, 1000))
+                prof.end_frame(0.016)
+            self.assertTrue(os.path.exists(filepath))
+            self.assertIsNone(prof.cprofile)
+
+
+class TestMainLoop(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        self.screen = pygame.display.set_mode((1, 1))
+        self.animated = Animated()
+        self.handle = util.register_animator(self.animated.move)
+        self.exit = util.register_animator(lambda frame_interval: util.exit())
+
+    def tearDown(self):
+        util.unregister_animator(self.handle)
+        util.unregister_animator(self.exit)
+        util.set_profiler(None)
+
+    def test_disabled(self):
+        # the callbacks are registered and called as they are
+        self.assertIn(self.animated.move, list(util.g_animators))
+        util.main_loop(self.screen, realtime=False)
+        self.assertEqual(self.animated.callers, ["main_loop"])
+        self.assertEqual(util.profiled(len, "abc"), 3)
+
+    def test_enabled(self):
+        util.set_profiler(profiler.FrameProfiler())
+        util.main_loop(self.screen, realtime=False)
+        self.assertEqual(self.animated.callers, ["call"])
+        self.assertIn("Animated.move", util.g_profiler.history)
+
+
+class Console(object):
+    def __init__(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 12)
+        self.lines = []
+
+    def add_line(self, line):
+        self.lines.append(line)
+
+
+class TestCommandPerf(unittest.TestCase):
+    def setUp(self):
+        self.cmd = console.CommandPerf()
+        self.cmd.console = Console()
+
+    def tearDown(self):
+        self.cmd.hide()
+
+    def test_on_off(self):
+        self.cmd.run("perf", ["on"])
+        self.assertIsNotNone(util.g_profiler)
+        self.assertIsNotNone(self.cmd.overlay)
+        self.assertEqual(self.cmd.console.lines[-1], "Profiler: True")
+        self.cmd.run("perf", ["off"])
+        self.assertIsNone(util.g_profiler)
+        self.assertIsNone(self.cmd.overlay)
+        self.assertEqual(self.cmd.console.lines[-1], "Profiler: False")
+        # no argument: toggle
+        self.cmd.run("perf", [])
+        self.assertIsNotNone(util.g_profiler)
+        self.cmd.run("perf", [])
+        self.assertIsNone(util.g_profiler)
+
+    def test_dump(self):
+        self.cmd.run("perf", ["dump"])
+        self.assertEqual(util.g_profiler.cprofile_remaining,
+                         console.CommandPerf.DEFAULT_DUMP_FRAMES)
+        self.cmd.run("perf", ["dump", "5"])
+        self.assertEqual(util.g_profiler.cprofile_remaining, 5)
+        self.assertEqual(self.cmd.console.lines[-1],
+                         "Profiling the next 5 frames")
+        # the overlay is not shown
+        self.assertIsNone(self.cmd.overlay)
+
+    def test_usage(self):
+        self.cmd.run("perf", ["what"])
+        self.assertIsNone(util.g_profiler)
+        self.assertEqual(self.cmd.console.lines, [
+            "perf [on|off|dump [nb_frames]]"
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from rapide_et_furieux import registry
+
+
+class TestRegistry(unittest.TestCase):
+    def test_order(self):
+        reg = registry.Registry()
+        for idx in range(0, 5):
+            reg.register(idx)
+        self.assertEqual(list(reg), [0, 1, 2, 3, 4])
+        self.assertEqual(list(reversed(reg)), [4, 3, 2, 1, 0])
+
+    def test_unregister(self):
+        reg = registry.Registry()
+        handles = [reg.register(idx) for idx in range(0, 5)]
+        reg.unregister(handles[1])
+        reg.unregister(3)
+        self.assertEqual(list(reg), [0, 2, 4])
+        self.assertEqual(len(reg), 3)
+        self.assertNotIn(3, reg)
+        self.assertRaises(KeyError, reg.unregister, handles[1])
+        self.assertRaises(KeyError, reg.unregister, 3)
+
+    def test_duplicates(self):
+        reg = registry.Registry()
+        reg.register("a")
+        reg.register("b")
+        reg.register("a")
+        reg.unregister("a")
+        self.assertEqual(list(reg), ["b", "a"])
+
+    def test_changes_while_iterating(self):
+        reg = registry.Registry()
+        handles = [reg.register(idx) for idx in range(0, 4)]
+        out = []
+        for value in reversed(reg):
+            out.append(value)
+            if value == 3:
+                reg.unregister(handles[3])  # itself
+                reg.unregister(handles[1])
+                reg.register(42)
+        self.assertEqual(out, [3, 2, 0])
+        self.assertEqual(list(reg), [0, 2, 42])
+
+    def test_compact(self):
+        reg = registry.Registry()
+        handles = [reg.register(idx) for idx in range(0, 100)]
+        for handle in handles[:90]:
+            reg.unregister(handle)
+        self.assertEqual(list(reg), list(range(90, 100)))
+        self.assertEqual(len(reg.entries), 10)
+
+
+class TestLayeredRegistry(unittest.TestCase):
+    def test_order(self):
+        reg = registry.LayeredRegistry()
+        reg.register(50, "c")
+        reg.register(10, "a")
+        handle = reg.register(50, "d")
+        reg.register(10, "b")
+        self.assertEqual([v for (layer, v) in reg], ["a", "b", "c", "d"])
+        reg.unregister(handle)
+        reg.unregister("a")
+        self.assertEqual(list(reg), [(10, "b"), (50, "c")])
+        self.assertRaises(KeyError, reg.unregister, "a")
@@ -0,0 +1,47 @@
+import unittest
+
+import pygame
+
+from rapide_et_furieux.gfx import rotation
+
+
+class TestRotationCache(unittest.TestCase):
+    def setUp(self):
+        self.image = pygame.Surface((40, 20), pygame.SRCALPHA)
+        self.cache = rotation.RotationCache(steps=64)
+
+    def test_quantization(self):
+        a = self.cache.rotate(self.image, 90)
+        self.assertEqual(a.get_size(), (20, 40))
+        # 360 / 64 = 5.625 degrees per step
+        self.assertIs(self.cache.rotate(self.image, 91), a)
+        self.assertIs(self.cache.rotate(self.image, 90 - 360), a)
+        self.assertIsNot(self.cache.rotate(self.image, 96), a)
+        self.assertEqual(self.cache.nb_hits, 2)
+        self.assertEqual(self.cache.nb_misses, 2)
+        # different images don't share their frames
+        other = pygame.Surface((40, 20), pygame.SRCALPHA)
+        self.assertIsNot(self.cache.rotate(other, 90), a)
+
+    def test_memory_cap(self):
+        frame_size = self.cache.get_memory(self.cache.rotate(self.image, 0))
+        cache = rotation.RotationCache(steps=64, max_memory=frame_size * 2)
+        first = cache.rotate(self.image, 0)
+        cache.rotate(self.image, 180)
+        cache.rotate(self.image, 0)  # most recently used
+        cache.rotate(self.image, 90)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.nb_evictions, 1)
+        self.assertLessEqual(cache.memory, frame_size * 2)
+        self.assertIs(cache.rotate(self.image, 0), first)
+
+    def test_prerender(self):
+        self.cache.prerender(self.image)
+        self.assertEqual(len(self.cache), 64)
+        self.cache.rotate(self.image, 123)
+        self.assertEqual(self.cache.nb_misses, 64)
+        self.assertEqual(self.cache.nb_hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import json
+import unittest
+
+from rapide_et_furieux import scheduler
+from rapide_et_furieux import util
+
+
+class TestScheduler(unittest.TestCase):
+    def test_order(self):
+        out = []
+        sched = scheduler.Scheduler()
+        sched.add(scheduler.PRIORITY_DEFAULT, out.append, "b")
+        sched.add(scheduler.PRIORITY_LOW, out.append, "d")
+        sched.add(scheduler.PRIORITY_DEFAULT, out.append, "c")
+        sched.add(scheduler.PRIORITY_HIGH, out.append, "a")
+        sched.run()
+        self.assertEqual(out, ["a", "b", "c", "d"])
+        self.assertEqual(len(sched), 0)
+        self.assertEqual(sched.get_stats()['done'], 4)
+
+    def test_generator(self):
+        out = []
+
+        def task(name):
+            for idx in range(0, 3):
+                out.append((name, idx))
+                yield
+
+        sched = scheduler.Scheduler(budget=0)
+        sched.add(scheduler.PRIORITY_DEFAULT, task, "a")
+        sched.add(scheduler.PRIORITY_DEFAULT, out.append, "b")
+        sched.run()  # no budget: one step only
+        self.assertEqual(out, [("a", 0)])
+        sched.add(scheduler.PRIORITY_HIGH, out.append, "c")
+        sched.run()
+        sched.run()
+        # 'a' keeps its place in the queue, but 'c' has a higher priority
+        self.assertEqual(out, [("a", 0), "c", ("a", 1)])
+        sched.run(budget=1.0)
+        self.assertEqual(out, [("a", 0), "c", ("a", 1), ("a", 2), "b"])
+
+    def test_exception(self):
+        def fail():
+            raise ValueError()
+
+        out = []
+        sched = scheduler.Scheduler()
+        sched.add(scheduler.PRIORITY_DEFAULT, fail)
+        sched.add(scheduler.PRIORITY_DEFAULT, out.append, "a")
+        self.assertRaises(ValueError, sched.run)
+        sched.run()
+        self.assertEqual(out, ["a"])
+
+
+class TestJsonDumpSteps(unittest.TestCase):
+    def test_same_output(self):
+        data = {'b': [{'x': idx, 'y': [idx] * 3} for idx in range(0, 100)],
+                'a': "test"}
+        fd = io.StringIO()
+        nb_steps = len(list(util.json_dump_steps(data, fd, nb_chunks=10,
+                                                 indent=4, sort_keys=True)))
+        self.assertGreater(nb_steps, 1)
+        self.assertEqual(fd.getvalue(),
+                         json.dumps(data, indent=4, sort_keys=True))
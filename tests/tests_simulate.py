@@ -0,0 +1,88 @@
+import os
+import random
+import unittest
+
+import pkg_resources
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import registry
+from rapide_et_furieux import scheduler
+from rapide_et_furieux import simulate
+from rapide_et_furieux import sounds
+from rapide_et_furieux import timers
+from rapide_et_furieux import util
+
+
+TRACK = pkg_resources.resource_filename(
+    "rapide_et_furieux.maps", "first.map"
+)
+TICK_RATE = 64  # 1/64: exact in floating point
+NB_CARS = 4
+DURATION = 3.0  # simulated seconds
+
+
+class TestSimulation(unittest.TestCase):
+    GLOBALS = (
+        "g_animators", "g_drawers", "g_timers", "g_scheduler", "g_sim_time",
+        "g_tick_interval",
+    )
+
+    def setUp(self):
+        for (k, v) in simulate.SDL_DRIVERS.items():
+            os.environ.setdefault(k, v)
+        sounds.pre_init()
+        pygame.init()
+        self.screen = pygame.display.set_mode((64, 64))
+        sounds.init(self.screen.get_size())
+        self.globals = {name: getattr(util, name) for name in self.GLOBALS}
+
+    def tearDown(self):
+        for (name, value) in self.globals.items():
+            setattr(util, name, value)
+        assets.set_race_started(False)
+
+    def run_simulation(self, seed):
+        # a clean main loop, as if the process had just started
+        util.g_animators = registry.Registry()
+        util.g_drawers = registry.LayeredRegistry()
+        util.g_timers = timers.TimerWheel()
+        util.g_scheduler = scheduler.Scheduler()
+        util.g_sim_time = 0.0
+        random.seed(seed)
+
+        ticks = []
+        util.register_animator(ticks.append)
+        simulation = simulate.Simulation(TRACK, NB_CARS, DURATION)
+        simulation.load()
+        # the whole loading is done in the first frame
+        util.main_loop(self.screen, tick_rate=TICK_RATE, realtime=False,
+                       idle_budget=60.0)
+        return (simulation, len(ticks))
+
+    def test_sim_time(self):
+        (simulation, nb_ticks) = self.run_simulation(1)
+        self.assertEqual(util.sim_time(), nb_ticks / TICK_RATE)
+        self.assertEqual(
+            util.sim_time() - simulation.sim_start, DURATION
+        )
+        self.assertEqual(len(simulation.race_track.cars), NB_CARS)
+
+    def test_deterministic(self):
+        positions = []
+        for _ in range(0, 2):
+            (simulation, _) = self.run_simulation(42)
+            positions.append(
+                [car.position for car in simulation.race_track.cars]
+            )
+        self.assertEqual(positions[0], positions[1])
+        # the cars did move
+        spawn_points = [
+            pt for (pt, _) in simulation.race_track.tiles.get_spawn_points()
+        ]
+        for position in positions[0]:
+            self.assertNotIn(position, spawn_points)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from rapide_et_furieux import spatial
+
+
+class Obj(object):
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+class TestSpatialHash(unittest.TestCase):
+    def test_add_update_remove(self):
+        grid = spatial.SpatialHash(10)
+        a = Obj("a")
+        b = Obj("b")
+        grid.add(a, (5, 5))
+        grid.add(b, (-5, 15))
+        self.assertEqual(len(grid), 2)
+        self.assertEqual(grid.objects[a], (0, 0))
+        self.assertEqual(grid.objects[b], (-1, 1))
+        self.assertRaises(KeyError, grid.add, a, (0, 0))
+
+        # same cell
+        self.assertFalse(grid.update(a, (9.5, 0)))
+        self.assertEqual(grid.nb_moves, 0)
+        # crosses a cell boundary
+        self.assertTrue(grid.update(a, (10, 0)))
+        self.assertEqual(grid.nb_moves, 1)
+        self.assertEqual(grid.objects[a], (1, 0))
+        self.assertNotIn((0, 0), grid.cells)
+
+        grid.remove(a)
+        self.assertNotIn(a, grid)
+        self.assertEqual(len(grid), 1)
+        self.assertRaises(KeyError, grid.remove, a)
+        grid.remove(b)
+        self.assertEqual(grid.cells, {})
+
+    def test_query_radius(self):
+        grid = spatial.SpatialHash(10)
+        objs = {}
+        for x in range(0, 10):
+            objs[x] = Obj(str(x))
+            grid.add(objs[x], (x * 7, 3))
+        found = grid.query_radius((21, 3), 14)
+        self.assertEqual(
+            sorted(found, key=lambda o: int(o.name)),
+            [objs[1], objs[2], objs[3], objs[4], objs[5]]
+        )
+        self.assertEqual(grid.query_radius((500, 500), 14), [])
+
+    def test_query_segment(self):
+        grid = spatial.SpatialHash(10)
+        a = Obj("a")
+        b = Obj("b")
+        c = Obj("c")
+        grid.add(a, (95, 52))
+        grid.add(b, (5, 48))
+        grid.add(c, (50, 80))
+        segment = ((0, 50), (100, 50))
+        self.assertEqual(list(grid.query_segment(segment, radius=5)), [b, a])
+        self.assertEqual(list(grid.query_segment(segment)), [])
+        self.assertEqual(
+            list(grid.query_segment(segment, radius=30)), [b, c, a]
+        )
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from rapide_et_furieux import assets
+from rapide_et_furieux import terrain
+from rapide_et_furieux import util
+
+
+ROAD = ("rapide_et_furieux.gfx.tiles", "road_asphalt01.png")
+GRASS = ("rapide_et_furieux.gfx.tiles", "land_grass01.png")
+
+
+class TestTerrainMap(unittest.TestCase):
+    def test_tiles(self):
+        tiles = {(x, y): ROAD for x in range(0, 4) for y in range(0, 4)}
+        tiles[(2, 1)] = GRASS
+        terrain_map = terrain.TerrainMap(tiles, [])
+        (w, h) = assets.TILE_SIZE
+        self.assertEqual(terrain_map.get_terrain((10, 10)), "normal")
+        self.assertEqual(
+            terrain_map.get_terrain(((2 * w) + 1, h + (h / 2))), "crap"
+        )
+        # outside of the tiles
+        self.assertEqual(terrain_map.get_terrain((-1000, 10)), "normal")
+        self.assertEqual(terrain_map.get_terrain((10, 100 * h)), "normal")
+
+    def test_areas(self):
+        tiles = {(x, y): ROAD for x in range(0, 8) for y in range(0, 8)}
+        areas = [
+            ((100, 150), (400, 300)),
+            ((128, 512), (384, 768)),  # exactly 2x2 tiles
+            ((700, 700), (1200, 1100)),  # goes beyond the tiles
+        ]
+        terrain_map = terrain.TerrainMap(tiles, areas)
+        cell = assets.TILE_SIZE[0] / terrain.TerrainMap.SUBDIVISIONS
+
+        rnd = random.Random(0)
+        for _ in range(0, 5000):
+            position = (rnd.uniform(-100, 1300), rnd.uniform(-100, 1300))
+            near_edge = any(
+                abs(position[0] - pt[0]) <= cell or
+                abs(position[1] - pt[1]) <= cell
+                for area in areas for pt in area
+            )
+            if near_edge:
+                continue
+            inside = any(
+                pt_a[0] <= position[0] <= pt_b[0] and
+                pt_a[1] <= position[1] <= pt_b[1]
+                for (pt_a, pt_b) in areas
+            )
+            self.assertEqual(terrain_map.get_terrain(position),
+                             "crap" if inside else "normal", position)
+
+    def test_physics(self):
+        table = terrain.get_physics_table(util.GAME_SETTINGS_TEMPLATE)
+        self.assertEqual(set(table), set(terrain.TERRAINS))
+        self.assertEqual(
+            table["crap"].max_speed_forward,
+            util.GAME_SETTINGS_TEMPLATE['max_speed']['crap']['forward']
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
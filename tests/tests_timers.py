@@ -0,0 +1,52 @@
+import unittest
+
+from rapide_et_furieux import timers
+
+
+class TestTimerWheel(unittest.TestCase):
+    def run_ticks(self, wheel, nb_ticks):
+        for _ in range(0, nb_ticks):
+            wheel.advance()
+
+    def test_expiry(self):
+        fired = []
+        wheel = timers.TimerWheel()
+        delays = [1, 2, 63, 64, 65, 100, 4095, 4096, 4097, 5000, 300000]
+        for delay in delays:
+            wheel.add(delay, lambda d=delay: fired.append((d, wheel.now)))
+        self.assertEqual(len(wheel), len(delays))
+        self.run_ticks(wheel, 300001)
+        self.assertEqual(fired, [(d, d) for d in delays])
+        self.assertEqual(len(wheel), 0)
+
+    def test_expiry_not_aligned(self):
+        # timers added while the wheel is in the middle of its slots
+        fired = []
+        wheel = timers.TimerWheel()
+        self.run_ticks(wheel, 100)
+        for delay in (4060, 4070, 4095, 262100):
+            wheel.add(delay, lambda: fired.append(wheel.now))
+        self.run_ticks(wheel, 262200)
+        self.assertEqual(fired, [4160, 4170, 4195, 262200])
+
+    def test_periodic(self):
+        fired = []
+        wheel = timers.TimerWheel()
+        timer = wheel.add(10, lambda: fired.append(wheel.now), interval=30)
+        self.run_ticks(wheel, 100)
+        self.assertEqual(fired, [10, 40, 70, 100])
+        timer.cancel()
+        timer.cancel()
+        self.run_ticks(wheel, 100)
+        self.assertEqual(len(fired), 4)
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel(self):
+        fired = []
+        wheel = timers.TimerWheel()
+        timer = wheel.add(5, fired.append, "a")
+        wheel.add(5, fired.append, "b")
+        wheel.add(5, timer.cancel)
+        timer.cancel()
+        self.run_ticks(wheel, 10)
+        self.assertEqual(fired, ["b"])
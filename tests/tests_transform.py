@@ -0,0 +1,56 @@
+import math
+import random
+import unittest
+
+from rapide_et_furieux import transform
+from rapide_et_furieux import util
+
+
+class TestTransform(unittest.TestCase):
+    def assertPointsAlmostEqual(self, pts_a, pts_b):
+        self.assertEqual(len(pts_a), len(pts_b))
+        for (a, b) in zip(pts_a, pts_b):
+            self.assertAlmostEqual(a[0], b[0])
+            self.assertAlmostEqual(a[1], b[1])
+
+    def test_rotate(self):
+        rnd = random.Random(0)
+        for _ in range(0, 100):
+            vector = (rnd.uniform(-100, 100), rnd.uniform(-100, 100))
+            angle = rnd.uniform(-10, 10)
+            polar = util.to_polar(vector)
+            expected = util.to_cartesian((polar[0], polar[1] + angle))
+            self.assertPointsAlmostEqual(
+                [transform.rotate(vector, angle)], [expected]
+            )
+            rotation = transform.Rotation(angle)
+            self.assertPointsAlmostEqual(
+                [rotation.to_track(vector)],
+                [transform.to_track(vector, angle)]
+            )
+            self.assertPointsAlmostEqual(
+                [rotation.to_local(rotation.to_track(vector))], [vector]
+            )
+
+    def test_box(self):
+        # facing up on screen
+        rotation = transform.Rotation(math.pi / 2)
+        pts = rotation.get_pts(transform.get_box((20, 40), 2), (100, 100))
+        self.assertPointsAlmostEqual(pts, [
+            (92, 82), (108, 82), (108, 118), (92, 118),
+        ])
+        # facing right
+        pts = rotation.set(0).get_pts(transform.get_box((20, 40)), (0, 0))
+        self.assertPointsAlmostEqual(pts, [
+            (20, -10), (20, 10), (-20, 10), (-20, -10),
+        ])
+
+    def test_cache(self):
+        rotation = transform.Rotation(1.0)
+        cos = rotation.cos
+        self.assertIs(rotation.set(1.0).cos, cos)
+        self.assertAlmostEqual(rotation.set(2.0).cos, math.cos(2.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
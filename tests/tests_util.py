@@ -1,5 +1,10 @@
+import math
+import os
+import random
 import unittest
 
+import pygame
+
 from rapide_et_furieux import util
 
 
@@ -52,3 +57,122 @@ class TestRaytrace(unittest.TestCase):
     def test_raytrace(self):
         r = list(util.raytrace(((256, 635), (322, 815)), 128))
         self.assertEqual(r, [(2, 4), (2, 5), (2, 6)])
+
+    def test_raytrace_cells(self):
+        rnd = random.Random(42)
+        for _ in range(0, 200):
+            line = (
+                (rnd.uniform(-300, 300), rnd.uniform(-300, 300)),
+                (rnd.uniform(-300, 300), rnd.uniform(-300, 300)),
+            )
+            cells = list(util.raytrace(line, 64))
+            self.assertEqual(len(cells), len(set(cells)))
+            self.assertEqual(cells[0], (math.floor(line[0][0] / 64),
+                                        math.floor(line[0][1] / 64)))
+            self.assertEqual(cells[-1], (math.floor(line[1][0] / 64),
+                                         math.floor(line[1][1] / 64)))
+            for (a, b) in zip(cells, cells[1:]):
+                self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+            for t in range(0, 101):
+                t /= 100
+                pt = (
+                    line[0][0] + (t * (line[1][0] - line[0][0])),
+                    line[0][1] + (t * (line[1][1] - line[0][1])),
+                )
+                cell = (math.floor(pt[0] / 64), math.floor(pt[1] / 64))
+                self.assertIn(cell, cells)
+
+    def test_raytrace_axis(self):
+        r = list(util.raytrace(((10, 10), (10, 300)), 128))
+        self.assertEqual(r, [(0, 0), (0, 1), (0, 2)])
+        r = list(util.raytrace(((300, 10), (10, 10)), 128))
+        self.assertEqual(r, [(2, 0), (1, 0), (0, 0)])
+        r = list(util.raytrace(((10, 10), (10, 10)), 128))
+        self.assertEqual(r, [(0, 0)])
+
+
+class TestMainLoop(unittest.TestCase):
+    TICK_RATE = 64  # 1/64: exact in floating point
+
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        self.screen = pygame.display.set_mode((1, 1))
+
+        self.now = 0.0
+        self.clock = util.clock
+        util.clock = lambda: self.now
+        self.sim_time = util.g_sim_time
+        self.tick_interval = util.g_tick_interval
+
+        self.intervals = []  # frame_interval of each tick
+        self.frames = []  # (nb ticks, g_alpha, interpolated) per frame
+        self.durations = []
+        self.animator = util.register_animator(self.tick)
+        self.drawer = util.register_drawer(0, self)
+
+    def tearDown(self):
+        util.unregister_animator(self.animator)
+        util.unregister_drawer(self.drawer)
+        util.clock = self.clock
+        util.g_sim_time = self.sim_time
+        util.g_tick_interval = self.tick_interval
+        util.g_alpha = 1.0
+
+    def tick(self, frame_interval):
+        self.intervals.append(frame_interval)
+
+    def draw(self, screen):
+        # what Car.render_position does
+        interpolated = util.interpolate((0, 0), (100, 10))
+        self.frames.append((len(self.intervals), util.g_alpha, interpolated))
+        self.intervals = []
+        if len(self.durations) <= 0:
+            util.exit()
+            return
+        # time spent on the next frame
+        self.now += self.durations.pop(0)
+
+    def run_frames(self, durations):
+        self.durations = list(durations)
+        util.main_loop(self.screen, tick_rate=self.TICK_RATE)
+        # the first frame is drawn before any time elapsed
+        return self.frames[1:]
+
+    def test_fixed_ticks(self):
+        dt = 1 / self.TICK_RATE
+        frames = self.run_frames([3 * dt, 1 * dt, 5 * dt, 0])
+        self.assertEqual([frame[0] for frame in frames], [3, 1, 5, 0])
+        self.assertEqual(frames[-1][1], 0.0)
+
+    def test_fixed_frame_interval(self):
+        dt = 1 / self.TICK_RATE
+        self.durations = [4 * dt]
+        util.main_loop(self.screen, tick_rate=self.TICK_RATE)
+        self.assertEqual(self.frames[1][0], 4)
+        self.assertEqual(util.g_sim_time - self.sim_time, 4 * dt)
+
+        intervals = []
+        util.unregister_animator(self.animator)
+        self.animator = util.register_animator(intervals.append)
+        self.durations = [2.5 * dt]
+        util.main_loop(self.screen, tick_rate=self.TICK_RATE)
+        self.assertEqual(intervals, [dt, dt])
+
+    def test_max_ticks_per_frame(self):
+        dt = 1 / self.TICK_RATE
+        max_ticks = util.MAX_TICKS_PER_FRAME
+        frames = self.run_frames([(max_ticks * 10 + 0.25) * dt, 2 * dt])
+        # capped, and the backlog is dropped instead of being caught up
+        # on the next frames
+        self.assertEqual(frames[0][0], max_ticks)
+        self.assertEqual(frames[0][1], 0.25)
+        self.assertEqual(frames[1][0], 2)
+
+    def test_alpha(self):
+        dt = 1 / self.TICK_RATE
+        frames = self.run_frames([1.25 * dt, 0.5 * dt, 0.5 * dt])
+        self.assertEqual([frame[0] for frame in frames], [1, 0, 1])
+        self.assertEqual([frame[1] for frame in frames], [0.25, 0.75, 0.25])
+        # render position between the previous and the current position
+        self.assertEqual(frames[1][2], (75, 7.5))
@@ -0,0 +1,38 @@
+import os
+import unittest
+
+import pygame
+
+from rapide_et_furieux import assets
+from rapide_et_furieux.gfx.weapons import mine
+
+
+class Shooter(object):
+    color = (0, 0, 0)
+    position = (500, 500)
+    angle = 0
+
+
+class TestMine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        assets.load_resources()
+
+    def test_size(self):
+        projectile = mine.Mine(None, Shooter(), 0)
+        projectile.disappear()
+        (w, h) = assets.get_resource(assets.MINE).get_size()
+        expected = (int(w * assets.CAR_SCALE_FACTOR),
+                    int(h * assets.CAR_SCALE_FACTOR))
+        self.assertEqual(projectile.image.get_size(), expected)
+        # the collision box too
+        self.assertEqual(max(pt[0] for pt in projectile._pts), expected[0])
+        self.assertEqual(max(pt[1] for pt in projectile._pts), expected[1])
+
+
+if __name__ == "__main__":
+    unittest.main()